@@ -0,0 +1,128 @@
+"""Commit analytics of a long history: the columnar pipeline (one regex per
+chunk, C loops over the columns) against a loop parsing each commit with the
+plugin's parsers.
+
+The `git log` output is generated in memory, from a pool of synthetic commits
+cycled over the history (a new quarter every 50k commits, a release every
+100k), so the timings are the parsing and the aggregation only. The read of a
+real repository of `--git-commits` commits is timed end to end.
+
+python -m benchmarks.bench_analytics --commits 5000000 --loop-commits 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+
+from benchmarks.common import make_git_repository
+from benchmarks.common import make_plugin
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.analytics import aggregate
+from cz_bitbucket_jira_plugin.analytics import CommitColumns
+from cz_bitbucket_jira_plugin.analytics import read_columns
+from cz_bitbucket_jira_plugin.multi_repo import Repository
+from cz_bitbucket_jira_plugin.parsers import compile_commit_parser
+from cz_bitbucket_jira_plugin.parsers import ISSUE_FOOTER_PATTERN
+from cz_bitbucket_jira_plugin.parsers import split_issue_id
+
+
+CHUNK_COMMITS = 10_000
+START_TIMESTAMP = 1_700_000_000
+
+
+def synthetic_chunks(count: int, pool: list):
+    """`LOG_FORMAT` chunks of `count` commits, newest first."""
+    for start in range(0, count, CHUNK_COMMITS):
+        records = []
+
+        for index in range(start, min(start + CHUNK_COMMITS, count)):
+            title, body = pool[index % len(pool)]
+            refs = f'tag: v{index // 100_000}.0.0' if index % 100_000 == 0 else ''
+            timestamp = START_TIMESTAMP - index * 160
+            records.append(f'{timestamp}\x1f{refs}\x1f{title}\x1f{body}\0')
+
+        yield ''.join(records).encode()
+
+
+def loop_analytics(chunks, commit_parser: str) -> dict:
+    """The same counts, parsing each commit in a Python loop."""
+    match = compile_commit_parser(commit_parser).match
+    types_per_quarter = Counter()
+    epics = Counter()
+    breaking = 0
+
+    for chunk in chunks:
+        for record in chunk.decode().split('\0')[:-1]:
+            timestamp, _, title, body = record.split('\x1f', 3)
+            parsed = match(title)
+            change_type = parsed.group('change_type') if parsed else None
+            date = datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+            types_per_quarter[(date.year, (date.month - 1) // 3, change_type)] += 1
+            breaking += bool(parsed and (parsed.group('breaking') or not change_type))
+            split_issue_id(title)
+
+            for name, keys in ISSUE_FOOTER_PATTERN.findall(body):
+                if name == 'issue epic':
+                    epics[keys.upper()] += 1
+
+    return {'types_per_quarter': types_per_quarter, 'epics': epics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=5_000_000)
+    parser.add_argument('--loop-commits', type=int, default=500_000)
+    parser.add_argument('--git-commits', type=int, default=200_000)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+    commit_types = [commit_type['value'] for commit_type in cz.commit_types]
+    pool = [message.partition('\n\n')[::2] for message in synthetic_messages(10_000)]
+
+    # Generating the output isn't part of the timings
+    chunks = list(synthetic_chunks(args.commits, pool))
+
+    columns = CommitColumns(commit_types, re.compile(r'v\d+\.\d+\.\d+'))
+    start = time.perf_counter()
+    columns.add_history('repository', chunks)
+    parsed = time.perf_counter() - start
+    result = aggregate(columns)
+    total = time.perf_counter() - start
+
+    report('columns: parse', args.commits, parsed, 'commits')
+    report('columns: parse and aggregate', args.commits, total, 'commits')
+    print(
+        f'{len(result["types_per_quarter"])} quarters, '
+        f'{len(result["issues_per_release"])} releases, '
+        f'{len(result["commits_per_epic"])} epics, '
+        f'breaking rate {result["breaking_changes"]["rate"]}'
+    )
+
+    loop_chunks = chunks[: -(-args.loop_commits // CHUNK_COMMITS)]
+    start = time.perf_counter()
+    loop_analytics(loop_chunks, cz.commit_parser)
+    report('loop over commits', args.loop_commits, time.perf_counter() - start, 'commits')  # fmt: skip
+
+    del chunks, loop_chunks
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_git_repository(
+            Path(directory) / 'repository',
+            synthetic_messages(args.git_commits),
+            START_TIMESTAMP - args.git_commits * 600,
+        )
+        start = time.perf_counter()
+        aggregate(read_columns(cz, [Repository('repository', path)]))
+        report('git log, columns, aggregate', args.git_commits, time.perf_counter() - start, 'commits')  # fmt: skip
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Version increment of a long range of commits, Commitizen vs `BumpClassifier`.
+
+python -m benchmarks.bench_bump --commits 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from commitizen import bump
+from commitizen import git
+
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.bump import BumpClassifier
+from cz_bitbucket_jira_plugin.defaults import BUMP_MAP
+from cz_bitbucket_jira_plugin.defaults import BUMP_PATTERN
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=50_000)
+    args = parser.parse_args()
+
+    # Without MAJOR commits, both have to read the whole range
+    minor_messages = [
+        message.replace('!:', ':', 1)
+        for message in synthetic_messages(args.commits * 2)
+        if not message.startswith('delete')
+    ][: args.commits]
+    # A breaking change among the newest commits
+    major_messages = list(minor_messages)
+    major_messages[100] = 'feat!: drop the old API [DEV-1]'
+
+    classifier = BumpClassifier(BUMP_PATTERN, BUMP_MAP)
+
+    for label, messages in [
+        ('no MAJOR', minor_messages),
+        ('MAJOR at 100', major_messages),
+    ]:
+        commits = [git.GitCommit(rev='0' * 40, title=message) for message in messages]
+
+        assert classifier.find_increment(messages) == bump.find_increment(
+            commits, regex=BUMP_PATTERN, increments_map=BUMP_MAP
+        )
+
+        seconds = measure(
+            lambda: bump.find_increment(
+                commits, regex=BUMP_PATTERN, increments_map=BUMP_MAP
+            )
+        )
+        report(f'commitizen, {label}', len(commits), seconds, 'commits')
+
+        seconds = measure(lambda: classifier.find_increment(messages))
+        report(f'BumpClassifier, {label}', len(messages), seconds, 'commits')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Throughput of `changelog_message_builder_hook`, before and after precompiling.
+
+python -m benchmarks.bench_changelog_hook --commits 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+
+from benchmarks.common import make_plugin
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_commits
+
+
+def legacy_hook(jira_base_url: str, parsed_message: dict, commit):
+    """The hook as it was before being precompiled, kept as the baseline."""
+    if parsed_message.get('change_type') == 'BREAKING CHANGE':
+        return False
+
+    if parsed_message.get('breaking'):
+        parsed_message['change_type'] = 'BREAKING CHANGE'
+
+    issue_id_pattern = re.compile(r'\[([^\[\]]*)\](?!.*\[)')
+
+    commit_hash = commit.rev[:7]
+    message = parsed_message.get('message')
+    message_without_issue_id = issue_id_pattern.sub('', message).strip()
+
+    issue_id = issue_id_pattern.search(message).group(1)
+
+    parsed_message['message'] = (
+        f'{message_without_issue_id} '
+        f'[{issue_id}]({jira_base_url}/browse/{issue_id}) ({commit_hash})'
+    )
+
+    return parsed_message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=200_000)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+    commit_parser = re.compile(cz.commit_parser)
+
+    commits = list(synthetic_commits(args.commits))
+    parsed_messages = [
+        commit_parser.match(commit.title).groupdict() for commit in commits
+    ]
+    pairs = list(zip(parsed_messages, commits))
+
+    def run_legacy():
+        for parsed_message, commit in pairs:
+            legacy_hook(cz.jira_base_url, dict(parsed_message), commit)
+
+    def run_current():
+        hook = cz.changelog_message_builder_hook
+        for parsed_message, commit in pairs:
+            hook(dict(parsed_message), commit)
+
+    report('legacy hook', args.commits, measure(run_legacy), 'commits')
+    report('precompiled hook', args.commits, measure(run_current), 'commits')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Peak memory of the changelog of a long synthetic history: the streamed one
+against Commitizen's tree of one dict per commit.
+
+The history is generated on the fly, so only the changelog pipeline holds
+memory. The Commitizen tree is built for `--tree-commits` commits only, it
+grows linearly with them.
+
+python -m benchmarks.bench_changelog_stream --commits 1000000 --tree-commits 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import time
+import tracemalloc
+
+from commitizen import changelog
+from commitizen import git
+
+from benchmarks.common import make_plugin
+from benchmarks.common import report
+from benchmarks.common import synthetic_commits
+from cz_bitbucket_jira_plugin.changelog_stream import stream_changelog
+
+
+def traced(function):
+    """`(seconds, peak bytes)` of a call, the peak traced by tracemalloc."""
+    tracemalloc.start()
+
+    try:
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return seconds, peak
+
+
+def report_peak(label: str, items: int, peak: int) -> None:
+    print(f'{label:<40} {items:>10} commits {peak / 1e6:>9.1f} MB peak ({peak / items:,.0f} B/commit)')  # fmt: skip
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=1_000_000)
+    parser.add_argument('--tree-commits', type=int, default=100_000)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+    # Generating messages is slower than rendering them: cycle through a pool
+    pool = list(synthetic_commits(10_000))
+
+    def commits(count):
+        for index in range(count):
+            commit = pool[index % len(pool)]
+            yield git.GitCommit(
+                rev=f'{index:040x}', title=commit.title, body='', author='bench'
+            )
+
+    def titles(count):
+        return ((commit.rev, commit.title) for commit in commits(count))
+
+    def stream(count):
+        with open(os.devnull, mode='w', encoding='utf-8') as output:
+            stream_changelog(
+                titles(count),
+                output,
+                cz.commit_parser,
+                cz.jira_browse_url,
+                cz.change_type_map,
+                cz.change_type_order,
+            )
+
+    def tree(count):
+        tree = changelog.generate_tree_from_commits(
+            list(commits(count)),
+            [],
+            cz.commit_parser,
+            cz.changelog_pattern,
+            change_type_map=cz.change_type_map,
+            changelog_message_builder_hook=cz.changelog_message_builder_hook,
+        )
+        list(changelog.order_changelog_tree(tree, cz.change_type_order))
+
+    start = time.perf_counter()
+    stream(args.commits)
+    report('streamed', args.commits, time.perf_counter() - start, 'commits')
+
+    for label, count, function in [
+        ('streamed', args.commits, stream),
+        ('Commitizen tree', args.tree_commits, tree),
+    ]:
+        _, peak = traced(lambda: function(count))
+        report_peak(label, count, peak)
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'peak RSS of the process, all runs: {max_rss / 1e3:.0f} MB')  # fmt: skip
+
+
+if __name__ == '__main__':
+    main()
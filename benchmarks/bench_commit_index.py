@@ -0,0 +1,83 @@
+"""Build, incremental update and query latency of the issue to commits index.
+
+python -m benchmarks.bench_commit_index --commits 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_issue_index import latencies
+from benchmarks.bench_issue_index import report_latency
+from benchmarks.common import make_git_repository
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.commit_index import CommitIssueIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=500_000)
+    parser.add_argument('--new-commits', type=int, default=100)
+    parser.add_argument('--lookups', type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The history ends before now, so new commits are newer than their parent
+        repository = make_git_repository(
+            Path(directory) / 'repository',
+            synthetic_messages(args.commits),
+            start_timestamp=int(time.time()) - (args.commits + 1) * 600,
+        )
+        commit_index = CommitIssueIndex(Path(directory) / 'commits.sqlite', repository)
+
+        seconds = measure(commit_index.update, repeat=1)
+        report('build', args.commits, seconds, 'commits')
+
+        seconds = measure(commit_index.update, repeat=1)
+        print(f'{"update, nothing new":<40} {seconds * 1e3:>10.3f}ms')  # fmt: skip
+
+        env = {
+            **os.environ,
+            'GIT_AUTHOR_NAME': 'Bench',
+            'GIT_AUTHOR_EMAIL': 'bench@example.com',
+            'GIT_COMMITTER_NAME': 'Bench',
+            'GIT_COMMITTER_EMAIL': 'bench@example.com',
+        }
+
+        for message in synthetic_messages(args.new_commits, seed=1):
+            subprocess.run(
+                ['git', 'commit', '-q', '--allow-empty', '-m', message],
+                cwd=repository,
+                env=env,
+                check=True,
+            )
+
+        seconds = measure(commit_index.update, repeat=1)
+        report(f'update, {args.new_commits} new commits', args.new_commits, seconds, 'commits')  # fmt: skip
+
+        # Same issue numbers as `synthetic_messages()`, some only in footers
+        keys = [(f'DEV-{rng.randint(1, 50_000)}',) for _ in range(args.lookups)]
+        report_latency('find(key)', latencies(commit_index.find, keys))
+
+        start = time.perf_counter()
+        subprocess.run(
+            ['git', 'log', '--format=%H', '--grep', r'\[DEV-1234\]'],
+            cwd=repository,
+            capture_output=True,
+            check=True,
+        )
+        print(f'{"git log --grep (for comparison)":<40} {(time.perf_counter() - start) * 1e3:>10.3f}ms')  # fmt: skip
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Match throughput of the trie factored `commit_parser` against a flat alternation.
+
+python -m benchmarks.bench_commit_parser --messages 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.parsers import build_commit_parser
+
+
+PREFIXES = ['feat', 'fix', 'chore', 'build', 'docs', 'perf', 'refactor', 'test']
+
+
+def make_commit_types(count: int) -> list:
+    return [
+        f'{PREFIXES[index % len(PREFIXES)]}-component{index}' for index in range(count)
+    ]
+
+
+def flat_commit_parser(commit_types: list) -> str:
+    piped_commit_types = '|'.join(commit_types + ['BREAKING CHANGE'])
+
+    return (
+        rf'^((?P<change_type>{piped_commit_types})'
+        r'(?:\((?P<scope>[^()\r\n]*)\)|\()?(?P<breaking>!)?|\w+!):\s(?P<message>.*)?'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=100_000)
+    parser.add_argument('--types', default='10,100,1000')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    for count in [int(count) for count in args.types.split(',')]:
+        commit_types = make_commit_types(count)
+        messages = [
+            f'{rng.choice(commit_types)}{message[message.index(":") :]}'
+            for message in synthetic_messages(args.messages)
+        ]
+
+        for label, commit_parser in [
+            ('flat', flat_commit_parser(commit_types)),
+            ('trie', build_commit_parser(tuple(commit_types))),
+        ]:
+            match = re.compile(commit_parser, re.MULTILINE).match
+            seconds = measure(lambda: [match(message) for message in messages])
+            report(f'{label} types={count}', args.messages, seconds, 'messages')
+
+
+if __name__ == '__main__':
+    main()
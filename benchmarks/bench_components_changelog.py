@@ -0,0 +1,81 @@
+"""Per-component changelogs of a monorepo, from one read of the history against
+one read per component.
+
+python -m benchmarks.bench_components_changelog --commits 20000 --components 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+
+from benchmarks.common import make_git_repository
+from benchmarks.common import make_plugin
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.git_log import iter_git_log_paths
+from cz_bitbucket_jira_plugin.monorepo import ComponentMatcher
+from cz_bitbucket_jira_plugin.monorepo import HISTORY_FIELDS
+from cz_bitbucket_jira_plugin.monorepo import render_component_changelogs
+from cz_bitbucket_jira_plugin.monorepo import split_history
+
+
+def synthetic_monorepo_commits(count: int, components: int, seed: int = 0):
+    """Messages with the paths they change, in one to three components."""
+    rng = random.Random(seed)
+
+    for message in synthetic_messages(count, seed=seed):
+        paths = [
+            f'services/c{rng.randrange(components)}/src/m{rng.randrange(50)}.py'
+            for _ in range(rng.randint(1, 3))
+        ]
+        yield message, sorted(set(paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=20_000)
+    parser.add_argument('--components', type=int, default=40)
+    args = parser.parse_args()
+
+    components = {
+        f'c{number}': {
+            'paths': [f'services/c{number}/**'],
+            'jira_project_key': f'C{number}',
+            'changelog_file': f'services/c{number}/CHANGELOG.md',
+        }
+        for number in range(args.components)
+    }
+    cz = make_plugin(components=components)
+
+    with tempfile.TemporaryDirectory() as directory:
+        commits = synthetic_monorepo_commits(args.commits, args.components)
+        repository = make_git_repository(directory, commits)
+        os.chdir(repository)
+
+        def split_once():
+            history = iter_git_log_paths(fields=HISTORY_FIELDS)
+            return split_history(
+                ComponentMatcher(cz.components), cz.commit_parser_pattern, history
+            )
+
+        def split_per_component():
+            for component in cz.components:
+                history = iter_git_log_paths(fields=HISTORY_FIELDS)
+                split_history(
+                    ComponentMatcher([component]), cz.commit_parser_pattern, history
+                )
+
+        for label, function in [
+            (f'split, {args.components} history reads', split_per_component),
+            ('split, 1 history read', split_once),
+            ('changelogs, 1 history read', lambda: render_component_changelogs(cz)),
+        ]:
+            report(label, args.commits, measure(function, repeat=1), 'commits')
+
+
+if __name__ == '__main__':
+    main()
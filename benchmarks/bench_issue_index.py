@@ -0,0 +1,96 @@
+"""Build time and lookup latency of the offline Jira issue index.
+
+python -m benchmarks.bench_issue_index --issues 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import measure
+from benchmarks.common import random_words
+from benchmarks.common import report
+from cz_bitbucket_jira_plugin.issue_index import Issue
+from cz_bitbucket_jira_plugin.issue_index import IssueIndex
+
+
+PROJECTS = ['DEV', 'OPS', 'WEB', 'DATA']
+
+
+def synthetic_issues(count: int, seed: int = 0) -> list[Issue]:
+    rng = random.Random(seed)
+    words = random_words(rng, 1_000).split()
+    issues = []
+
+    for index in range(count):
+        project = PROJECTS[index % len(PROJECTS)]
+        summary = ' '.join(rng.choices(words, k=6))
+        issues.append(Issue(project, index // len(PROJECTS) + 1, summary, 'Task'))
+
+    return issues
+
+
+def latencies(function, arguments) -> list[float]:
+    timings = []
+
+    for argument in arguments:
+        start = time.perf_counter()
+        function(*argument)
+        timings.append(time.perf_counter() - start)
+
+    return sorted(timings)
+
+
+def report_latency(label: str, timings: list[float]) -> None:
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(f'{label:<40} {len(timings):>10} calls   p50 {p50:>7.1f}us   p99 {p99:>7.1f}us   max {timings[-1] * 1e6:>8.1f}us')  # fmt: skip
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--issues', type=int, default=500_000)
+    parser.add_argument('--lookups', type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    max_number = args.issues // len(PROJECTS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'issues.sqlite'
+
+        issues = synthetic_issues(args.issues)
+        seconds = measure(lambda: IssueIndex.build(path, issues), repeat=1)
+        report('build', args.issues, seconds, 'issues')
+
+        index = IssueIndex(path)
+        start = time.perf_counter()
+        index.get('DEV', 1)
+        print(f'{"first lookup (opens the file)":<40} {(time.perf_counter() - start) * 1e3:>10.3f}ms')  # fmt: skip
+
+        # Half of the lookups miss, like typos would
+        keys = [
+            (rng.choice(PROJECTS), rng.randint(1, max_number * 2))
+            for _ in range(args.lookups)
+        ]
+        report_latency('get(project, number)', latencies(index.get, keys))
+
+        # What the completer asks for while an issue number is typed
+        prefixes = []
+
+        for _ in range(args.lookups // 10):
+            number = str(rng.randint(1, max_number))
+            prefixes.extend(
+                (rng.choice(PROJECTS), number[:length])
+                for length in range(len(number) + 1)
+            )
+
+        report_latency('complete(project, prefix)', latencies(index.complete, prefixes))
+
+
+if __name__ == '__main__':
+    main()
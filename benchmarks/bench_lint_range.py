@@ -0,0 +1,44 @@
+"""Commit range linter over a generated local repository.
+
+python -m benchmarks.bench_lint_range --commits 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+
+from benchmarks.common import COMMIT_TYPES
+from benchmarks.common import cpu_count
+from benchmarks.common import make_git_repository
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.linter import lint_range
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        messages = list(synthetic_messages(args.commits))
+        # A single invalid commit, in the middle of the history
+        messages[len(messages) // 2] = 'wip'
+        repository = make_git_repository(directory, messages)
+
+        for label, options in [
+            ('serial', {'workers': 1}),
+            (f'pool workers={cpu_count()}', {'workers': cpu_count()}),
+            ('fail fast', {'workers': 1, 'fail_fast': True}),
+        ]:
+            seconds = measure(
+                lambda: lint_range(None, COMMIT_TYPES, cwd=repository, **options),
+                repeat=1,
+            )
+            report(label, args.commits, seconds, 'commits')
+
+
+if __name__ == '__main__':
+    main()
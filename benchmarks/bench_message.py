@@ -0,0 +1,116 @@
+"""Per-message cost of `message()`, with the default and a custom template,
+against the string concatenation chain it replaced.
+
+    python -m benchmarks.bench_message --messages 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import OrderedDict
+
+from benchmarks.common import make_plugin
+from benchmarks.common import measure
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_MESSAGE_TEMPLATE
+from tests.unit.test_message_template import all_answers
+
+
+def legacy_message(answers, user_jira_project_key=None):
+    """`message()` before it was rendered from a template."""
+    jira_project_key = str(answers.get('jira_project_key') or user_jira_project_key or '')
+
+    if jira_project_key:
+        jira_project_key += '-'
+
+    issue_epic_number = answers.get('issue_epic_number')
+    issue_number = answers.get('issue_number')
+    issue_subtasks = answers.get('issue_subtasks')
+    issue_related_tasks = answers.get('issue_related_tasks')
+
+    commit_type = answers.get('commit_type')
+    commit_scope = answers.get('commit_scope', '').strip()
+
+    commit_title = answers.get('commit_title')
+    commit_title = commit_title[:1].lower() + commit_title[1:]
+    commit_title = commit_title.strip().rstrip('.')
+
+    commit_description = answers.get('commit_description')
+    is_breaking_change = answers.get('is_breaking_change')
+    footer = answers.get('footer')
+
+    breaking_change_sign = '!' if is_breaking_change else ''
+    breaking_change_text = 'BREAKING CHANGE' if is_breaking_change else ''
+
+    if commit_scope:
+        commit_message = (
+            f'{commit_type}({commit_scope}){breaking_change_sign}: '
+            f'{commit_title} [{jira_project_key}{issue_number}]'
+        )
+    else:
+        commit_message = (
+            f'{commit_type}{breaking_change_sign}: '
+            f'{commit_title} [{jira_project_key}{issue_number}]'
+        )
+
+    if commit_description:
+        if is_breaking_change:
+            commit_message += f'\n\n{breaking_change_text}: {commit_description}'
+        else:
+            commit_message += f'\n\n{commit_description}'
+    else:
+        commit_message += f'\n\n{breaking_change_text}'
+
+    if issue_epic_number:
+        commit_message += f'\n\nissue epic: [{jira_project_key}{issue_epic_number}]'
+
+    if issue_subtasks:
+        issue_subtasks = [task.strip() for task in issue_subtasks.split(',')]
+        issue_subtasks = list(OrderedDict.fromkeys(issue_subtasks))
+        subtasks_list = [f'{jira_project_key}{task.strip()}' for task in issue_subtasks]
+
+        if issue_epic_number:
+            commit_message += f'\nissue subtasks: [{", ".join(subtasks_list)}]'
+        else:
+            commit_message += f'\n\nissue subtasks: [{", ".join(subtasks_list)}]'
+
+    if issue_related_tasks:
+        issue_related_tasks = [task.strip() for task in issue_related_tasks.split(',')]
+        issue_related_tasks = list(OrderedDict.fromkeys(issue_related_tasks))
+        related_tasks_list = [
+            f'{jira_project_key}{task.strip()}' for task in issue_related_tasks
+        ]
+
+        if issue_epic_number or issue_subtasks:
+            commit_message += f'\nissue related tasks: [{", ".join(related_tasks_list)}]'
+        else:
+            commit_message += (
+                f'\n\nissue related tasks: [{", ".join(related_tasks_list)}]'
+            )
+
+    if footer:
+        commit_message += f'\n\n{footer}'
+
+    return commit_message.rstrip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=100_000)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+    custom_cz = make_plugin(commit_message_template=f'{DEFAULT_COMMIT_MESSAGE_TEMPLATE} ')
+    combinations = list(all_answers())
+    answers = (combinations * (args.messages // len(combinations) + 1))[: args.messages]
+
+    for label, function in [
+        ('legacy message()', lambda: [legacy_message(a, 'DEV') for a in answers]),
+        ('default message()', lambda: [cz.message(a) for a in answers]),
+        ('custom template message()', lambda: [custom_cz.message(a) for a in answers]),
+    ]:
+        seconds = measure(function)
+        print(f'{label:<27} {seconds / args.messages * 1e6:8.2f} us/message')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Merged changelog of many repositories: read one after the other, read by a
+pool of threads, and from the cache of the unchanged ones.
+
+python -m benchmarks.bench_multi_repo --repositories 30 --commits 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import make_git_repository
+from benchmarks.common import make_plugin
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.functions import CACHE_DIR_ENV_VAR
+from cz_bitbucket_jira_plugin.multi_repo import merge_entries
+from cz_bitbucket_jira_plugin.multi_repo import read_repositories
+from cz_bitbucket_jira_plugin.multi_repo import Repository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repositories', type=int, default=30)
+    parser.add_argument('--commits', type=int, default=5_000)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+    total = args.repositories * args.commits
+    # Histories end before now, so git doesn't walk them all to check dates
+    start_timestamp = int(time.time()) - (args.commits + 1) * 600
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ[CACHE_DIR_ENV_VAR] = str(Path(directory) / 'cache')
+        repositories = [
+            Repository(
+                f'r{number}',
+                make_git_repository(
+                    Path(directory) / f'r{number}',
+                    synthetic_messages(args.commits, seed=number),
+                    start_timestamp,
+                ),
+            )
+            for number in range(args.repositories)
+        ]
+
+        def read(workers, use_cache=False):
+            return lambda: merge_entries(
+                read_repositories(
+                    repositories,
+                    cz.commit_parser,
+                    cz.change_type_map,
+                    use_cache=use_cache,
+                    workers=workers,
+                )
+            )
+
+        for label, function in [
+            ('serial', read(1)),
+            ('thread pool', read(args.workers)),
+            ('thread pool, cold cache', read(args.workers, use_cache=True)),
+        ]:
+            report(label, total, measure(function, repeat=1), 'commits')
+
+        report(
+            'thread pool, warm cache',
+            total,
+            measure(read(args.workers, use_cache=True)),
+            'commits',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Worst case of every plugin pattern on adversarial inputs, at growing sizes.
+
+For each use of a pattern, the slowest of the adversarial inputs of
+`tests/unit/test_patterns.py` is reported with its growth: a linear pattern
+takes about 4 times longer on an input 4 times larger, a quadratic one 16 times.
+The legacy `jira_url` pattern is run on smaller inputs, for comparison.
+
+python -m benchmarks.bench_patterns --size 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.common import measure
+from tests.unit.test_patterns import ADVERSARIAL_UNITS
+from tests.unit.test_patterns import LEGACY_JIRA_URL_PATTERN
+from tests.unit.test_patterns import PATTERN_USES
+
+
+def build(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size] + '-1 #done'
+
+
+def worst_case(function, size: int):
+    return max(
+        (measure(lambda: function(build(unit, size)), repeat=1), unit)
+        for unit in ADVERSARIAL_UNITS
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    uses = [(name, function, args.size) for name, function in PATTERN_USES.items()]
+    uses.append(('jira_url (legacy)', LEGACY_JIRA_URL_PATTERN.search, 40_000))
+
+    for name, function, size in uses:
+        small, _ = worst_case(function, size // 4)
+        seconds, unit = worst_case(function, size)
+        growth = seconds / small if small else float('inf')
+
+        print(f'{name:<24} {size:>9} chars {seconds:>9.3f}s  x{growth:<6.1f} worst: {unit!r}')  # fmt: skip
+
+
+if __name__ == '__main__':
+    main()
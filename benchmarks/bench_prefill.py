@@ -0,0 +1,71 @@
+"""Answers prefilled from the branch of a large repository: the single bounded
+`git log` call, then the cached answers of the next prompts.
+
+python -m benchmarks.bench_prefill --commits 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import make_git_repository
+from benchmarks.common import make_plugin
+from benchmarks.common import measure
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.git_log import get_branch_history
+from cz_bitbucket_jira_plugin.prefill import guess_answers
+from cz_bitbucket_jira_plugin.prefill import HISTORY_SIZE
+from cz_bitbucket_jira_plugin.prefill import read_answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=200_000)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+    start_timestamp = int(time.time()) - (args.commits + 1) * 600
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_git_repository(
+            Path(directory) / 'repository',
+            synthetic_messages(args.commits),
+            start_timestamp,
+        )
+        subprocess.run(
+            ['git', 'checkout', '-q', '-b', 'feature/DEV-1234-answers'],
+            cwd=path,
+            check=True,
+        )
+
+        history = get_branch_history(HISTORY_SIZE, cwd=path)
+        timings = [
+            (
+                'git log of the branch',
+                lambda: get_branch_history(HISTORY_SIZE, cwd=path),
+            ),  # fmt: skip
+            (
+                'answers from the history',
+                lambda: guess_answers(*history, cz.commit_parser),
+            ),  # fmt: skip
+        ]
+
+        for label, function in timings:
+            print(f'{label:<40} {args.commits:>10} commits {measure(function, repeat=10) * 1e3:>8.2f} ms')  # fmt: skip
+
+        start = time.perf_counter()
+        answers = read_answers(str(path), cz.commit_parser)
+        first = time.perf_counter() - start
+        cached = measure(lambda: read_answers(str(path), cz.commit_parser), repeat=1000)
+
+        print(f'{"first prompt":<40} {args.commits:>10} commits {first * 1e3:>8.2f} ms')  # fmt: skip
+        print(f'{"next prompts (cached)":<40} {args.commits:>10} commits {cached * 1e3:>8.3f} ms')  # fmt: skip
+        print(f'prefilled: {", ".join(sorted(answers))}')  # fmt: skip
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Epic-grouped release notes of a large generated range, from `git log` to
+Markdown.
+
+python -m benchmarks.bench_release_notes --commits 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import tempfile
+import tracemalloc
+
+from benchmarks.common import make_git_repository
+from benchmarks.common import make_plugin
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.release_notes import collect_release_notes
+from cz_bitbucket_jira_plugin.release_notes import render_release_notes
+from cz_bitbucket_jira_plugin.release_notes import write_release_notes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=200_000)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+    messages = list(synthetic_messages(args.commits))
+    records = [(f'{index:040x}', message) for index, message in enumerate(messages)]
+
+    def collect():
+        return collect_release_notes(
+            records, cz.commit_parser, cz.jira_browse_url, cz.change_type_map
+        )
+
+    report('collect, in memory', args.commits, measure(collect), 'commits')
+
+    notes = collect()
+    seconds = measure(
+        lambda: io.StringIO().writelines(
+            render_release_notes(notes, cz.jira_browse_url, cz.change_type_order)
+        )
+    )
+    report('render', notes.entries, seconds, 'entries')
+
+    tracemalloc.start()
+    collect()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    size = sum(len(message) for message in messages)
+    print(f'{"peak memory of collect":<40} {peak / 1e6:>10.1f}MB for {size / 1e6:.1f}MB of messages')  # fmt: skip
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(make_git_repository(directory, messages))
+        seconds = measure(lambda: write_release_notes(cz, io.StringIO()), repeat=1)
+        report('git log to Markdown', args.commits, seconds, 'commits')
+
+
+if __name__ == '__main__':
+    main()
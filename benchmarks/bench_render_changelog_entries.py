@@ -0,0 +1,44 @@
+"""Scaling of `render_changelog_entries` with the number of workers.
+
+python -m benchmarks.bench_render_changelog_entries --sizes 10000,100000,1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.common import make_plugin
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_commits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--workers', default='1,2,4,8')
+    parser.add_argument('--executor', default='process', choices=['process', 'thread'])
+    parser.add_argument('--chunk-size', type=int, default=2_000)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+
+    for size in [int(size) for size in args.sizes.split(',')]:
+        commits = list(synthetic_commits(size))
+
+        for workers in [int(workers) for workers in args.workers.split(',')]:
+            seconds = measure(
+                lambda: cz.render_changelog_entries(
+                    commits,
+                    workers=workers,
+                    executor=args.executor,
+                    chunk_size=args.chunk_size,
+                    serial_threshold=0 if workers > 1 else size + 1,
+                ),
+                repeat=1,
+            )
+            report(f"{args.executor} workers={workers}", size, seconds, 'commits')  # fmt: skip
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Throughput of the streaming, non-interactive message rendering.
+
+python -m benchmarks.bench_render_messages --records 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+
+from benchmarks.common import COMMIT_TYPES
+from benchmarks.common import make_plugin
+from benchmarks.common import measure
+from benchmarks.common import random_words
+from benchmarks.common import report
+from cz_bitbucket_jira_plugin.messages import read_answer_records
+from cz_bitbucket_jira_plugin.messages import render_messages
+
+
+def make_jsonl(count: int) -> str:
+    rng = random.Random(0)
+    lines = []
+
+    for index in range(count):
+        answers = {
+            'issue_number': rng.randint(1, 50_000),
+            'issue_epic_number': rng.randint(1, 300) if index % 4 == 0 else '',
+            'issue_subtasks': f'{index}, {index + 1}' if index % 3 == 0 else '',
+            'commit_type': rng.choice(COMMIT_TYPES),
+            'commit_scope': 'api' if index % 2 else '',
+            'commit_title': random_words(rng, 8),
+            'commit_description': random_words(rng, 20),
+            'is_breaking_change': index % 50 == 0,
+        }
+        lines.append(json.dumps(answers))
+
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=100_000)
+    args = parser.parse_args()
+
+    cz = make_plugin()
+    content = make_jsonl(args.records)
+
+    def run():
+        records = read_answer_records(io.StringIO(content))
+
+        for rendered in render_messages(cz, records):
+            pass
+
+    report('jsonl -> validate -> message()', args.records, measure(run), 'records')
+
+
+if __name__ == '__main__':
+    main()
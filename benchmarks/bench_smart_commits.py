@@ -0,0 +1,88 @@
+"""Smart Commit parsing and per-issue totals, in memory and over a generated
+repository, with and without the cache of parsed revisions.
+
+python -m benchmarks.bench_smart_commits --commits 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import subprocess
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import make_git_repository
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import synthetic_messages
+from cz_bitbucket_jira_plugin.smart_commits import aggregate
+from cz_bitbucket_jira_plugin.smart_commits import iter_range_commands
+from cz_bitbucket_jira_plugin.smart_commits import parse_smart_commands
+from cz_bitbucket_jira_plugin.smart_commits import SmartCommitCache
+
+
+SMART_COMMANDS = [
+    '#done',
+    '#time 2h',
+    '#time 1d 4h reviewing',
+    '#comment fixed the #12 edge case',
+    '#start-review #time 30m',
+]
+
+
+def smart_commit_messages(count: int, seed: int = 0):
+    """Messages of `synthetic_messages()`, most with a Smart Commit line."""
+    rng = random.Random(seed)
+
+    for message in synthetic_messages(count, seed=seed):
+        if rng.random() < 0.7:
+            issue = message.partition('[')[2].partition(']')[0]
+            message += f'\n\n{issue} {rng.choice(SMART_COMMANDS)}'
+
+        yield message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commits', type=int, default=200_000)
+    args = parser.parse_args()
+
+    messages = list(smart_commit_messages(args.commits))
+    lines = sum(message.count('\n') + 1 for message in messages)
+
+    seconds = measure(lambda: [parse_smart_commands(message) for message in messages])
+    report('parse', lines, seconds, 'lines')
+
+    commits = [
+        (f'{index:040x}', parse_smart_commands(message))
+        for index, message in enumerate(messages)
+    ]
+    report('aggregate', args.commits, measure(lambda: aggregate(commits)), 'commits')
+
+    with tempfile.TemporaryDirectory() as directory:
+        repository = make_git_repository(Path(directory) / 'repository', messages)
+        # Like a repository after `git gc`: listing revisions doesn't read the
+        # commits, so the cache saves reading the messages
+        subprocess.run(
+            ['git', 'commit-graph', 'write', '--reachable'], cwd=repository, check=True
+        )
+        cache_path = Path(directory) / 'smart_commits.pickle'
+
+        def run(cache=None):
+            return aggregate(iter_range_commands(cache=cache, cwd=repository))
+
+        seconds = measure(run, repeat=1)
+        report('range, without cache', args.commits, seconds, 'commits')
+
+        cache = SmartCommitCache(cache_path)
+        seconds = measure(lambda: run(cache), repeat=1)
+        cache.save()
+        report('range, cold cache', args.commits, seconds, 'commits')
+
+        seconds = measure(lambda: run(SmartCommitCache(cache_path)), repeat=1)
+        report('range, warm cache (new process)', args.commits, seconds, 'commits')
+
+
+if __name__ == '__main__':
+    main()
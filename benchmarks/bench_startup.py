@@ -0,0 +1,58 @@
+"""Startup cost of the `check` command and of the plugin import by Commitizen,
+on top of a bare interpreter, on fresh interpreters.
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+CONFIG_CONTENT = """
+[tool.commitizen]
+name = "cz-bitbucket-jira-plugin"
+jira_url = "https://benchmark.atlassian.net"
+"""
+
+MESSAGE = 'feat(api)!: add the bat mode [DEV-1]\n\nissue epic: [DEV-2]\n'
+
+
+def best_ms(command: list[str], cwd: Path, runs: int) -> float:
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = Path(directory)
+        (cwd / 'cz.toml').write_text(CONFIG_CONTENT)
+        (cwd / 'COMMIT_EDITMSG').write_text(MESSAGE)
+
+        bare_ms = best_ms([sys.executable, '-c', 'pass'], cwd, args.runs)
+
+        for label, command in [
+            ('check', ['-m', 'cz_bitbucket_jira_plugin', 'check', 'COMMIT_EDITMSG']),
+            ('import commitizen.cz', ['-c', 'import commitizen.cz']),
+        ]:
+            elapsed_ms = best_ms([sys.executable, *command], cwd, args.runs)
+            print(f'{label:<22} {elapsed_ms - bare_ms:8.1f} ms over a bare interpreter')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Latency of the commit type search of the prompt on a large catalog: each
+query is typed one character at a time, as the completer sees it, against a
+plain scan of the names on each keystroke.
+
+python -m benchmarks.bench_type_search --types 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from cz_bitbucket_jira_plugin.type_search import CommitTypeIndex
+
+
+TEAMS = ['platform', 'billing', 'search', 'mobile', 'payments', 'identity']
+CHANGES = ['feature', 'fix', 'refactoring', 'documentation', 'migration', 'rollback']
+
+
+def synthetic_types(count: int) -> list:
+    random_ = random.Random(0)
+
+    return [
+        {
+            'value': f'{random_.choice(TEAMS)}-{random_.choice(CHANGES)}-{number}',
+            'name': f'{random_.choice(CHANGES)} of the {random_.choice(TEAMS)} team, number {number}',
+        }
+        for number in range(count)
+    ]
+
+
+def naive_search(commit_types, query: str, limit: int = 10) -> list:
+    query = query.strip().lower()
+
+    return [
+        commit_type
+        for commit_type in commit_types
+        if query in commit_type['value'].lower() or query in commit_type['name'].lower()
+    ][:limit]
+
+
+def keystrokes(search, queries) -> list:
+    timings = []
+
+    for query in queries:
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            search(query[:end])
+            timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def report_latency(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f'{label:<30} {len(timings):>6} keystrokes  median {statistics.median(timings) * 1e3:.3f} ms  p99 {p99 * 1e3:.3f} ms  max {timings[-1] * 1e3:.3f} ms')  # fmt: skip
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--types', type=int, default=10_000)
+    args = parser.parse_args()
+
+    commit_types = synthetic_types(args.types)
+    queries = [
+        'platform-fix',
+        'billing',
+        'rollback of the',
+        'team, number 42',
+        f'search-feature-{args.types - 1}',
+        'nothing like it',
+        'mig',
+    ]
+
+    start = time.perf_counter()
+    index = CommitTypeIndex(commit_types, recent=[commit_types[-1]['value']])
+    print(f'index of {args.types} types built in {(time.perf_counter() - start) * 1e3:.1f} ms')  # fmt: skip
+
+    report_latency('index', keystrokes(index.search, queries))
+    report_latency('scan of the names', keystrokes(lambda query: naive_search(commit_types, query), queries))  # fmt: skip
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Helpers shared by the benchmark scripts.
+
+Benchmarks are plain scripts, run them from the repository root, e.g.:
+
+    python -m benchmarks.bench_changelog_hook
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import string
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable
+from typing import Iterator
+
+from commitizen import git
+from commitizen.config import BaseConfig
+
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+
+
+JIRA_URL = 'https://benchmark.atlassian.net'
+COMMIT_TYPES = [commit_type['value'] for commit_type in DEFAULT_COMMIT_TYPES]
+
+
+def make_config(**settings) -> BaseConfig:
+    config = BaseConfig()
+    config.update({'jira_url': JIRA_URL, 'jira_project_key': 'DEV', **settings})
+    # Pretend Commitizen loaded the settings from a file, so the plugin doesn't
+    # look for a config file in the current directory.
+    config.add_path('cz.toml')
+
+    return config
+
+
+def make_plugin(**settings):
+    from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+
+    return CzBitbucketJiraPlugin(config=make_config(**settings))
+
+
+def random_words(rng: random.Random, count: int) -> str:
+    return ' '.join(
+        ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        for _ in range(count)
+    )
+
+
+def synthetic_messages(count: int, seed: int = 0) -> Iterator[str]:
+    """Yield commit messages in the format written by `message()`."""
+    rng = random.Random(seed)
+
+    for index in range(count):
+        commit_type = rng.choice(COMMIT_TYPES)
+        scope = f'({rng.choice(["api", "ui", "cli", "core"])})' if index % 3 else ''
+        breaking = '!' if index % 50 == 0 else ''
+        title = random_words(rng, rng.randint(4, 10))
+        issue = rng.randint(1, 50_000)
+        body = random_words(rng, 12)
+        footer = ''
+
+        if index % 4 == 0:
+            footer = (
+                f'\n\nissue epic: [DEV-{rng.randint(1, 300)}]'
+                f'\nissue subtasks: [DEV-{issue + 1}, DEV-{issue + 2}]'
+            )
+
+        yield (f'{commit_type}{scope}{breaking}: {title} [DEV-{issue}]\n\n{body}{footer}')
+
+
+def synthetic_commits(count: int, seed: int = 0) -> Iterator[git.GitCommit]:
+    rng = random.Random(seed)
+
+    for message in synthetic_messages(count, seed=seed):
+        title, _, body = message.partition('\n\n')
+        rev = '%040x' % rng.getrandbits(160)
+        yield git.GitCommit(rev=rev, title=title, body=body, author='bench')
+
+
+def make_git_repository(path, messages, start_timestamp: int = 1_600_000_000) -> Path:
+    """Create a git repository with one commit per message (oldest first), using
+    `git fast-import` so large histories are generated in seconds.
+
+    Commits are empty, unless the message is a `(message, paths)` tuple: then
+    each path is written with the message as content.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(['git', 'init', '-q', '-b', 'main'], cwd=path, check=True)
+
+    process = subprocess.Popen(
+        ['git', 'fast-import', '--quiet'], cwd=path, stdin=subprocess.PIPE
+    )
+
+    for index, message in enumerate(messages, start=1):
+        paths = ()
+
+        if isinstance(message, tuple):
+            message, paths = message
+
+        data = message.encode()
+        timestamp = start_timestamp + index * 600
+        commit = (
+            f'commit refs/heads/main\n'
+            f'mark :{index}\n'
+            f'author Bench <bench@example.com> {timestamp} +0000\n'
+            f'committer Bench <bench@example.com> {timestamp} +0000\n'
+            f'data {len(data)}\n'
+        ).encode()
+        parent = f'from :{index - 1}\n'.encode() if index > 1 else b''
+        files = b''.join(
+            f'M 100644 inline {file_path}\ndata {len(data)}\n'.encode() + data + b'\n'
+            for file_path in paths
+        )
+        process.stdin.write(commit + data + b'\n' + parent + files + b'\n')
+
+    process.stdin.close()
+
+    if process.wait() != 0:
+        raise RuntimeError('git fast-import failed')
+
+    subprocess.run(['git', 'reset', '-q', '--hard'], cwd=path, check=True)
+
+    return path
+
+
+def cpu_count() -> int:
+    return os.cpu_count() or 1
+
+
+def measure(function: Callable[[], object], repeat: int = 3) -> float:
+    """Return the best wall time, in seconds, of `repeat` runs of `function`."""
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def report(label: str, items: int, seconds: float, unit: str = 'items') -> None:
+    rate = items / seconds if seconds else float('inf')
+    print(f'{label:<40} {items:>10} {unit} {seconds:>9.3f}s {rate:>14,.0f} {unit}/s')
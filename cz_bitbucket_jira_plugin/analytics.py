@@ -0,0 +1,369 @@
+"""Commit convention analytics of whole histories: change types per quarter,
+issues per release, breaking change rate and commits per epic.
+
+The history is read in one `git log` pass, in chunks of about a megabyte. Each
+chunk is parsed by a single `findall()` of a bytes regex (the grammar of
+`commit_parser` for the title, the `issue epic:` footer written by `message()`
+for the body) into columns: `array`s of timestamps, change type codes, issue
+and epic ids, breaking flags and release ids. Values become ids once per
+distinct value, and the aggregates are counted over whole columns with
+`zip()`, `compress()` and `Counter()`. No Python code runs per commit, only C
+loops over the columns.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from datetime import timezone
+from functools import partial
+from itertools import compress
+from itertools import count
+from itertools import repeat
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .parsers import build_alternation
+
+
+OUTPUT_FORMATS = ('json', 'csv')
+CSV_COLUMNS = ('metric', 'group', 'key', 'value')
+
+# Commit timestamp, refs (for the version tags), title and body of a commit
+LOG_FORMAT = '%ct%x1f%D%x1f%s%x1f%b'
+
+NO_TYPE = '(none)'
+UNRELEASED = 'Unreleased'
+
+
+def build_record_pattern(commit_types: Sequence[str]) -> re.Pattern:
+    """Pattern of a `LOG_FORMAT` record, its groups being the timestamp, the
+    refs, the change type, the `!` of a typed or untyped breaking change, the
+    issue key and the epic key.
+
+    The title follows the grammar of `build_commit_parser()`, the issue key is
+    the one of `split_issue_id()` and the epic the one of `ISSUE_FOOTER_PATTERN`.
+    Every record matches, with empty groups for what it doesn't have, so the
+    columns of a chunk stay aligned.
+    """
+    change_types = build_alternation(tuple(commit_types) + ('BREAKING CHANGE',))
+
+    # fmt: off
+    return re.compile(
+        rb'(\d*)\x1f([^\x1f\x00]*)\x1f'
+        rb'(?:(?:(' + change_types.encode() + rb')(?:\([^()\r\n\x1f\x00]*\)|\()?|\w+(?=!))(!)?:\s)?'
+        rb'(?:[^\x1f\x00\n]*\[([^\[\]\x1f\x00\n]*)\][^\[\x1f\x00\n]*(?=\x1f))?'
+        rb'[^\x1f\x00]*\x1f'
+        rb'(?:(?:[^\x00]*\n)?issue epic: \[([^\[\]\n\x00]*)\][ \t]*(?=[\n\x00]))?'
+        rb'[^\x00]*\x00'
+    )
+    # fmt: on
+
+
+def build_tag_pattern(cz) -> re.Pattern:
+    """Pattern of the version tags, from `tag_format`, like `cz changelog`."""
+    from commitizen.changelog import get_tag_regexes
+    from commitizen.version_schemes import get_version_scheme
+
+    tag_format = cz.config.settings.get('tag_format') or '$version'
+    scheme = get_version_scheme(cz.config)
+
+    for variable, regex in get_tag_regexes(scheme.parser.pattern).items():
+        tag_format = tag_format.replace(variable, regex)
+
+    return re.compile(tag_format)
+
+
+class Codes:
+    """Ids of the distinct values of a column, `0` being no value.
+
+    Raw values are normalized into labels, raw values with the same label share
+    its id.
+    """
+
+    def __init__(self, normalize: Callable[[bytes], str]) -> None:
+        self.normalize = normalize
+        self.labels: List[Optional[str]] = [None]
+        self._ids: Dict[bytes, int] = {b'': 0}
+        self._label_ids: Dict[str, int] = {}
+
+    def encode(self, values: Sequence[bytes]) -> Iterable[int]:
+        ids = self._ids
+
+        # Only the values not seen yet are normalized, one by one
+        for value in dict.fromkeys(values).keys() - ids.keys():
+            label = self.normalize(value)
+            label_id = self._label_ids.get(label)
+
+            if label_id is None:
+                label_id = self._label_ids[label] = len(self.labels)
+                self.labels.append(label)
+
+            ids[value] = label_id
+
+        return map(ids.__getitem__, values)
+
+    def get(self, label: str) -> int:
+        return self._label_ids.get(label, 0)
+
+
+def _decode(value: bytes) -> str:
+    return value.decode(errors='replace')
+
+
+def _decode_key(value: bytes) -> str:
+    return value.decode(errors='replace').strip().upper()
+
+
+class CommitColumns:
+    """The commits of one or more histories, one array per attribute."""
+
+    def __init__(self, commit_types: Sequence[str], tag_pattern: re.Pattern) -> None:
+        self.pattern = build_record_pattern(commit_types)
+        self.tag_pattern = tag_pattern
+        self.timestamps = array('q')
+        self.types = array('i')
+        self.issues = array('i')
+        self.epics = array('i')
+        # `!` titles, `BREAKING CHANGE` ones are told by their type
+        self.breaking = array('b')
+        self.releases = array('i')
+        self.type_codes = Codes(_decode)
+        self.issue_codes = Codes(_decode_key)
+        self.epic_codes = Codes(_decode_key)
+        self.release_labels: List[str] = []
+        self.release_runs: List[Tuple[int, int]] = []
+        self.repositories: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add_history(
+        self, name: str, chunks: Iterable[bytes], release_prefix: str = ''
+    ) -> int:
+        """Add the commits of the `LOG_FORMAT` chunks of a history, newest
+        first, its releases labeled `<release_prefix><tag>`. Return the number
+        of commits added."""
+        start = len(self)
+        markers: List[Tuple[int, str]] = []
+
+        for chunk in chunks:
+            rows = self.pattern.findall(chunk)
+
+            if not rows:
+                continue
+
+            offset = len(self)
+            timestamps, refs, types, bangs, issues, epics = zip(*rows)
+
+            self.timestamps.extend(map(int, timestamps))
+            self.types.extend(self.type_codes.encode(types))
+            self.breaking.extend(map(bool, bangs))
+            self.issues.extend(self.issue_codes.encode(issues))
+            self.epics.extend(self.epic_codes.encode(epics))
+
+            # Only the commits with refs are looked at, for their version tags
+            for position in compress(count(offset), refs):
+                tag = self._get_version_tag(refs[position - offset])
+
+                if tag is not None:
+                    markers.append((position, tag))
+
+        self._add_releases(start, len(self), markers, release_prefix)
+        self.repositories.append(name)
+
+        return len(self) - start
+
+    def _get_version_tag(self, refs: bytes) -> Optional[str]:
+        for ref in refs.decode(errors='replace').split(', '):
+            if ref.startswith('tag: ') and self.tag_pattern.match(ref[5:]):
+                return ref[5:]
+
+        return None
+
+    def _add_releases(
+        self, start: int, end: int, markers: List[Tuple[int, str]], prefix: str
+    ) -> None:
+        # A release starts at its tagged commit and takes the older ones until
+        # the next release: each one is a run of the same release id
+        boundaries = [(start, UNRELEASED), *markers, (end, '')]
+
+        for (position, tag), (next_position, _) in zip(boundaries, boundaries[1:]):
+            if next_position > position:
+                release = len(self.release_labels)
+                self.releases.extend(repeat(release, next_position - position))
+                self.release_labels.append(f'{prefix}{tag}')
+                self.release_runs.append((position, next_position))
+
+    def get_quarters(self) -> Tuple[array, List[str]]:
+        """Quarter ids of the commits (UTC), and their `YYYY-Qn` labels."""
+        if not self.timestamps:
+            return array('i'), []
+
+        first = datetime.fromtimestamp(min(self.timestamps), tz=timezone.utc)
+        last = datetime.fromtimestamp(max(self.timestamps), tz=timezone.utc)
+        year, quarter = first.year, (first.month - 1) // 3
+        boundaries = []
+        labels = ['']
+
+        while (year, quarter) <= (last.year, (last.month - 1) // 3):
+            start = datetime(year, quarter * 3 + 1, 1, tzinfo=timezone.utc)
+            boundaries.append(int(start.timestamp()))
+            labels.append(f'{year}-Q{quarter + 1}')
+            year, quarter = (year + 1, 0) if quarter == 3 else (year, quarter + 1)
+
+        # The position of a timestamp among the quarter starts is its quarter id
+        quarters = array('i', map(partial(bisect_right, boundaries), self.timestamps))
+
+        return quarters, labels
+
+
+def read_columns(
+    cz,
+    repositories: Sequence[Tuple[str, Optional[str], Optional[str]]],
+) -> CommitColumns:
+    """Read the `(name, path, rev_range)` repositories (`multi_repo.Repository`)
+    into columns. With many repositories, releases are labeled `<name>@<tag>`.
+
+    Raise `GitLogError` if a history can't be read.
+    """
+    from .git_log import GitLogError
+    from .git_log import iter_git_log_chunks
+
+    columns = CommitColumns(
+        [commit_type['value'] for commit_type in cz.commit_types], build_tag_pattern(cz)
+    )
+
+    for name, path, rev_range in repositories:
+        if path is not None and not Path(path).is_dir():
+            raise GitLogError(f"{path}: not a directory")  # fmt: skip
+
+        columns.add_history(
+            name,
+            iter_git_log_chunks(
+                rev_range, LOG_FORMAT, cwd=path, extra_args=('--topo-order',)
+            ),
+            release_prefix=f'{name}@' if len(repositories) > 1 else '',
+        )
+
+    return columns
+
+
+def _rate(part: int, total: int) -> float:
+    return round(part / total, 4) if total else 0.0
+
+
+def aggregate(columns: CommitColumns) -> dict:
+    """The analytics of the columns, as a JSON-ready dict."""
+    quarters, quarter_labels = columns.get_quarters()
+    type_labels = [NO_TYPE, *columns.type_codes.labels[1:]]
+    breaking_type = columns.type_codes.get('BREAKING CHANGE') or -1
+
+    # One count per distinct (quarter, type, `!`), the loops below only see them
+    types_per_quarter: Dict[str, Dict[str, int]] = {}
+    commits_per_quarter: Counter = Counter()
+    breaking_per_quarter: Counter = Counter()
+
+    for (quarter, type_code, breaking), commits in sorted(
+        Counter(zip(quarters, columns.types, columns.breaking)).items()
+    ):
+        quarter_types = types_per_quarter.setdefault(quarter_labels[quarter], {})
+        label = type_labels[type_code]
+        quarter_types[label] = quarter_types.get(label, 0) + commits
+        commits_per_quarter[quarter] += commits
+
+        if breaking or type_code == breaking_type:
+            breaking_per_quarter[quarter] += commits
+
+    breaking_count = sum(breaking_per_quarter.values())
+
+    # A release is a run of the column: its issues are those of a slice
+    issues_per_release = {}
+
+    for release, (start, end) in enumerate(columns.release_runs):
+        issues = set(columns.issues[start:end])
+        issues.discard(0)
+        issues_per_release[columns.release_labels[release]] = {
+            'commits': end - start,
+            'issues': len(issues),
+        }
+
+    commits_per_epic = Counter(columns.epics)
+    commits_per_epic.pop(0, None)
+
+    return {
+        'commits': len(columns),
+        'repositories': columns.repositories,
+        'types_per_quarter': {
+            quarter: dict(sorted(types.items(), key=lambda item: -item[1]))
+            for quarter, types in types_per_quarter.items()
+        },
+        'issues_per_release': issues_per_release,
+        'breaking_changes': {
+            'commits': len(columns),
+            'breaking': breaking_count,
+            'rate': _rate(breaking_count, len(columns)),
+            'per_quarter': {
+                quarter_labels[quarter]: {
+                    'commits': commits,
+                    'breaking': breaking_per_quarter[quarter],
+                    'rate': _rate(breaking_per_quarter[quarter], commits),
+                }
+                for quarter, commits in sorted(commits_per_quarter.items())
+            },
+        },
+        'commits_per_epic': {
+            columns.epic_codes.labels[epic]: commits
+            for epic, commits in commits_per_epic.most_common()
+        },
+    }
+
+
+def _csv_row(metric: str, group: str, key: str, value) -> dict:
+    return {'metric': metric, 'group': group, 'key': key, 'value': value}
+
+
+def iter_csv_rows(report: dict) -> Iterable[dict]:
+    """The report as `metric, group, key, value` rows."""
+    for quarter, types in report['types_per_quarter'].items():
+        for change_type, commits in types.items():
+            yield _csv_row('types_per_quarter', quarter, change_type, commits)
+
+    for release, values in report['issues_per_release'].items():
+        for key, value in values.items():
+            yield _csv_row('issues_per_release', release, key, value)
+
+    breaking_changes = report['breaking_changes']
+
+    for key in ('commits', 'breaking', 'rate'):
+        yield _csv_row('breaking_changes', 'all', key, breaking_changes[key])
+
+    for quarter, values in breaking_changes['per_quarter'].items():
+        for key, value in values.items():
+            yield _csv_row('breaking_changes', quarter, key, value)
+
+    for epic, commits in report['commits_per_epic'].items():
+        yield _csv_row('commits_per_epic', epic, 'commits', commits)
+
+
+def write_report(report: dict, output: IO[str], output_format: str = 'json') -> None:
+    if output_format == 'json':
+        json.dump(report, output, indent=2)
+        output.write('\n')
+        return
+
+    writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    writer.writerows(iter_csv_rows(report))
@@ -0,0 +1,107 @@
+"""Version increment of a range of commits, for `cz bump`.
+
+Commitizen tests each commit message line against `bump_pattern`, then the
+keyword it captured against every key of `bump_map`, in order, and keeps the
+highest increment. `BumpClassifier` gives the same answer with one pattern scan
+per message, a single precompiled alternation for the keys, and stops reading
+commits as soon as the highest increment of the map is found.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from collections.abc import Mapping
+from functools import lru_cache
+
+from .defaults import MAJOR
+from .defaults import MINOR
+from .defaults import PATCH
+
+
+# Same order as Commitizen's `bump.VERSION_TYPES`
+INCREMENT_RANKS = {None: 0, PATCH: 1, MINOR: 2, MAJOR: 3}
+
+# Distinct keywords (type, scope and `!`) are few, but bound them anyway
+KEYWORD_CACHE_SIZE = 4_096
+
+
+class BumpClassifier:
+    """Classify commit messages with a `bump_pattern` and a `bump_map`."""
+
+    def __init__(self, bump_pattern: str, bump_map: Mapping[str, str]) -> None:
+        # Commitizen searches each line on its own; the default pattern can't
+        # match across lines, so a multiline scan of the message is the same.
+        self.select_pattern = re.compile(bump_pattern, re.MULTILINE)
+        self.increments = list(bump_map.values())
+
+        # Alternatives are tried left to right, like the keys of the map. Each key
+        # is a group, the outermost group of the key that matched closes last.
+        self._group_increments: dict[int, str] = {}
+        alternatives = []
+        group = 1
+
+        for key, increment in bump_map.items():
+            alternatives.append(f"({key})")  # fmt: skip
+            self._group_increments[group] = increment
+            group += 1 + re.compile(key).groups
+
+        self.keyword_pattern = re.compile('|'.join(alternatives))
+        self.highest = max(self.increments, key=INCREMENT_RANKS.__getitem__, default=None)
+        self.classify_keyword = lru_cache(maxsize=KEYWORD_CACHE_SIZE)(
+            self._classify_keyword
+        )
+
+    def _classify_keyword(self, keyword: str) -> str | None:
+        match = self.keyword_pattern.match(keyword)
+
+        if match is None:
+            return None
+
+        return self._group_increments[match.lastindex]
+
+    def classify(self, message: str) -> str | None:
+        """Increment of a single commit message."""
+        increment = None
+        rank = 0
+        highest = self.highest
+
+        for match in self.select_pattern.finditer(message):
+            new_increment = self.classify_keyword(match.group(1))
+
+            if INCREMENT_RANKS[new_increment] > rank:
+                increment = new_increment
+                rank = INCREMENT_RANKS[new_increment]
+
+                if increment == highest:
+                    break
+
+        return increment
+
+    def find_increment(self, messages: Iterable[str]) -> str | None:
+        """Highest increment of the messages, like Commitizen's `find_increment`.
+
+        Messages are consumed lazily and no more are read once the highest
+        increment of the map is found.
+        """
+        increment = None
+        rank = 0
+        highest = self.highest
+
+        for message in messages:
+            new_increment = self.classify(message)
+
+            if INCREMENT_RANKS[new_increment] > rank:
+                increment = new_increment
+                rank = INCREMENT_RANKS[new_increment]
+
+                if increment == highest:
+                    break
+
+        return increment
+
+
+@lru_cache(maxsize=8)
+def build_bump_classifier(bump_pattern: str, bump_map: tuple) -> BumpClassifier:
+    """Cached `BumpClassifier`, `bump_map` given as a tuple of `(key, increment)`."""
+    return BumpClassifier(bump_pattern, dict(bump_map))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import functools
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .parsers import compile_commit_parser
+from .parsers import split_issue_id
+from .pool import map_chunks
+
+
+# (rev, message, author, author_email), cheap to send to a worker process
+CommitRecord = Tuple[str, str, str, str]
+
+
+def render_entry(
+    parsed_message: dict,
+    rev: str,
+    jira_browse_url: str,
+    issue_summary: str | None = None,
+):
+    """Render a parsed commit as a changelog entry.
+
+    Returns `False` for `BREAKING CHANGE` footers, which are already reported by
+    the `!` of the commit title. The `issue_summary`, if given, is the title of
+    the issue link and the `issue_summary` of the entry.
+    """
+    if parsed_message.get('change_type') == 'BREAKING CHANGE':
+        return False
+
+    if parsed_message.get('breaking'):
+        parsed_message['change_type'] = 'BREAKING CHANGE'
+
+    title, issue_id = split_issue_id(parsed_message.get('message'))
+    commit_hash = rev[:7]
+
+    # fmt: off
+    if issue_id is None:
+        parsed_message['message'] = f"{title} ({commit_hash})"
+    elif issue_summary:
+        parsed_message['issue_summary'] = issue_summary
+        link_title = issue_summary.replace('\\', '\\\\').replace('"', '\\"')
+        parsed_message['message'] = (
+            f"{title} [{issue_id}]({jira_browse_url}{issue_id} \"{link_title}\") ({commit_hash})"
+        )
+    else:
+        parsed_message['message'] = (
+            f"{title} [{issue_id}]({jira_browse_url}{issue_id}) ({commit_hash})"
+        )
+    # fmt: on
+
+    return parsed_message
+
+
+def render_records(
+    commit_parser: str,
+    jira_browse_url: str,
+    records: List[CommitRecord],
+    issue_summaries: Optional[Dict[str, str]] = None,
+) -> List[Optional[dict]]:
+    """Render the changelog entry of each record.
+
+    The entry is `None` when the commit title doesn't follow the convention.
+    It's a module level function so it can run in a worker process.
+    """
+    match = compile_commit_parser(commit_parser).match
+    entries = []
+
+    for rev, message, author, author_email in records:
+        parsed = match(message)
+
+        if parsed is None:
+            entries.append(None)
+            continue
+
+        parsed_message = {
+            'sha1': rev,
+            'author': author,
+            'author_email': author_email,
+            **parsed.groupdict(),
+        }
+        issue_summary = None
+
+        if issue_summaries:
+            issue_summary = issue_summaries.get(split_issue_id(parsed['message'])[1])
+
+        entries.append(render_entry(parsed_message, rev, jira_browse_url, issue_summary))
+
+    return entries
+
+
+def render_records_in_pool(
+    commit_parser: str,
+    jira_browse_url: str,
+    records: Iterable[CommitRecord],
+    issue_summaries: Optional[Dict[str, str]] = None,
+    workers: int | None = None,
+    executor: str = 'process',
+    chunk_size: int = 2_000,
+    serial_threshold: int = 20_000,
+) -> List[Optional[dict]]:
+    """Render records across a pool of workers, keeping their original order."""
+    chunks = map_chunks(
+        functools.partial(render_records, issue_summaries=issue_summaries),
+        records,
+        commit_parser,
+        jira_browse_url,
+        workers=workers,
+        executor=executor,
+        chunk_size=chunk_size,
+        serial_threshold=serial_threshold,
+    )
+
+    return [entry for entries in chunks for entry in entries]
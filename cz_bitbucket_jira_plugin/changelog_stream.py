@@ -0,0 +1,276 @@
+"""Changelog of very long histories, written as it's read, in bounded memory.
+
+`cz changelog` builds one dict per commit, adds the rendered Markdown to it,
+then renders the whole tree at once. Here each commit title is parsed into a
+small `ChangelogRecord` (its change type, scope and issue key are interned, so
+all the records share a handful of strings), rendered right away and appended
+to the spool of its section. The spools of a release are copied to the output
+when the next release starts. A spool keeps up to `spool_size` characters in
+memory, then moves to a temporary file: memory doesn't grow with the history,
+nor with the size of a release.
+
+The output is the same as the Markdown changelog of `cz changelog` for the
+commit titles: releases by version tag, sections ordered by `change_type_order`
+(the others after them, sorted), entries in `git log` order.
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+import sys
+import tempfile
+from datetime import date
+from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .parsers import compile_commit_parser
+from .parsers import split_issue_id
+
+
+SPOOL_SIZE = 1_000_000
+
+
+class ChangelogRecord:
+    """A commit title parsed for the changelog."""
+
+    __slots__ = ('rev', 'section', 'scope', 'title', 'issue')
+
+    def __init__(
+        self,
+        rev: str,
+        section: str,
+        scope: Optional[str],
+        title: str,
+        issue: Optional[str],
+    ) -> None:
+        self.rev = rev
+        self.section = section
+        self.scope = scope
+        self.title = title
+        self.issue = issue
+
+    def render(self, jira_browse_url: str) -> str:
+        """The Markdown line of the entry, like `changelog_message_builder_hook()`
+        and the Markdown template of Commitizen write it."""
+        scope = f"**{self.scope}**: " if self.scope else ''  # fmt: skip
+
+        if self.issue is None:
+            return f"- {scope}{self.title} ({self.rev[:7]})\n"  # fmt: skip
+
+        return f"- {scope}{self.title} [{self.issue}]({jira_browse_url}{self.issue}) ({self.rev[:7]})\n"  # fmt: skip
+
+
+def iter_changelog_records(
+    commits: Iterable[Tuple[str, str]],
+    commit_parser: str,
+    change_type_map: Mapping[str, str],
+    changelog_pattern: Optional[str] = None,
+) -> Iterator[Tuple[str, Optional[ChangelogRecord]]]:
+    """Yield `(rev, record)` for each `(rev, title)` commit, the record being
+    `None` when the title doesn't follow the convention.
+
+    Like Commitizen, titles must also match `changelog_pattern`, if given.
+    """
+    match = compile_commit_parser(commit_parser).match
+    select = re.compile(changelog_pattern).match if changelog_pattern else None
+    intern = sys.intern
+
+    for rev, title in commits:
+        if select is not None and select(title) is None:
+            yield rev, None
+            continue
+
+        parsed = match(title)
+
+        if parsed is None or parsed.group('change_type') == 'BREAKING CHANGE':
+            yield rev, None
+            continue
+
+        # `other!: ...` titles have no change type, their entries have no heading
+        change_type = 'BREAKING CHANGE' if parsed.group('breaking') else parsed.group('change_type') or ''  # fmt: skip
+        message, issue = split_issue_id(parsed.group('message'))
+        scope = parsed.group('scope')
+
+        yield (
+            rev,
+            ChangelogRecord(
+                rev,
+                intern(change_type_map.get(change_type, change_type)),
+                intern(scope) if scope else None,
+                message,
+                intern(issue) if issue is not None else None,
+            ),
+        )
+
+
+class ReleaseWriter:
+    """Write the releases of a changelog, one at a time."""
+
+    def __init__(
+        self,
+        output: IO[str],
+        jira_browse_url: str,
+        change_type_order: Sequence[str] = (),
+        spool_size: int = SPOOL_SIZE,
+    ) -> None:
+        self.output = output
+        self.jira_browse_url = jira_browse_url
+        self.order = {section: position for position, section in enumerate(change_type_order)}  # fmt: skip
+        self.spool_size = spool_size
+        self.releases = 0
+        self.entries = 0
+        self._heading: Optional[str] = None
+        self._spools: Dict[str, IO[str]] = {}
+
+    def start(self, version: str, release_date: str = '') -> None:
+        """End the current release, if any, and start a new one."""
+        self.flush()
+        self._heading = f"## {version} ({release_date})\n" if release_date else f"## {version}\n"  # fmt: skip
+
+    def add(self, record: ChangelogRecord) -> None:
+        spool = self._spools.get(record.section)
+
+        if spool is None:
+            spool = self._spools[record.section] = tempfile.SpooledTemporaryFile(
+                max_size=self.spool_size, mode='w+', encoding='utf-8', newline=''
+            )
+
+        spool.write(record.render(self.jira_browse_url))
+        self.entries += 1
+
+    def flush(self) -> None:
+        if self._heading is None:
+            return
+
+        write = self.output.write
+
+        if self.releases:
+            write('\n')
+
+        write(self._heading)
+        sections = sorted(
+            self._spools,
+            key=lambda name: (name not in self.order, self.order.get(name, 0), name),
+        )
+
+        for section in sections:
+            spool = self._spools[section]
+            write(f"\n### {section}\n\n" if section else '\n\n')  # fmt: skip
+            spool.seek(0)
+            shutil.copyfileobj(spool, self.output)
+            spool.close()
+
+        self.releases += 1
+        self._heading = None
+        self._spools = {}
+
+
+def stream_changelog(
+    commits: Iterable[Tuple[str, str]],
+    output: IO[str],
+    commit_parser: str,
+    jira_browse_url: str,
+    change_type_map: Mapping[str, str],
+    change_type_order: Sequence[str] = (),
+    releases: Optional[Mapping[str, Tuple[str, str]]] = None,
+    unreleased_version: Optional[str] = None,
+    changelog_pattern: Optional[str] = None,
+    spool_size: int = SPOOL_SIZE,
+) -> ReleaseWriter:
+    """Write the changelog of the `(rev, title)` commits, newest first.
+
+    `releases` maps the rev of each release commit to its `(version, date)`:
+    a release starts at its commit, the commits before the first one go to
+    `unreleased_version` (default: `Unreleased`).
+    """
+    releases = releases or {}
+    writer = ReleaseWriter(output, jira_browse_url, change_type_order, spool_size)
+    started = False
+
+    records = iter_changelog_records(
+        commits, commit_parser, change_type_map, changelog_pattern
+    )
+
+    for rev, record in records:
+        release = releases.get(rev)
+
+        if release is not None:
+            writer.start(*release)
+            started = True
+        elif not started:
+            if unreleased_version:
+                writer.start(unreleased_version, date.today().isoformat())
+            else:
+                writer.start('Unreleased')
+
+            started = True
+
+        if record is not None:
+            writer.add(record)
+
+    writer.flush()
+
+    return writer
+
+
+def get_releases(cz) -> Dict[str, Tuple[str, str]]:
+    """`(version, date)` of each release commit, from the version tags, like
+    `cz changelog` picks them (`tag_format`, `changelog_merge_prerelease`)."""
+    from commitizen import changelog
+    from commitizen import git
+    from commitizen.version_schemes import get_version_scheme
+
+    settings = cz.config.settings
+    scheme = get_version_scheme(cz.config)
+    merge_prerelease = settings.get('changelog_merge_prerelease') or False
+    tags = changelog.get_version_tags(scheme, git.get_tags(), settings['tag_format'])
+    releases: Dict[str, Tuple[str, str]] = {}
+    seen = set()
+
+    for tag in tags:
+        # Like `changelog.get_commit_tag()`, only the first tag of a commit counts
+        if tag.rev in seen:
+            continue
+
+        seen.add(tag.rev)
+
+        if changelog.tag_included_in_changelog(tag, [], merge_prerelease, scheme):
+            releases[tag.rev] = (tag.name, tag.date)
+
+    return releases
+
+
+def write_changelog(
+    cz,
+    output: IO[str],
+    rev_range: str | None = None,
+    unreleased_version: Optional[str] = None,
+    spool_size: int = SPOOL_SIZE,
+) -> ReleaseWriter:
+    """Write the changelog of `rev_range` with the settings of the plugin.
+
+    Raise `GitLogError` if the history can't be read.
+    """
+    from .git_log import iter_git_log
+
+    settings = cz.config.settings
+
+    return stream_changelog(
+        iter_git_log(rev_range, fields=('rev', 'title'), extra_args=('--topo-order',)),
+        output,
+        cz.commit_parser,
+        cz.jira_browse_url,
+        settings.get('change_type_map') or cz.change_type_map,
+        settings.get('change_type_order') or cz.change_type_order,
+        releases=get_releases(cz),
+        unreleased_version=unreleased_version,
+        changelog_pattern=cz.changelog_pattern,
+        spool_size=spool_size,
+    )
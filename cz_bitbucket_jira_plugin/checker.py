@@ -0,0 +1,82 @@
+"""Commit message checks, used by the `check` command of the plugin CLI.
+
+This module runs in the `commit-msg` git hook, on every commit. It must not
+import Commitizen or prompt_toolkit, keep its imports light.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+from .parsers import build_commit_parser
+from .parsers import compile_commit_parser
+from .parsers import PROJECT_KEY
+
+
+ISSUE_KEY = rf'(?:{PROJECT_KEY}-)?[0-9]+'
+ISSUE_KEY_LIST = rf'\[{ISSUE_KEY}(?:, {ISSUE_KEY})*\]'
+
+TITLE_ISSUE_PATTERN = re.compile(rf'\S \[{ISSUE_KEY}\]$')
+
+FOOTER_PATTERNS = {
+    'issue epic': re.compile(rf'\[{ISSUE_KEY}\]'),
+    'issue subtasks': re.compile(ISSUE_KEY_LIST),
+    'issue related tasks': re.compile(ISSUE_KEY_LIST),
+}
+
+# Messages written by git itself, or meant to be squashed later.
+ALLOWED_PREFIXES = ('Merge', 'Revert', 'Pull request', 'fixup!', 'squash!')
+
+
+def clean_commit_message(message: str) -> str:
+    """Remove the comment lines git adds to the message file."""
+    return '\n'.join(
+        line for line in message.splitlines() if not line.startswith('#')
+    ).strip()
+
+
+def check_commit_message(message: str, commit_types: Iterable[str]) -> list[str]:
+    """Check a commit message against the schema written by `message()`.
+
+    Returns the list of errors found, empty if the message is valid.
+    """
+    message = clean_commit_message(message)
+
+    if not message:
+        return ['Commit message is empty.']
+
+    title, *body = message.splitlines()
+
+    if title.startswith(ALLOWED_PREFIXES):
+        return []
+
+    commit_types = tuple(commit_types)
+    commit_parser = compile_commit_parser(build_commit_parser(commit_types))
+    parsed = commit_parser.match(title)
+    errors = []
+
+    if not parsed or parsed.group('change_type') in (None, 'BREAKING CHANGE'):
+        # fmt: off
+        errors.append(
+            "Commit title must be like '<commit_type>(<scope>)!: <commit_title> "
+            "[<jira_project_key>-<jira_issue_number>]', where <commit_type> is one "
+            f"of: {', '.join(commit_types)}."
+        )
+        # fmt: on
+    elif not TITLE_ISSUE_PATTERN.search(parsed.group('message') or ''):
+        # fmt: off
+        errors.append(
+            "Commit title must end with the Jira issue, like "
+            "'[<jira_project_key>-<jira_issue_number>]'."
+        )
+        # fmt: on
+
+    for line in body:
+        name, separator, value = line.partition(': ')
+        pattern = FOOTER_PATTERNS.get(name)
+
+        if separator and pattern and not pattern.fullmatch(value):
+            errors.append(f"Invalid '{name}' line: {line!r}.")  # fmt: skip
+
+    return errors
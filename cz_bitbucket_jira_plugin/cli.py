@@ -0,0 +1,695 @@
+"""Command line tools of the plugin, available as `cz-bitbucket-jira` or
+`python -m cz_bitbucket_jira_plugin`.
+
+Each command imports what it needs only when it runs, so commands used in git
+hooks start fast.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import sys
+
+
+def get_settings() -> dict:
+    """Return the `[tool.commitizen]` settings, or an empty dict if there's none."""
+    from .functions import get_commitizen_settings
+
+    try:
+        return get_commitizen_settings()
+    except (FileNotFoundError, AttributeError, KeyError):
+        return {}
+
+
+def get_commit_types(settings: dict) -> list[str]:
+    from .defaults import DEFAULT_COMMIT_TYPES
+
+    commit_types = settings.get('commit_types') or DEFAULT_COMMIT_TYPES
+
+    return [commit_type.get('value') for commit_type in commit_types]
+
+
+def get_plugin():
+    """Build the plugin from the Commitizen config of the current directory."""
+    from commitizen.config import read_cfg
+
+    from .main import CzBitbucketJiraPlugin
+
+    return CzBitbucketJiraPlugin(config=read_cfg())
+
+
+def open_output(path: str):
+    if path == '-':
+        return contextlib.nullcontext(sys.stdout)
+
+    return open(path, mode='w', encoding='utf-8', newline='')
+
+
+@contextlib.contextmanager
+def replace_output(path: str):
+    """Like `open_output()`, but the file is written next to `path` and only
+    replaces it once complete, so a failure leaves the previous file as is."""
+    if path == '-':
+        yield sys.stdout
+        return
+
+    directory, name = os.path.split(os.path.abspath(path))
+    temp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")  # fmt: skip
+
+    try:
+        with open(temp_path, mode='w', encoding='utf-8', newline='') as file:
+            yield file
+
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def open_input(path: str):
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin)
+
+    return open(path, encoding='utf-8', newline='')
+
+
+def check(args: argparse.Namespace) -> int:
+    from .checker import check_commit_message
+
+    if args.message is not None:
+        message = args.message
+    elif args.message_file == '-':
+        message = sys.stdin.read()
+    else:
+        with open(args.message_file, encoding='utf-8') as file:
+            message = file.read()
+
+    errors = check_commit_message(message, get_commit_types(get_settings()))
+
+    if errors:
+        print('commit validation: failed!', file=sys.stderr)
+
+        for error in errors:
+            print(f"  - {error}", file=sys.stderr)  # fmt: skip
+
+        return 1
+
+    return 0
+
+
+def render(args: argparse.Namespace) -> int:
+    import json
+
+    from .messages import read_answer_records
+    from .messages import render_messages
+
+    input_format = args.format or ('csv' if args.input.endswith('.csv') else 'jsonl')
+    cz = get_plugin()
+    failed_records = 0
+
+    with open_input(args.input) as input_file, open_output(args.output) as output:
+        records = read_answer_records(input_file, input_format=input_format)
+
+        for rendered in render_messages(cz, records):
+            if rendered.errors:
+                failed_records += 1
+                result = {'record': rendered.record, 'errors': rendered.errors}
+            else:
+                result = {'record': rendered.record, 'message': rendered.message}
+
+            output.write(json.dumps(result) + '\n')
+
+    if failed_records:
+        print(f"{failed_records} record(s) failed validation.", file=sys.stderr)  # fmt: skip
+        return 1
+
+    return 0
+
+
+def lint(args: argparse.Namespace) -> int:
+    from .git_log import GitLogError
+    from .linter import lint_range
+    from .linter import report_to_json
+    from .linter import report_to_junit
+
+    try:
+        report = lint_range(
+            args.rev_range,
+            get_commit_types(get_settings()),
+            fail_fast=args.fail_fast,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+    except GitLogError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    to_text = report_to_junit if args.format == 'junit' else report_to_json
+
+    with open_output(args.output) as output:
+        output.write(to_text(report) + '\n')
+
+    return 1 if report.failures else 0
+
+
+def increment(args: argparse.Namespace) -> int:
+    from .bump import BumpClassifier
+    from .defaults import BUMP_MAP
+    from .defaults import BUMP_PATTERN
+    from .git_log import get_latest_tag
+    from .git_log import GitLogError
+    from .git_log import iter_git_log
+
+    rev_range = args.rev_range
+
+    if rev_range is None:
+        latest_tag = get_latest_tag()
+        rev_range = f"{latest_tag}..HEAD" if latest_tag else None  # fmt: skip
+
+    classifier = BumpClassifier(BUMP_PATTERN, BUMP_MAP)
+    commits = iter_git_log(rev_range, fields=('message',))
+
+    try:
+        result = classifier.find_increment(message for (message,) in commits)
+    except GitLogError as error:
+        print(error, file=sys.stderr)
+        return 2
+    finally:
+        # Stops `git log` if the highest increment was found early
+        commits.close()
+
+    print(result or 'NONE')
+
+    return 0
+
+
+def index(args: argparse.Namespace) -> int:
+    from .issue_index import IssueIndex
+    from .issue_index import read_jira_export
+
+    output = args.output or get_settings().get('jira_issue_index')
+
+    if not output:
+        print(
+            'Missing --output, or `jira_issue_index` on the config file.', file=sys.stderr
+        )
+        return 2
+
+    input_format = args.format or ('jsonl' if args.input.endswith('.jsonl') else 'csv')
+
+    with open_input(args.input) as input_file:
+        count = IssueIndex.build(output, read_jira_export(input_file, input_format))
+
+    print(f"{count} issue(s) written to {output}.", file=sys.stderr)  # fmt: skip
+
+    return 0
+
+
+def release_notes(args: argparse.Namespace) -> int:
+    from .git_log import get_latest_tag
+    from .git_log import GitLogError
+    from .release_notes import write_release_notes
+
+    rev_range = args.rev_range
+
+    if rev_range is None:
+        latest_tag = get_latest_tag()
+        rev_range = f"{latest_tag}..HEAD" if latest_tag else None  # fmt: skip
+
+    cz = get_plugin()
+
+    try:
+        with open_output(args.output) as output:
+            notes = write_release_notes(cz, output, rev_range, title=args.title)
+    except GitLogError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    print(
+        f'{notes.entries} entries of {notes.commits} commit(s), {len(notes.epics)} epic(s).',  # fmt: skip
+        file=sys.stderr,
+    )
+
+    return 0
+
+
+def smart_commits(args: argparse.Namespace) -> int:
+    from .git_log import GitLogError
+    from .smart_commits import aggregate
+    from .smart_commits import iter_range_commands
+    from .smart_commits import SmartCommitCache
+    from .smart_commits import write_report
+
+    cache = None if args.no_cache else SmartCommitCache.for_repository()
+
+    try:
+        activities = aggregate(iter_range_commands(args.rev_range, cache=cache))
+    except GitLogError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    with open_output(args.output) as output:
+        write_report(activities, output, args.format)
+
+    return 0
+
+
+def commits(args: argparse.Namespace) -> int:
+    import json
+
+    from .commit_index import CommitIssueIndex
+    from .git_log import GitLogError
+
+    commit_index = (
+        CommitIssueIndex(args.index) if args.index else CommitIssueIndex.for_repository()
+    )
+
+    if not args.no_update:
+        try:
+            count = commit_index.update()
+        except GitLogError as error:
+            print(error, file=sys.stderr)
+            return 2
+
+        if count:
+            print(f"{count} new commit(s) indexed.", file=sys.stderr)  # fmt: skip
+
+    results = {key: commit_index.find(key, roles=args.role) for key in args.keys}
+    commit_index.close()
+
+    if args.format == 'json':
+        print(
+            json.dumps(
+                {key: [ref._asdict() for ref in refs] for key, refs in results.items()}
+            )
+        )
+    else:
+        for key, refs in results.items():
+            for ref in refs:
+                print(f"{key}\t{ref.rev}\t{ref.role}\t{ref.title}")  # fmt: skip
+
+    return 0
+
+
+def components_changelog(args: argparse.Namespace) -> int:
+    from .git_log import GitLogError
+    from .monorepo import write_component_changelogs
+
+    cz = get_plugin()
+
+    if not cz.components:
+        print('Missing `components` on the config file.', file=sys.stderr)
+        return 2
+
+    try:
+        paths = write_component_changelogs(cz, args.rev_range)
+    except GitLogError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    for path in paths:
+        print(path)
+
+    return 0
+
+
+def changelog(args: argparse.Namespace) -> int:
+    from .changelog_stream import write_changelog
+    from .git_log import GitLogError
+
+    cz = get_plugin()
+    output_path = (
+        args.output or cz.config.settings.get('changelog_file') or 'CHANGELOG.md'
+    )
+
+    try:
+        with replace_output(output_path) as output:
+            writer = write_changelog(
+                cz, output, args.rev_range, unreleased_version=args.unreleased_version
+            )
+    except GitLogError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    print(
+        f'{writer.entries} entries in {writer.releases} release(s).',  # fmt: skip
+        file=sys.stderr,
+    )
+
+    return 0
+
+
+def changelog_repos(args: argparse.Namespace) -> int:
+    from pathlib import Path
+
+    from .git_log import GitLogError
+    from .multi_repo import load_repositories
+    from .multi_repo import Repository
+    from .multi_repo import write_aggregated_changelog
+
+    cz = get_plugin()
+
+    if args.repositories:
+        repositories = [
+            Repository(Path(path).resolve().name, Path(path), args.rev_range)
+            for path in args.repositories
+        ]
+    else:
+        base_path = cz.config.path.parent if cz.config.path else None
+
+        try:
+            repositories = load_repositories(cz.config.settings, base_path)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 2
+
+        if args.rev_range:
+            repositories = [
+                repository._replace(rev_range=args.rev_range)
+                for repository in repositories
+            ]
+
+    if not repositories:
+        print(
+            'Give the repositories, or `repositories` on the config file.',
+            file=sys.stderr,
+        )
+        return 2
+
+    try:
+        with open_output(args.output) as output:
+            entries = write_aggregated_changelog(
+                cz,
+                repositories,
+                output,
+                args.format,
+                workers=args.workers,
+                use_cache=not args.no_cache,
+            )
+    except GitLogError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    print(
+        f'{len(entries)} entries from {len(repositories)} repositories.',  # fmt: skip
+        file=sys.stderr,
+    )
+
+    return 0
+
+
+def analytics(args: argparse.Namespace) -> int:
+    from pathlib import Path
+
+    from .analytics import aggregate
+    from .analytics import read_columns
+    from .analytics import write_report
+    from .git_log import GitLogError
+    from .multi_repo import load_repositories
+    from .multi_repo import Repository
+
+    cz = get_plugin()
+
+    if args.repositories:
+        repositories = [
+            Repository(Path(path).resolve().name, Path(path), args.rev_range)
+            for path in args.repositories
+        ]
+    else:
+        base_path = cz.config.path.parent if cz.config.path else None
+
+        try:
+            repositories = load_repositories(cz.config.settings, base_path)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 2
+
+        repositories = [
+            repository._replace(rev_range=args.rev_range or repository.rev_range)
+            for repository in repositories
+        ] or [Repository(Path.cwd().name, None, args.rev_range)]
+
+    try:
+        columns = read_columns(cz, repositories)
+    except GitLogError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    with open_output(args.output) as output:
+        write_report(aggregate(columns), output, args.format)
+
+    print(
+        f'{len(columns)} commits from {len(repositories)} repositories.',  # fmt: skip
+        file=sys.stderr,
+    )
+
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='cz-bitbucket-jira',
+        description='Tools of the cz-bitbucket-jira-plugin Commitizen plugin.',
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = subparsers.add_parser(
+        'check',
+        help='check a commit message, fast enough for a commit-msg git hook',
+    )
+    check_parser.add_argument(
+        'message_file',
+        nargs='?',
+        default='-',
+        help="file with the commit message, '-' for stdin (default)",
+    )
+    check_parser.add_argument('-m', '--message', help='commit message to check')
+    check_parser.set_defaults(handler=check)
+
+    render_parser = subparsers.add_parser(
+        'render',
+        help='render commit messages from answer records, without prompting',
+    )
+    render_parser.add_argument(
+        'input',
+        nargs='?',
+        default='-',
+        help="JSONL or CSV file with one answers record per line, '-' for stdin",
+    )
+    render_parser.add_argument(
+        '-f',
+        '--format',
+        choices=['jsonl', 'csv'],
+        help='input format (default: from the file extension, else jsonl)',
+    )
+    render_parser.add_argument(
+        '-o',
+        '--output',
+        default='-',
+        help="JSONL file for the rendered messages and errors, '-' for stdout",
+    )
+    render_parser.set_defaults(handler=render)
+
+    lint_parser = subparsers.add_parser(
+        'lint', help='check every commit of a revision range, e.g.: main..HEAD'
+    )
+    lint_parser.add_argument(
+        'rev_range', nargs='?', help='revision range given to git log (default: HEAD)'
+    )
+    lint_parser.add_argument('--format', choices=['json', 'junit'], default='json')
+    lint_parser.add_argument(
+        '-o', '--output', default='-', help="report file, '-' for stdout"
+    )
+    lint_parser.add_argument(
+        '--fail-fast', action='store_true', help='stop at the first invalid commit'
+    )
+    lint_parser.add_argument(
+        '--workers', type=int, help='worker processes (default: number of CPUs)'
+    )
+    lint_parser.add_argument('--chunk-size', type=int, default=2_000)
+    lint_parser.set_defaults(handler=lint)
+
+    increment_parser = subparsers.add_parser(
+        'increment',
+        help='print the version increment (MAJOR, MINOR, PATCH or NONE) of a range',
+    )
+    increment_parser.add_argument(
+        'rev_range',
+        nargs='?',
+        help='revision range given to git log (default: from the latest tag to HEAD)',
+    )
+    increment_parser.set_defaults(handler=increment)
+
+    index_parser = subparsers.add_parser(
+        'index', help='build the offline Jira issue index from a Jira export'
+    )
+    index_parser.add_argument(
+        'input',
+        nargs='?',
+        default='-',
+        help="Jira CSV export or JSONL file of issues, '-' for stdin",
+    )
+    index_parser.add_argument(
+        '-f',
+        '--format',
+        choices=['csv', 'jsonl'],
+        help='input format (default: from the file extension, else csv)',
+    )
+    index_parser.add_argument(
+        '-o',
+        '--output',
+        help='index file to write (default: `jira_issue_index` of the config file)',
+    )
+    index_parser.set_defaults(handler=index)
+
+    release_notes_parser = subparsers.add_parser(
+        'release-notes', help='write Markdown release notes grouped by Jira epic'
+    )
+    release_notes_parser.add_argument(
+        'rev_range',
+        nargs='?',
+        help='revision range given to git log (default: from the latest tag to HEAD)',
+    )
+    release_notes_parser.add_argument('--title', help='title of the release notes')
+    release_notes_parser.add_argument(
+        '-o', '--output', default='-', help="Markdown file, '-' for stdout"
+    )
+    release_notes_parser.set_defaults(handler=release_notes)
+
+    smart_commits_parser = subparsers.add_parser(
+        'smart-commits',
+        help='total the Smart Commit time, transitions and comments of each issue',
+    )
+    smart_commits_parser.add_argument(
+        'rev_range', nargs='?', help='revision range given to git log (default: HEAD)'
+    )
+    smart_commits_parser.add_argument('--format', choices=['json', 'csv'], default='json')
+    smart_commits_parser.add_argument(
+        '-o', '--output', default='-', help="report file, '-' for stdout"
+    )
+    smart_commits_parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='parse every commit, without the cache of the already parsed ones',
+    )
+    smart_commits_parser.set_defaults(handler=smart_commits)
+
+    commits_parser = subparsers.add_parser(
+        'commits',
+        help='list the commits of Jira issues, from an index updated incrementally',
+    )
+    commits_parser.add_argument(
+        'keys',
+        nargs='*',
+        help='issue keys, e.g.: DEV-1234 (none to only update the index)',
+    )
+    commits_parser.add_argument(
+        '--role',
+        action='append',
+        choices=['issue', 'epic', 'subtask', 'related'],
+        help='only the commits where the issue has this role (repeatable)',
+    )
+    commits_parser.add_argument('--format', choices=['text', 'json'], default='text')
+    commits_parser.add_argument(
+        '--index', help='index file (default: one per repository, on the cache dir)'
+    )
+    commits_parser.add_argument(
+        '--no-update',
+        action='store_true',
+        help='query the index as is, without indexing the new commits',
+    )
+    commits_parser.set_defaults(handler=commits)
+
+    components_changelog_parser = subparsers.add_parser(
+        'components-changelog',
+        help='write the changelog of every component, from one read of the history',
+    )
+    components_changelog_parser.add_argument(
+        'rev_range', nargs='?', help='revision range given to git log (default: HEAD)'
+    )
+    components_changelog_parser.set_defaults(handler=components_changelog)
+
+    changelog_parser = subparsers.add_parser(
+        'changelog',
+        help='stream the Markdown changelog of a long history, in bounded memory',
+    )
+    changelog_parser.add_argument(
+        'rev_range', nargs='?', help='revision range given to git log (default: HEAD)'
+    )
+    changelog_parser.add_argument(
+        '-o',
+        '--output',
+        help="changelog file, '-' for stdout (default: `changelog_file` or CHANGELOG.md)",
+    )
+    changelog_parser.add_argument(
+        '--unreleased-version', help='version of the commits after the latest tag'
+    )
+    changelog_parser.set_defaults(handler=changelog)
+
+    changelog_repos_parser = subparsers.add_parser(
+        'changelog-repos',
+        help='write one changelog merged from many repositories, read concurrently',
+    )
+    changelog_repos_parser.add_argument(
+        'repositories',
+        nargs='*',
+        help='paths of the repositories (default: `repositories` of the config file)',
+    )
+    changelog_repos_parser.add_argument(
+        '--rev-range',
+        help='revision range given to git log in every repository (default: HEAD)',
+    )
+    changelog_repos_parser.add_argument(
+        '--format', choices=['markdown', 'json'], default='markdown'
+    )
+    changelog_repos_parser.add_argument(
+        '-o', '--output', default='-', help="changelog file, '-' for stdout"
+    )
+    changelog_repos_parser.add_argument(
+        '--workers',
+        type=int,
+        help='repositories read at once (default: twice the number of CPUs)',
+    )
+    changelog_repos_parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='read every repository, without the cache of the unchanged ones',
+    )
+    changelog_repos_parser.set_defaults(handler=changelog_repos)
+
+    analytics_parser = subparsers.add_parser(
+        'analytics',
+        help='change types per quarter, issues per release, breaking changes and epics',
+    )
+    analytics_parser.add_argument(
+        'repositories',
+        nargs='*',
+        help='paths of the repositories (default: `repositories` of the config file, '
+        'else the current one)',
+    )
+    analytics_parser.add_argument(
+        '--rev-range',
+        help='revision range given to git log in every repository (default: HEAD)',
+    )
+    analytics_parser.add_argument('--format', choices=['json', 'csv'], default='json')
+    analytics_parser.add_argument(
+        '-o', '--output', default='-', help="report file, '-' for stdout"
+    )
+    analytics_parser.set_defaults(handler=analytics)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    handler = args.handler
+
+    # Same as `profiling.PROFILE_ENV_VAR`, not imported to keep `check` fast
+    if os.environ.get('CZ_BITBUCKET_JIRA_PROFILE'):
+        from .profiling import get_profiler
+
+        handler = get_profiler().wrap(f"cli.{args.command}", handler)  # fmt: skip
+
+    return handler(args)
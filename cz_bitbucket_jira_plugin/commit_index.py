@@ -0,0 +1,256 @@
+"""Index of the commits of a repository by the Jira issues they mention.
+
+`message()` writes the issue in the title (`[DEV-1]`) and the related issues
+in the `issue epic:`, `issue subtasks:` and `issue related tasks:` lines. The
+index maps each of those issue keys to the commits, with the role the issue
+has in each one, so finding the commits of an issue is a lookup instead of a
+`git log --grep` over the whole history.
+
+The index is a SQLite file of the history of each indexed branch. It keeps the
+commit each branch was last indexed at, so an update is a single `git log` of
+the commits none of them has: going back to a branch indexes nothing, a new
+branch only its own commits. The commits a branch drops (e.g.: after a rebase),
+and the ones of a deleted branch, are removed when no other branch has them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import subprocess
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from .functions import get_cache_dir
+from .git_log import iter_git_log
+from .parsers import ISSUE_FOOTER_PATTERN
+from .parsers import ISSUE_KEY_PATTERN
+from .parsers import split_issue_id
+
+
+ROLES = ('issue', 'epic', 'subtask', 'related')
+
+FOOTER_ROLES = {
+    'issue epic': 'epic',
+    'issue subtasks': 'subtask',
+    'issue related tasks': 'related',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    position INTEGER PRIMARY KEY,
+    rev TEXT NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS commits_by_rev ON commits (rev);
+CREATE TABLE IF NOT EXISTS issue_commits (
+    issue TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    role INTEGER NOT NULL,
+    PRIMARY KEY (issue, position, role)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS state (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class CommitRef(NamedTuple):
+    rev: str
+    role: str
+    title: str
+
+
+def extract_issue_keys(message: str) -> List[tuple[str, str]]:
+    """`(issue key, role)` of each issue of a commit message, keys upper-cased.
+
+    Only full keys (`DEV-1`) are taken, bare issue numbers are ignored.
+    """
+    title, _, body = message.partition('\n')
+    keys = []
+    issue = split_issue_id(title)[1]
+
+    if issue and ISSUE_KEY_PATTERN.fullmatch(issue):
+        keys.append((issue.upper(), 'issue'))
+
+    for name, value in ISSUE_FOOTER_PATTERN.findall(body):
+        role = FOOTER_ROLES[name]
+
+        for key in value.split(','):
+            key = key.strip()
+
+            if ISSUE_KEY_PATTERN.fullmatch(key):
+                keys.append((key.upper(), role))
+
+    return keys
+
+
+def _git(args: list[str], cwd: str | Path | None) -> Optional[str]:
+    result = subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True)
+
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+class CommitIssueIndex:
+    """Issue key to commits index of the repository at `repository`."""
+
+    def __init__(self, path: str | Path, repository: str | Path | None = None) -> None:
+        self.path = Path(path)
+        self.repository = repository
+        self._connection: sqlite3.Connection | None = None
+
+    @classmethod
+    def for_repository(cls, repository: str | Path | None = None):
+        repository = Path(repository or Path.cwd()).resolve()
+        digest = hashlib.sha1(str(repository).encode()).hexdigest()
+
+        return cls(get_cache_dir() / 'commits' / f"{digest}.sqlite", repository)  # fmt: skip
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path)
+            # Only a cache of the history: it can always be rebuilt
+            self._connection.execute('PRAGMA journal_mode = WAL')
+            self._connection.execute('PRAGMA synchronous = OFF')
+            self._connection.executescript(SCHEMA)
+
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def indexed_heads(self) -> Dict[str, str]:
+        """Last indexed commit of each branch (`HEAD` when detached)."""
+        rows = self.connection.execute(
+            "SELECT substr(name, 6), value FROM state WHERE name LIKE 'head %'"
+        ).fetchall()
+
+        return dict(rows)
+
+    def update(self) -> int:
+        """Index the commits of `HEAD` that aren't indexed yet and return how many.
+
+        Raise `GitLogError` if the history can't be read.
+        """
+        head = _git(['rev-parse', '--verify', '-q', 'HEAD'], self.repository)
+
+        if head is None:
+            return 0
+
+        ref = _git(['symbolic-ref', '-q', 'HEAD'], self.repository) or 'HEAD'
+        heads = self.indexed_heads
+
+        if heads.get(ref) == head:
+            return 0
+
+        refs = _git(['for-each-ref', '--format=%(refname)'], self.repository)
+        refs = set(refs.splitlines()) if refs else set()
+        # The other branches that still exist are kept, the deleted ones dropped
+        kept = [rev for name, rev in heads.items() if name != ref and name in refs]
+        dropped = {
+            name: rev for name, rev in heads.items() if name != ref and name not in refs
+        }
+
+        if ref in heads and (
+            _git(['merge-base', '--is-ancestor', heads[ref], head], self.repository)
+            is None
+        ):
+            dropped[ref] = heads[ref]
+
+        # Commits only the dropped heads have, `None` if an indexed head is gone
+        # from the repository (e.g.: garbage collected): the index is rebuilt.
+        removed = None
+
+        if heads:
+            excluded = [f'^{rev}' for rev in [head, *kept]]
+            removed = _git(['rev-list', *dropped.values(), *excluded], self.repository)
+
+        connection = self.connection
+
+        with connection:
+            if removed is None:
+                connection.execute('DELETE FROM commits')
+                connection.execute('DELETE FROM issue_commits')
+                connection.execute('DELETE FROM state')
+                heads = {}
+            else:
+                revs = [(rev,) for rev in removed.split()]
+                connection.executemany(
+                    'DELETE FROM issue_commits WHERE position IN '
+                    '(SELECT position FROM commits WHERE rev = ?)',
+                    revs,
+                )
+                connection.executemany('DELETE FROM commits WHERE rev = ?', revs)
+                connection.executemany(
+                    'DELETE FROM state WHERE name = ?',
+                    [(f'head {name}',) for name in dropped],
+                )
+
+            row = connection.execute('SELECT max(position) FROM commits').fetchone()
+            count = self._insert(
+                iter_git_log(
+                    head,
+                    fields=('rev', 'message'),
+                    cwd=self.repository,
+                    extra_args=('--reverse', *(f'^{rev}' for rev in heads.values())),
+                ),
+                start=(row[0] or 0) + 1,
+            )
+            connection.execute(
+                'INSERT OR REPLACE INTO state VALUES (?, ?)', (f'head {ref}', head)
+            )
+
+        return count
+
+    def _insert(self, commits: Iterable[tuple], start: int) -> int:
+        """Insert the `(rev, message)` commits, oldest first, from `start`."""
+        commit_rows = []
+        issue_rows = []
+        role_ids = {role: role_id for role_id, role in enumerate(ROLES)}
+        count = 0
+        insert_commits = 'INSERT INTO commits VALUES (?, ?, ?)'
+        insert_issues = 'INSERT OR IGNORE INTO issue_commits VALUES (?, ?, ?)'
+
+        for position, (rev, message) in enumerate(commits, start=start):
+            keys = extract_issue_keys(message)
+            count += 1
+
+            if not keys:
+                continue
+
+            commit_rows.append((position, rev, message.partition('\n')[0]))
+            issue_rows.extend((key, position, role_ids[role]) for key, role in keys)
+
+            if len(issue_rows) >= 50_000:
+                self.connection.executemany(insert_commits, commit_rows)
+                self.connection.executemany(insert_issues, issue_rows)
+                commit_rows.clear()
+                issue_rows.clear()
+
+        self.connection.executemany(insert_commits, commit_rows)
+        self.connection.executemany(insert_issues, issue_rows)
+
+        return count
+
+    def find(self, key: str, roles: Iterable[str] | None = None) -> List[CommitRef]:
+        """Commits of the issue `key`, newest first, with the role of the issue."""
+        rows = self.connection.execute(
+            'SELECT commits.rev, issue_commits.role, commits.title '
+            'FROM issue_commits JOIN commits USING (position) '
+            'WHERE issue_commits.issue = ? ORDER BY position DESC, role',
+            (key.strip().upper(),),
+        ).fetchall()
+        roles = set(roles) if roles else None
+        refs = (CommitRef(rev, ROLES[role], title) for rev, role, title in rows)
+
+        return [ref for ref in refs if roles is None or ref.role in roles]
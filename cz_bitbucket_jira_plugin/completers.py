@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from prompt_toolkit.completion import Completer
+from prompt_toolkit.completion import Completion
+
+
+class IssueNumberCompleter(Completer):
+    """Complete issue numbers from the Jira issue index, showing their summary.
+
+    With `multiple`, only the number after the last comma is completed.
+    """
+
+    def __init__(
+        self,
+        issue_index,
+        get_project_key: Callable[[], str],
+        multiple: bool = False,
+        limit: int = 10,
+    ) -> None:
+        self.issue_index = issue_index
+        self.get_project_key = get_project_key
+        self.multiple = multiple
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        project_key = self.get_project_key()
+
+        if not project_key:
+            return
+
+        prefix = document.text_before_cursor
+
+        if self.multiple:
+            prefix = prefix.rpartition(',')[2]
+
+        # Trailing spaces aren't stripped, a number is no longer being typed
+        prefix = prefix.lstrip()
+
+        for issue in self.issue_index.complete(project_key, prefix, limit=self.limit):
+            yield Completion(
+                str(issue.number),
+                start_position=-len(prefix),
+                display=issue.key,
+                display_meta=f'{issue.type}: {issue.summary}'
+                if issue.type
+                else issue.summary,  # fmt: skip
+            )
+
+
+class CommitTypeCompleter(Completer):
+    """Complete the commit type being typed from a `CommitTypeIndex`, showing
+    the names of the types."""
+
+    def __init__(self, type_index, limit: int = 10) -> None:
+        self.type_index = type_index
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        query = document.text_before_cursor
+
+        for commit_type in self.type_index.search(query, limit=self.limit):
+            yield Completion(
+                str(commit_type['value']),
+                start_position=-len(query),
+                display=str(commit_type.get('name') or commit_type['value']),
+            )
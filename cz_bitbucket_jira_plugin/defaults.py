@@ -1,10 +1,10 @@
 import re
 
-from commitizen import defaults
-
 
 JIRA_URL_EXAMPLE = 'https://<project name>.atlassian.net'
-JIRA_URL_PATTERN = re.compile(r'(http|https)://.*?\.net')
+# A URL stops at the next `http(s)://`, so `search()` scans each character of a
+# hostile value once, instead of once per scheme before it (quadratic).
+JIRA_URL_PATTERN = re.compile(r'(http|https)://(?:(?!https?://)[^\n])*?\.net')
 
 DEFAULT_COMMIT_TYPES = [
     {'value': 'init', 'name': 'init: initial commit to set up your repository'},
@@ -26,6 +26,12 @@ DEFAULT_COMMIT_TYPES = [
     },
 ]
 
+# Above it, the commit type is typed with completions instead of selected
+COMMIT_TYPE_SEARCH_THRESHOLD = 20
+
+# Commits whose issues are looked up on Jira at once by the changelog hook
+ISSUE_PREFETCH_SIZE = 200
+
 DEFAULT_PROMPT_STYLE = {
     'style': [
         ('qmark', 'fg:#FF5555'),
@@ -41,6 +47,16 @@ DEFAULT_PROMPT_STYLE = {
     ]
 }
 
+# See `templates.py` for the syntax and the available fields
+DEFAULT_COMMIT_MESSAGE_TEMPLATE = (
+    '{commit_type}{?commit_scope}({commit_scope}){/commit_scope}{breaking_change_sign}: '
+    '{commit_title} [{issue}]\n'
+    '\n'
+    '{body}'
+    '{?issue_links}\n\n{issue_links}{/issue_links}'
+    '{?footer}\n\n{footer}{/footer}'
+)
+
 MAJOR = 'MAJOR'
 MINOR = 'MINOR'
 PATCH = 'PATCH'
@@ -60,10 +76,6 @@ BUMP_MAP = {
     'misc': PATCH,
 }
 
-BUMP_PATTERN = defaults.bump_pattern
-
-CHANGELOG_PATTERN = defaults.bump_pattern
-
 CHANGELOG_TYPE_MAP = {
     'feat': 'New features',
     'fix': 'Bug fixes',
@@ -90,3 +102,14 @@ CHANGELOG_TYPE_ORDER = [
     'Code style and formatting',
     'Miscellaneous',
 ]
+
+
+def __getattr__(name):
+    # `BUMP_PATTERN` and `CHANGELOG_PATTERN` come from Commitizen, they're resolved
+    # on first access so importing this module doesn't import Commitizen.
+    if name in ('BUMP_PATTERN', 'CHANGELOG_PATTERN'):
+        from commitizen import defaults
+
+        return defaults.bump_pattern
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
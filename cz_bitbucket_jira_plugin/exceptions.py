@@ -24,6 +24,24 @@ class AllValuesMustBeIntegerException(ValidationError):
         super().__init__(cursor_position=0, message='All values must be integer.')
 
 
+class UnknownCommitTypeException(ValidationError):
+    # fmt: off
+    def __init__(self, commit_type: str):
+        super().__init__(
+            cursor_position=0, message=f"Unknown commit type `{commit_type}`."
+        )
+    # fmt: on
+
+
+class IssueNotFoundException(ValidationError):
+    # fmt: off
+    def __init__(self, issue_key: str, source: str = 'the Jira issue index'):
+        super().__init__(
+            cursor_position=0, message=f"Issue {issue_key} not found on {source}."
+        )
+    # fmt: on
+
+
 class MinimumLengthException(ValidationError):
     # fmt: off
     def __init__(self, minimum_length: int):
@@ -1,19 +1,137 @@
 from __future__ import annotations
 
+import marshal
+import os
+import zlib
 from pathlib import Path
 
-import tomli
 
+CACHE_DIR_ENV_VAR = 'CZ_BITBUCKET_JIRA_CACHE_DIR'
+
+# Parsed config files of this process, keyed by resolved path. Each value is a
+# `(mtime_ns, size, data)` tuple so an edited file is parsed again.
+_config_files_cache: dict[str, tuple[int, int, dict]] = {}
+
+# How each `load_config_file()` call was answered, reported by `profiling`
+config_file_reads = {'memory': 0, 'snapshot': 0, 'parsed': 0}
+
+
+def get_cache_dir() -> Path:
+    """Directory used by the plugin to persist its caches between runs."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+
+    if cache_dir:
+        return Path(cache_dir)
+
+    xdg_cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+
+    return Path(xdg_cache_home) / 'cz-bitbucket-jira-plugin'
+
+
+def _get_config_snapshot_path(config_file: Path) -> Path:
+    # The snapshot stores the full path, a checksum collision is only a cache miss
+    checksum = zlib.crc32(str(config_file).encode())
+    return get_cache_dir() / 'config' / f"{checksum:08x}.marshal"  # fmt: skip
+
+
+def _read_config_snapshot(config_file: Path, mtime_ns: int, size: int) -> dict | None:
+    try:
+        with open(_get_config_snapshot_path(config_file), mode='rb') as file:
+            key, data = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if key != (str(config_file), mtime_ns, size):
+        return None
+
+    return data
+
+
+def _write_config_snapshot(config_file: Path, mtime_ns: int, size: int, data: dict):
+    snapshot_path = _get_config_snapshot_path(config_file)
+    temp_path = snapshot_path.with_suffix(f".{os.getpid()}.tmp")  # fmt: skip
+
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(temp_path, mode='wb') as file:
+            marshal.dump(((str(config_file), mtime_ns, size), data), file)
+
+        os.replace(temp_path, snapshot_path)
+    except (OSError, ValueError):
+        # The snapshot is only an optimization: a read-only cache dir or a config
+        # with values marshal can't store (e.g.: TOML dates) are fine.
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+
+
+def _parse_config_file(config_file: Path) -> dict:
+    import tomli
 
-def config_file_is_valid(config_file: str | Path) -> bool:
     with open(config_file, mode='rb') as file:
-        data = tomli.load(file)
+        return tomli.load(file)
 
+
+def load_config_file(config_file: str | Path) -> dict:
+    """Return the parsed content of a TOML config file.
+
+    Each file is parsed at most once per process. The parsed content is also
+    persisted on disk, keyed by path, mtime and size, so the next process reads
+    it back without parsing TOML at all.
+    """
+    config_file = Path(config_file).resolve()
+    stat = config_file.stat()
+
+    cached = _config_files_cache.get(str(config_file))
+
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        config_file_reads['memory'] += 1
+        return cached[2]
+
+    data = _read_config_snapshot(config_file, stat.st_mtime_ns, stat.st_size)
+
+    if data is None:
+        config_file_reads['parsed'] += 1
+        data = _parse_config_file(config_file)
+        _write_config_snapshot(config_file, stat.st_mtime_ns, stat.st_size, data)
+    else:
+        config_file_reads['snapshot'] += 1
+
+    _config_files_cache[str(config_file)] = (stat.st_mtime_ns, stat.st_size, data)
+
+    return data
+
+
+def clear_config_cache(config_file: str | Path | None = None) -> None:
+    """Invalidate the in-process and on-disk config caches.
+
+    If `config_file` is given, only the entries of that file are removed.
+    """
+    if config_file is None:
+        _config_files_cache.clear()
+        snapshot_paths = (get_cache_dir() / 'config').glob('*.marshal')
+    else:
+        config_file = Path(config_file).resolve()
+        _config_files_cache.pop(str(config_file), None)
+        snapshot_paths = [_get_config_snapshot_path(config_file)]
+
+    for snapshot_path in snapshot_paths:
         try:
-            data['tool']['commitizen']
-            return True
-        except KeyError:
-            return False
+            snapshot_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def config_file_is_valid(config_file: str | Path) -> bool:
+    data = load_config_file(config_file)
+
+    try:
+        data['tool']['commitizen']
+        return True
+    except KeyError:
+        return False
 
 
 def get_config_file() -> Path:
@@ -32,16 +150,17 @@ def get_config_file() -> Path:
     raise AttributeError('Missing [tool.commitizen] table on your config file.')
 
 
-def get_user_prompt_style():
-    config_file = get_config_file()
+def get_commitizen_settings() -> dict:
+    """Return the `[tool.commitizen]` table of the user config file."""
+    return load_config_file(get_config_file())['tool']['commitizen']
 
-    with open(config_file, mode='rb') as file:
-        data = tomli.load(file)
 
-        try:
-            style = data['tool']['commitizen']['prompt_style']
-        except KeyError:
-            style = None
+def prompt_style_from_settings(settings: dict):
+    style = settings.get('prompt_style')
+
+    if style:
+        return {'style': [tuple(attr.values()) for attr in style]}
 
-        if style:
-            return {'style': [tuple(attr.values()) for attr in style]}
+
+def get_user_prompt_style():
+    return prompt_style_from_settings(get_commitizen_settings())
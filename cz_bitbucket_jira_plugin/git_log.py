@@ -0,0 +1,308 @@
+"""Streaming reader of `git log`, one subprocess for the whole range.
+
+Commits are read with `git log -z` and a custom format, fields separated by the
+unit separator character, and parsed as the output arrives.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import tempfile
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import Sequence
+
+
+FIELD_FORMATS = {
+    'rev': '%H',
+    'parents': '%P',
+    'author': '%an',
+    'author_email': '%ae',
+    'author_timestamp': '%at',
+    'commit_timestamp': '%ct',
+    'title': '%s',
+    'body': '%b',
+    'message': '%B',
+}
+
+FIELD_SEPARATOR = '\x1f'
+
+# Starts each commit of `iter_git_log_paths()`, to tell it from the file names
+RECORD_MARKER = '\x1e'
+
+READ_SIZE = 1 << 16
+CHUNK_SIZE = 1 << 20
+
+
+class GitLogError(Exception):
+    pass
+
+
+def iter_git_log(
+    rev_range: str | None = None,
+    fields: Sequence[str] = ('rev', 'message'),
+    cwd: str | None = None,
+    extra_args: Sequence[str] = (),
+) -> Iterator[tuple]:
+    """Yield a tuple with the requested `fields` of each commit of `rev_range`.
+
+    Newest commits come first, like `git log`. Closing the generator early stops
+    the `git` process.
+    """
+    log_format = FIELD_SEPARATOR.join(FIELD_FORMATS[field] for field in fields)
+    command = ['git', 'log', '-z', f"--format={log_format}", *extra_args]  # fmt: skip
+
+    if rev_range:
+        command.append(rev_range)
+
+    command.append('--')
+
+    for record in _iter_records(command, cwd):
+        yield tuple(record.split(FIELD_SEPARATOR))
+
+
+def iter_git_log_revs(
+    revs: Iterable[str],
+    fields: Sequence[str] = ('rev', 'message'),
+    cwd: str | None = None,
+) -> Iterator[tuple]:
+    """Yield a tuple with the requested `fields` of each of the `revs` commits,
+    without their history, newest first.
+
+    The revisions are given to `git log --stdin`, so there's no limit to how
+    many there are.
+    """
+    log_format = FIELD_SEPARATOR.join(FIELD_FORMATS[field] for field in fields)
+    command = ['git', 'log', '-z', f"--format={log_format}", '--no-walk', '--stdin']  # fmt: skip
+
+    with tempfile.TemporaryFile() as stdin_file:
+        stdin_file.write(''.join(f'{rev}\n' for rev in revs).encode())
+        stdin_file.seek(0)
+
+        for record in _iter_records(command, cwd, stdin=stdin_file):
+            yield tuple(record.split(FIELD_SEPARATOR))
+
+
+def iter_git_log_paths(
+    rev_range: str | None = None,
+    fields: Sequence[str] = ('rev', 'message'),
+    cwd: str | None = None,
+    extra_args: Sequence[str] = (),
+) -> Iterator[tuple[tuple, list[str]]]:
+    """Yield `(fields, paths)` for each commit of `rev_range`, `paths` being the
+    files it changed, all read from the same `git log` process.
+
+    Merge commits have no paths, like `git log --name-only`.
+    """
+    log_format = RECORD_MARKER + FIELD_SEPARATOR.join(
+        FIELD_FORMATS[field] for field in fields
+    )
+    command = [
+        'git',
+        'log',
+        '-z',
+        '--name-only',
+        f'--format={log_format}',  # fmt: skip
+        *extra_args,
+    ]
+
+    if rev_range:
+        command.append(rev_range)
+
+    command.append('--')
+
+    # Each commit is its fields and a NUL, then, unless it changed nothing, a
+    # newline and its file names, each one followed by a NUL.
+    commit = None
+    paths: list[str] = []
+
+    for record in _iter_records(command, cwd):
+        if record.startswith(RECORD_MARKER):
+            if commit is not None:
+                yield commit, paths
+
+            commit = tuple(record[1:].split(FIELD_SEPARATOR))
+            paths = []
+        elif record.startswith('\n'):
+            paths.append(record[1:])
+        elif record:
+            paths.append(record)
+
+    if commit is not None:
+        yield commit, paths
+
+
+def iter_git_log_chunks(
+    rev_range: str | None = None,
+    log_format: str = '%H',
+    cwd: str | None = None,
+    extra_args: Sequence[str] = (),
+    read_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield the raw output of `git log -z --format=<log_format>` in chunks of
+    whole records, each one ended by a NUL.
+
+    For callers parsing many records at once (a regex over the chunk), without
+    a Python step per record.
+    """
+    command = ['git', 'log', '-z', f"--format={log_format}", *extra_args]  # fmt: skip
+
+    if rev_range:
+        command.append(rev_range)
+
+    command.append('--')
+    buffer = b''
+
+    for data in _iter_output(command, cwd, read_size):
+        data = buffer + data
+        end = data.rfind(b'\0') + 1
+        buffer = data[end:]
+
+        if end:
+            yield data[:end]
+
+    if buffer:
+        yield buffer + b'\0'
+
+
+def _iter_records(
+    command: list[str], cwd: str | None, stdin: IO[bytes] | None = None
+) -> Iterator[str]:
+    """Run `command` and yield its output split on NUL characters."""
+    buffer = b''
+
+    for data in _iter_output(command, cwd, READ_SIZE, stdin=stdin):
+        *records, buffer = (buffer + data).split(b'\0')
+
+        for record in records:
+            yield record.decode(errors='replace')
+
+    if buffer:
+        yield buffer.decode(errors='replace')
+
+
+def _iter_output(
+    command: list[str],
+    cwd: str | None,
+    read_size: int,
+    stdin: IO[bytes] | None = None,
+) -> Iterator[bytes]:
+    """Run `command`, reading `stdin` (a file), and yield its output as it arrives.
+
+    Raise `GitLogError` if it fails. Closing the generator early stops it.
+    """
+    # Only stdout is a pipe: git may write more than a pipe buffer of warnings,
+    # which would block it while stdout is read
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdin=stdin if stdin is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        completed = False
+
+        try:
+            while data := process.stdout.read(read_size):
+                yield data
+
+            completed = True
+        finally:
+            if not completed:
+                process.kill()
+
+            process.stdout.close()
+            returncode = process.wait()
+
+        if returncode != 0:
+            stderr_file.seek(0)
+            raise GitLogError(stderr_file.read().decode(errors='replace').strip())
+
+
+def get_latest_tag(cwd: str | None = None) -> str | None:
+    """Most recent tag reachable from `HEAD`, or `None` if there's none."""
+    result = subprocess.run(
+        ['git', 'describe', '--tags', '--abbrev=0'],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        return None
+
+    return result.stdout.strip() or None
+
+
+def get_staged_paths(cwd: str | None = None, timeout: float = 1.0) -> list[str]:
+    """Paths of the staged files, or `[]` if git fails or takes over `timeout`
+    seconds."""
+    try:
+        result = subprocess.run(
+            ['git', 'diff', '--cached', '--name-only', '-z'],
+            cwd=cwd,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+
+    if result.returncode != 0:
+        return []
+
+    return [path for path in result.stdout.decode(errors='replace').split('\0') if path]
+
+
+def get_branch_history(
+    count: int = 20, cwd: str | None = None, timeout: float = 0.5
+) -> tuple[str | None, list[tuple[str, str]]]:
+    """Current branch and the `(title, body)` of its last `count` commits, newest
+    first, from a single `git log` call.
+
+    Gives `(None, [])` if git fails or takes over `timeout` seconds, and a `None`
+    branch on a detached `HEAD`.
+    """
+    log_format = FIELD_SEPARATOR.join(('%D', '%s', '%b'))
+
+    try:
+        result = subprocess.run(
+            [
+                'git',
+                '-c',
+                'log.showSignature=false',
+                'log',
+                '-z',
+                f'-n{count}',  # fmt: skip
+                f'--format={log_format}',  # fmt: skip
+                'HEAD',
+                '--',
+            ],
+            cwd=cwd,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None, []
+
+    if result.returncode != 0:
+        return None, []
+
+    branch = None
+    commits = []
+
+    for record in result.stdout.decode(errors='replace').split('\0'):
+        if not record:
+            continue
+
+        refs, title, body = record.split(FIELD_SEPARATOR, 2)
+
+        if not commits:
+            for ref in refs.split(', '):
+                if ref.startswith('HEAD -> '):
+                    branch = ref[len('HEAD -> ') :]
+
+        commits.append((title, body))
+
+    return branch, commits
@@ -0,0 +1,243 @@
+"""Offline index of Jira issues, built from a Jira export.
+
+The index is a SQLite file with one row per issue, keyed by project key and
+issue number, so checking that an issue exists or listing the issues whose
+number starts with some digits are index lookups, not scans. The file is opened
+(read-only) on the first lookup, commands that never look an issue up don't pay
+for it.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from .parsers import split_issue_key
+
+INPUT_FORMATS = ('csv', 'jsonl')
+
+# Column names of the Jira "Export > CSV" files
+CSV_KEY_COLUMNS = ('Issue key', 'key')
+CSV_SUMMARY_COLUMNS = ('Summary', 'summary')
+CSV_TYPE_COLUMNS = ('Issue Type', 'type')
+
+SCHEMA = """
+CREATE TABLE issues (
+    project TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    summary TEXT NOT NULL,
+    type TEXT NOT NULL,
+    PRIMARY KEY (project, number)
+) WITHOUT ROWID
+"""
+
+
+class Issue(NamedTuple):
+    project: str
+    number: int
+    summary: str
+    type: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.project}-{self.number}"  # fmt: skip
+
+
+def _first_value(record: dict, names: tuple) -> str:
+    for name in names:
+        value = record.get(name)
+
+        if value:
+            return value
+
+    return ''
+
+
+def read_jira_export(file: IO[str], input_format: str = 'csv') -> Iterator[Issue]:
+    """Yield the issues of a Jira CSV export or of a JSONL file.
+
+    JSONL lines can be flat (`key`, `summary`, `type`) or issues as returned by
+    the Jira REST API (`key` plus `fields.summary` and `fields.issuetype.name`).
+    Records without a valid issue key are skipped.
+    """
+    if input_format == 'csv':
+        records = csv.DictReader(file)
+    elif input_format == 'jsonl':
+        records = (json.loads(line) for line in file if line.strip())
+    else:
+        raise ValueError(f"Unknown input format {input_format!r}, use one of: {', '.join(INPUT_FORMATS)}")  # fmt: skip
+
+    for record in records:
+        fields = record.get('fields')
+
+        if isinstance(fields, dict):
+            record = {
+                'key': record.get('key'),
+                'summary': fields.get('summary'),
+                'type': (fields.get('issuetype') or {}).get('name'),
+            }
+
+        try:
+            project, number = split_issue_key(_first_value(record, CSV_KEY_COLUMNS))
+        except ValueError:
+            continue
+
+        yield Issue(
+            project,
+            number,
+            _first_value(record, CSV_SUMMARY_COLUMNS),
+            _first_value(record, CSV_TYPE_COLUMNS),
+        )
+
+
+class IssueIndex:
+    """Read-only access to an index file written by `IssueIndex.build()`."""
+
+    # Where the issues are looked up, shown on the validation errors
+    source = 'the Jira issue index'
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        # Lookups may come from the prompt thread and from a validation thread
+        self._lock = threading.Lock()
+        self._max_numbers: dict[str, int] = {}
+
+    @classmethod
+    def build(cls, path: str | Path, issues: Iterable[Issue]) -> int:
+        """Write a new index file with the given issues and return how many it has.
+
+        The file is written aside and moved in place at the end, so a running
+        prompt never sees a half-built index. Repeated keys keep the last issue.
+        """
+        path = Path(path)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")  # fmt: skip
+
+        try:
+            temp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+        connection = sqlite3.connect(temp_path)
+
+        try:
+            # Nothing to protect until the file is moved in place
+            connection.execute('PRAGMA journal_mode = OFF')
+            connection.execute('PRAGMA synchronous = OFF')
+            connection.execute(SCHEMA)
+            connection.executemany(
+                'INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?)', issues
+            )
+            connection.commit()
+            count = connection.execute('SELECT count(*) FROM issues').fetchone()[0]
+        except BaseException:
+            connection.close()
+            temp_path.unlink()
+            raise
+
+        connection.close()
+        os.replace(temp_path, path)
+
+        return count
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if not self.path.is_file():
+                raise FileNotFoundError(f"Jira issue index not found: {self.path}")  # fmt: skip
+
+            uri = f"{self.path.resolve().as_uri()}?mode=ro"  # fmt: skip
+            self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _query(self, sql: str, parameters: tuple) -> list:
+        connection = self.connection
+
+        with self._lock:
+            return connection.execute(sql, parameters).fetchall()
+
+    def get(self, project: str, number: int) -> Optional[Issue]:
+        # Keys are stored upper-cased, like Jira shows them
+        project = project.upper()
+        rows = self._query(
+            'SELECT project, number, summary, type FROM issues '
+            'WHERE project = ? AND number = ?',
+            (project, number),
+        )
+
+        return Issue(*rows[0]) if rows else None
+
+    def get_many(
+        self, project: str, numbers: Iterable[int]
+    ) -> Dict[int, Optional[Issue]]:
+        return {number: self.get(project, number) for number in numbers}
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            project, number = split_issue_key(key)
+        except ValueError:
+            return False
+
+        return self.get(project, number) is not None
+
+    def _max_number(self, project: str) -> int:
+        if project not in self._max_numbers:
+            rows = self._query(
+                'SELECT max(number) FROM issues WHERE project = ?', (project,)
+            )
+            self._max_numbers[project] = rows[0][0] or 0
+
+        return self._max_numbers[project]
+
+    def complete(self, project: str, prefix: str, limit: int = 10) -> List[Issue]:
+        """Issues of `project` whose number starts with the `prefix` digits, shortest
+        numbers first. Without a prefix, the most recent issues are returned.
+        """
+        project = project.upper()
+
+        if not prefix:
+            rows = self._query(
+                'SELECT project, number, summary, type FROM issues '
+                'WHERE project = ? ORDER BY number DESC LIMIT ?',
+                (project, limit),
+            )
+
+            return [Issue(*row) for row in rows]
+
+        if not prefix.isdigit() or prefix.startswith('0'):
+            return []
+
+        # Numbers starting with "12" are in [12, 13), [120, 130), [1200, 1300)...
+        # each one a range scan of the primary key.
+        issues = []
+        start, end = int(prefix), int(prefix) + 1
+        max_number = self._max_number(project)
+
+        while start <= max_number and len(issues) < limit:
+            rows = self._query(
+                'SELECT project, number, summary, type FROM issues '
+                'WHERE project = ? AND number >= ? AND number < ? '
+                'ORDER BY number LIMIT ?',
+                (project, start, end, limit - len(issues)),
+            )
+            issues.extend(Issue(*row) for row in rows)
+            start, end = start * 10, end * 10
+
+        return issues
@@ -0,0 +1,402 @@
+"""Client of the Jira REST API, to look issues up by key.
+
+Lookups are made to be cheap when repeated over many commits:
+
+- the HTTP connections are kept alive and reused, from a small pool;
+- the keys are looked up in batches, a single JQL `key in (...)` search each;
+- every result, found or not, is kept in a disk-backed cache for `ttl` seconds,
+  so a key already seen by a previous `cz` call doesn't hit the network.
+"""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import hashlib
+import http.client
+import json
+import os
+import pickle
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from .functions import get_cache_dir
+from .issue_index import Issue
+from .parsers import ISSUE_KEY_PATTERN
+from .parsers import split_issue_key
+
+
+USER_ENV_VAR = 'CZ_BITBUCKET_JIRA_USER'
+API_TOKEN_ENV_VAR = 'CZ_BITBUCKET_JIRA_API_TOKEN'
+
+# Enhanced JQL search of Jira Cloud, paginated by token
+SEARCH_PATH = '/rest/api/3/search/jql'
+
+# A connection closed by the server while idle fails on its next request
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class JiraClientError(OSError):
+    """Jira couldn't be reached or didn't answer as expected."""
+
+
+class ConnectionPool:
+    """Up to `size` keep-alive HTTP(S) connections to a single host.
+
+    Idle connections are reused last-in first-out, so the connection most likely
+    to still be open is picked first.
+    """
+
+    def __init__(self, base_url: str, size: int = 4, timeout: float = 10.0) -> None:
+        url = urllib.parse.urlsplit(base_url)
+
+        if url.scheme == 'https':
+            self.connection_class = http.client.HTTPSConnection
+        elif url.scheme == 'http':
+            self.connection_class = http.client.HTTPConnection
+        else:
+            raise ValueError(f"Unsupported URL {base_url!r}")  # fmt: skip
+
+        self.host = url.hostname
+        self.port = url.port
+        self.base_path = url.path.rstrip('/')
+        self.timeout = timeout
+        self.created = 0
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.created += 1
+
+        return self.connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _send(self, connection, method: str, path: str, body, headers: dict):
+        connection.request(method, self.base_path + path, body, headers)
+
+        return connection.getresponse()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict | None = None,
+    ) -> tuple[int, bytes]:
+        """Send a request and return the response status and body."""
+        headers = headers or {}
+
+        with self._slots:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+
+            reused = connection is not None
+            connection = connection or self._new_connection()
+
+            try:
+                try:
+                    response = self._send(connection, method, path, body, headers)
+                except STALE_CONNECTION_ERRORS:
+                    if not reused:
+                        raise
+
+                    # Closed by the server while idle, retry once on a new one
+                    connection.close()
+                    connection = self._new_connection()
+                    response = self._send(connection, method, path, body, headers)
+
+                data = response.read()
+            except BaseException:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                with self._lock:
+                    self._idle.append(connection)
+
+            return response.status, data
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for connection in idle:
+            connection.close()
+
+
+class JiraIssueCache:
+    """Disk-backed cache of looked up issues, each entry valid for `ttl` seconds.
+
+    Keys that Jira doesn't know are cached too (as `None`), so a typo is only
+    looked up once.
+    """
+
+    def __init__(self, path: Path, ttl: float = 86_400) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[float, Optional[Issue]]] | None = None
+        self._dirty = False
+
+    @classmethod
+    def for_jira(cls, jira_base_url: str, ttl: float = 86_400):
+        digest = hashlib.sha1(jira_base_url.encode()).hexdigest()
+
+        return cls(get_cache_dir() / 'jira' / f"{digest}.pickle", ttl=ttl)  # fmt: skip
+
+    @property
+    def entries(self) -> dict[str, tuple[float, Optional[Issue]]]:
+        if self._entries is None:
+            self._entries = self._load()
+
+        return self._entries
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, mode='rb') as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return {}
+
+    def get(self, key: str) -> tuple[bool, Optional[Issue]]:
+        """Return `(found, issue)`, `found` is `False` for missing or expired keys."""
+        entry = self.entries.get(key)
+
+        if entry is None or entry[0] + self.ttl < time.time():
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+
+        return True, entry[1]
+
+    def set(self, key: str, issue: Optional[Issue]) -> None:
+        self.entries[key] = (time.time(), issue)
+
+        if not self._dirty:
+            self._dirty = True
+            atexit.register(self.save)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        now = time.time()
+        entries = {
+            key: entry
+            for key, entry in self.entries.items()
+            if entry[0] + self.ttl >= now
+        }
+        temp_path = self.path.with_suffix(f".{os.getpid()}.tmp")  # fmt: skip
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(temp_path, mode='wb') as file:
+                pickle.dump(entries, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_path, self.path)
+        except OSError:
+            return
+
+        self._dirty = False
+        atexit.unregister(self.save)
+
+
+class JiraClient:
+    """Look Jira issues up by key, in batches, through a cache.
+
+    It has the `get()` and `get_many()` methods of `IssueIndex`, so it can be
+    used by the same validators.
+    """
+
+    # Where the issues are looked up, shown on the validation errors
+    source = 'Jira'
+
+    def __init__(
+        self,
+        jira_base_url: str,
+        auth: Tuple[str, str] | None = None,
+        cache: JiraIssueCache | None = None,
+        pool_size: int = 4,
+        batch_size: int = 100,
+        timeout: float = 10.0,
+    ) -> None:
+        self.jira_base_url = jira_base_url
+        self.pool = ConnectionPool(jira_base_url, size=pool_size, timeout=timeout)
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.cache = cache
+        self.requests = 0
+        self.headers = {
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+        }
+
+        if auth:
+            credentials = base64.b64encode(':'.join(auth).encode()).decode()
+            self.headers['Authorization'] = f"Basic {credentials}"  # fmt: skip
+
+    @classmethod
+    def from_environment(cls, jira_base_url: str, **kwargs):
+        """Build a client authenticated with the `CZ_BITBUCKET_JIRA_USER` and
+        `CZ_BITBUCKET_JIRA_API_TOKEN` environment variables, if they're set."""
+        user = os.environ.get(USER_ENV_VAR)
+        api_token = os.environ.get(API_TOKEN_ENV_VAR)
+
+        return cls(jira_base_url, auth=(user, api_token) if user and api_token else None, **kwargs)  # fmt: skip
+
+    def _post_search(self, payload: dict) -> Tuple[int, bytes]:
+        try:
+            self.requests += 1
+            return self.pool.request(
+                'POST', SEARCH_PATH, json.dumps(payload).encode(), self.headers
+            )
+        except OSError as error:
+            raise JiraClientError(f"Jira request failed: {error}") from error  # fmt: skip
+
+    def search(self, keys: List[str]) -> Dict[str, Issue]:
+        """Look the keys up with a single JQL search, following its pages.
+
+        Jira rejects a search with unknown keys (HTTP 400, naming them), those
+        keys are left out and the others searched again.
+        """
+        payload = {
+            'jql': f'key in ({", ".join(keys)})',  # fmt: skip
+            'fields': ['summary', 'issuetype'],
+            'maxResults': len(keys),
+        }
+        issues = {}
+
+        while True:
+            status, body = self._post_search(payload)
+
+            if status == 400:
+                unknown_keys = self._get_unknown_keys(body, keys)
+
+                if unknown_keys:
+                    known_keys = [key for key in keys if key.upper() not in unknown_keys]
+
+                    return self.search(known_keys) if known_keys else {}
+
+            if status != 200:
+                raise JiraClientError(f"Jira search failed with HTTP status {status}.")  # fmt: skip
+
+            # A proxy or an SSO login page may answer HTML with a 200 status
+            try:
+                data = json.loads(body)
+
+                for item in data.get('issues', []):
+                    fields = item.get('fields') or {}
+                    project, number = split_issue_key(item['key'])
+                    issues[item['key']] = Issue(
+                        project,
+                        number,
+                        fields.get('summary') or '',
+                        (fields.get('issuetype') or {}).get('name') or '',
+                    )
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                raise JiraClientError(f"Unexpected Jira search response: {error}") from error  # fmt: skip
+
+            if data.get('isLast', True) or not data.get('nextPageToken'):
+                return issues
+
+            payload['nextPageToken'] = data['nextPageToken']
+
+    @staticmethod
+    def _get_unknown_keys(body: bytes, keys: List[str]) -> Set[str]:
+        """Upper-cased searched keys named by the error messages of a rejected
+        search, e.g.: "An issue with key 'DEV-9' does not exist for field 'key'."."""
+        try:
+            messages = json.loads(body).get('errorMessages') or []
+        except (ValueError, AttributeError):
+            return set()
+
+        searched_keys = {key.upper() for key in keys}
+
+        return {
+            match.group(0).upper()
+            for message in messages
+            if isinstance(message, str)
+            for match in ISSUE_KEY_PATTERN.finditer(message)
+            if match.group(0).upper() in searched_keys
+        }
+
+    def get_issues(self, keys: Iterable[str]) -> Dict[str, Optional[Issue]]:
+        """Return the issue of each key, or `None` if Jira doesn't know it.
+
+        Cached keys are answered from the cache, the others are searched in
+        batches of `batch_size`, up to `pool_size` batches at once. Strings that
+        aren't issue keys are `None`, without asking Jira.
+        """
+        results: Dict[str, Optional[Issue]] = {}
+        missing = []
+
+        for key in dict.fromkeys(keys):
+            if not ISSUE_KEY_PATTERN.fullmatch(key):
+                results[key] = None
+                continue
+
+            if self.cache is not None:
+                found, issue = self.cache.get(key.upper())
+
+                if found:
+                    results[key] = issue
+                    continue
+
+            missing.append(key)
+
+        batches = [
+            missing[start : start + self.batch_size]
+            for start in range(0, len(missing), self.batch_size)
+        ]
+
+        if len(batches) > 1 and self.pool_size > 1:
+            with ThreadPoolExecutor(min(self.pool_size, len(batches))) as executor:
+                found_batches = list(executor.map(self.search, batches))
+        else:
+            found_batches = [self.search(batch) for batch in batches]
+
+        for batch, found in zip(batches, found_batches):
+            for key in batch:
+                issue = found.get(key.upper())
+                results[key] = issue
+
+                if self.cache is not None:
+                    self.cache.set(key.upper(), issue)
+
+        return results
+
+    def get(self, project: str, number: int) -> Optional[Issue]:
+        key = f"{project}-{number}"  # fmt: skip
+
+        return self.get_issues([key])[key]
+
+    def get_many(
+        self, project: str, numbers: Iterable[int]
+    ) -> Dict[int, Optional[Issue]]:
+        keys = {number: f"{project}-{number}" for number in numbers}  # fmt: skip
+        issues = self.get_issues(keys.values())
+
+        return {number: issues[key] for number, key in keys.items()}
+
+    def close(self) -> None:
+        self.pool.close()
@@ -0,0 +1,133 @@
+"""Check every commit of a revision range against the plugin convention."""
+
+from __future__ import annotations
+
+import json
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from .checker import check_commit_message
+from .checker import clean_commit_message
+from .git_log import iter_git_log
+from .pool import map_chunks
+
+
+class LintFailure(NamedTuple):
+    rev: str
+    title: str
+    errors: List[str]
+
+
+class LintReport(NamedTuple):
+    rev_range: Optional[str]
+    checked: int
+    failures: List[LintFailure]
+    # Every checked commit, in `git log` order
+    revs: List[str]
+
+
+def lint_records(
+    commit_types: Tuple[str, ...], records: List[Tuple[str, str]]
+) -> Tuple[List[str], List[LintFailure]]:
+    """Check a chunk of `(rev, message)` records, return the checked revs and
+    the failures. Module level, so it can run in a worker process."""
+    failures = []
+
+    for rev, message in records:
+        errors = check_commit_message(message, commit_types)
+
+        if errors:
+            title = clean_commit_message(message).partition('\n')[0]
+            failures.append(LintFailure(rev, title, errors))
+
+    return [rev for rev, _ in records], failures
+
+
+def lint_commits(
+    records: Iterable[Tuple[str, str]],
+    commit_types: Iterable[str],
+    rev_range: str | None = None,
+    fail_fast: bool = False,
+    **pool_options,
+) -> LintReport:
+    """Check `(rev, message)` records in parallel chunks.
+
+    With `fail_fast`, it stops at the first chunk with a failure and stops
+    reading the records.
+    """
+    revs: List[str] = []
+    failures: List[LintFailure] = []
+    chunks = map_chunks(lint_records, records, tuple(commit_types), **pool_options)
+
+    try:
+        for chunk_revs, chunk_failures in chunks:
+            revs.extend(chunk_revs)
+            failures.extend(chunk_failures)
+
+            if fail_fast and failures:
+                break
+    finally:
+        chunks.close()
+
+    return LintReport(rev_range, len(revs), failures, revs)
+
+
+def lint_range(
+    rev_range: str | None,
+    commit_types: Iterable[str],
+    cwd: str | None = None,
+    fail_fast: bool = False,
+    **pool_options,
+) -> LintReport:
+    """Check every commit of `rev_range` (e.g.: `main..HEAD`), read with a single
+    `git log` process."""
+    records = iter_git_log(rev_range, fields=('rev', 'message'), cwd=cwd)
+
+    try:
+        return lint_commits(
+            records, commit_types, rev_range, fail_fast=fail_fast, **pool_options
+        )
+    finally:
+        records.close()
+
+
+def report_to_json(report: LintReport) -> str:
+    return json.dumps(
+        {
+            'rev_range': report.rev_range,
+            'checked': report.checked,
+            'failed': len(report.failures),
+            'failures': [failure._asdict() for failure in report.failures],
+        },
+        indent=2,
+    )
+
+
+def report_to_junit(report: LintReport) -> str:
+    from xml.etree import ElementTree
+
+    testsuite = ElementTree.Element(
+        'testsuite',
+        name='cz-bitbucket-jira-lint',
+        tests=str(report.checked),
+        failures=str(len(report.failures)),
+        errors='0',
+    )
+
+    failures = {failure.rev: failure for failure in report.failures}
+
+    # A test case per checked commit, so the count matches `tests`
+    for rev in report.revs:
+        testcase = ElementTree.SubElement(
+            testsuite, 'testcase', classname='commits', name=rev
+        )
+        failure = failures.get(rev)
+
+        if failure is not None:
+            element = ElementTree.SubElement(testcase, 'failure', message=failure.title)
+            element.text = '\n'.join(failure.errors)
+
+    return ElementTree.tostring(testsuite, encoding='unicode', xml_declaration=True)
@@ -1,5 +1,10 @@
+import os
 import re
-from collections import OrderedDict
+import time
+from pathlib import Path
+from typing import Iterable
+from typing import List
+from typing import Optional
 
 from commitizen import git
 from commitizen.config.base_config import BaseConfig
@@ -7,31 +12,39 @@ from commitizen.cz.base import BaseCommitizen
 from commitizen.defaults import Questions
 from commitizen.exceptions import InvalidConfigurationError
 
+from .bump import build_bump_classifier
+from .changelog import render_entry
+from .changelog import render_records_in_pool
 from .defaults import BUMP_MAP
 from .defaults import BUMP_PATTERN
 from .defaults import CHANGELOG_PATTERN
 from .defaults import CHANGELOG_TYPE_MAP
 from .defaults import CHANGELOG_TYPE_ORDER
+from .defaults import COMMIT_TYPE_SEARCH_THRESHOLD
+from .defaults import DEFAULT_COMMIT_MESSAGE_TEMPLATE
 from .defaults import DEFAULT_COMMIT_TYPES
 from .defaults import DEFAULT_PROMPT_STYLE
+from .defaults import ISSUE_PREFETCH_SIZE
 from .defaults import JIRA_URL_EXAMPLE
 from .defaults import JIRA_URL_PATTERN
-from .exceptions import RequiredConfigException
 from .functions import get_user_prompt_style
-from .validators import AllValuesMustBeIntegerValidator
-from .validators import apply_multiple_validators
-from .validators import MinimumLengthValidator
-from .validators import RequiredAnswerValidator
-from .validators import ValueMustBeIntegerValidator
+from .functions import prompt_style_from_settings
+from .parsers import build_commit_parser
+from .parsers import compile_commit_parser
+from .parsers import split_issue_id
+from .templates import compile_template
 
 
 class CzBitbucketJiraPlugin(BaseCommitizen):
     def __init__(self, config: BaseConfig):
+        started_at = time.perf_counter()
         self.config = config
 
         self.user_jira_url = self.config.settings.get('jira_url')
 
         if not self.user_jira_url:
+            from .exceptions import RequiredConfigException
+
             raise RequiredConfigException(config_name='jira_url')
 
         try:
@@ -45,9 +58,15 @@ class CzBitbucketJiraPlugin(BaseCommitizen):
             )
             # fmt: on
 
+        self.jira_browse_url = f"{self.jira_base_url}/browse/"  # fmt: skip
+
         self.user_jira_project_key = self.config.settings.get('jira_project_key')
         self.user_commit_types = self.config.settings.get('commit_types')
-        self.user_prompt_style = get_user_prompt_style()
+        if self.config.path:
+            # Commitizen already parsed the config file, no need to read it again
+            self.user_prompt_style = prompt_style_from_settings(self.config.settings)
+        else:
+            self.user_prompt_style = get_user_prompt_style()
         self.user_minimum_length = self.config.settings.get(
             'commit_message_minimum_length'
         )
@@ -56,34 +75,158 @@ class CzBitbucketJiraPlugin(BaseCommitizen):
 
         self.bump_pattern = BUMP_PATTERN
         self.bump_map = BUMP_MAP
+        self.bump_classifier = build_bump_classifier(
+            self.bump_pattern, tuple(self.bump_map.items())
+        )
 
         self.changelog_pattern = CHANGELOG_PATTERN
         self.change_type_map = self.user_changelog_type_map or CHANGELOG_TYPE_MAP
         self.change_type_order = self.user_changelog_type_order or CHANGELOG_TYPE_ORDER
 
         self.commit_types = self.user_commit_types or DEFAULT_COMMIT_TYPES
-        piped_commit_types = '|'.join(
-            [d.get('value') for d in self.commit_types] + ['BREAKING CHANGE']
-        )
-        # fmt: off
-        self.commit_parser = (
-            fr"^((?P<change_type>{piped_commit_types})"
-            r'(?:\((?P<scope>[^()\r\n]*)\)|\()?(?P<breaking>!)?|\w+!):\s(?P<message>.*)?'
+        self.commit_parser = build_commit_parser(
+            tuple(d.get('value') for d in self.commit_types)
         )
-        # fmt: on
+        self.commit_parser_pattern = compile_commit_parser(self.commit_parser)
+
+        # Large catalogs are searched on the prompt, the index is built once here
+        self.commit_type_index = None
+        commit_type_search = self.config.settings.get('commit_type_search')
+
+        if commit_type_search is None:
+            commit_type_search = len(self.commit_types) > COMMIT_TYPE_SEARCH_THRESHOLD
+
+        if commit_type_search:
+            from .type_search import CommitTypeIndex
+            from .type_search import load_recent_types
+
+            self.commit_type_index = CommitTypeIndex(
+                self.commit_types, recent=load_recent_types()
+            )
 
         self.minimum_length = self.user_minimum_length or 32
 
+        # The default layout is rendered by `render_default_message()`, only a
+        # custom `commit_message_template` is compiled
+        self.render_message = None
+        message_template = self.config.settings.get('commit_message_template')
+
+        if message_template and message_template != DEFAULT_COMMIT_MESSAGE_TEMPLATE:
+            try:
+                self.render_message = compile_template(message_template)
+            except ValueError as error:
+                raise InvalidConfigurationError(
+                    f'Config `commit_message_template` seems wrong. {error}'  # fmt: skip
+                )
+
+        self.user_jira_api = self.config.settings.get('jira_api')
+        self.user_changelog_issue_summaries = self.config.settings.get(
+            'changelog_issue_summaries'
+        )
+        self._jira_client = None
+        self._jira_unreachable = False
+        self._prefetched_issue_ids = set()
+
+        # Opened by `questions()`, only the prompt and `render` look issues up
+        self.user_jira_issue_index = self.config.settings.get('jira_issue_index')
+        self._issue_index = None
+        self._answered_jira_project_key = None
+
+        # Answers guessed from the branch and its last commits by `questions()`
+        self.user_prefill_answers = self.config.settings.get('prefill_answers')
+        self.user_prefill_skip_answered = self.config.settings.get(
+            'prefill_skip_answered'
+        )
+        self.prefilled_answers = {}
+
+        # Monorepo mode, `[tool.commitizen.components.<name>]` tables
+        self.components = []
+        self._component_matcher = None
+
+        if self.config.settings.get('components'):
+            from .monorepo import load_components
+
+            try:
+                self.components = load_components(self.config.settings)
+            except ValueError as error:
+                raise InvalidConfigurationError(
+                    f'Config `components` seems wrong. {error}'  # fmt: skip
+                )
+
         self.config.update(self.user_prompt_style or DEFAULT_PROMPT_STYLE)
 
         super().__init__(self.config)
 
+        # Same as `profiling.PROFILE_ENV_VAR`, not imported unless profiling
+        profile = os.environ.get('CZ_BITBUCKET_JIRA_PROFILE')
+
+        if profile or self.config.settings.get('profile'):
+            from .profiling import get_profiler
+
+            profiler = get_profiler(self.config.settings)
+            profiler.record('plugin.__init__', started_at, time.perf_counter())
+            profiler.instrument(self)
+
     def questions(self) -> Questions:
+        return self.build_questions()
+
+    def build_questions(self, interactive: bool = True) -> Questions:
+        """The questions of the prompt.
+
+        Non-interactive questions are for validating answers given at once (see
+        `messages.render_messages()`): nothing is guessed from git, there are no
+        completers, the issues are checked synchronously and the filters only
+        normalize the answers, without saving anything.
+        """
+        # Only needed by the prompt, imported here to keep the other commands fast
+        from .validators import AllValuesMustBeIntegerValidator
+        from .validators import apply_multiple_validators
+        from .validators import MinimumLengthValidator
+        from .validators import RequiredAnswerValidator
+        from .validators import ValueMustBeIntegerValidator
+
+        issue_validators = []
+        issue_completers = {}
+        issue_index = self.get_issue_index()
+        issue_lookup = issue_index
+
+        if issue_lookup is None and self.user_jira_api:
+            issue_lookup = self.get_jira_client()
+
+        if issue_lookup is not None:
+            from .validators import BackgroundValidator
+            from .validators import IssueExistsValidator
+
+            issue_validator = IssueExistsValidator(
+                issue_lookup, self.get_prompt_project_key
+            )
+            # Lookups may hit the disk or the network, keep them off the typing
+            issue_validators.append(
+                BackgroundValidator(issue_validator) if interactive else issue_validator
+            )
+
+        # Only the offline index is fast enough to complete on each keystroke
+        if issue_index is not None and interactive:
+            from .completers import IssueNumberCompleter
+
+            issue_completers = {
+                multiple: IssueNumberCompleter(
+                    issue_index, self.get_prompt_project_key, multiple=multiple
+                )
+                for multiple in (False, True)
+            }
+
         if self.user_jira_project_key:
             default_jira_project_key = f"(default: {self.user_jira_project_key})\n "  # fmt: skip
         else:
             default_jira_project_key = '\n '
 
+        if interactive:
+            staged_project_key = self.get_staged_project_key()
+            self.prefilled_answers = self.get_prefilled_answers()
+        else:
+            staged_project_key = None
+
         multiple_items_instruction = (
             'if more than one, use comma to separate them. (press [enter] to skip)\n '
         )
@@ -91,9 +234,42 @@ class CzBitbucketJiraPlugin(BaseCommitizen):
             '(press [enter] to insert a new line OR [alt + enter] to finish)\n>'
         )
         select_instruction = '(use arrow keys to select and press [enter])\n'
+        search_instruction = '(type to search, recent types first, [tab] to complete)\n '
         optional_instruction = '(press [enter] to skip)\n '
         confirm_instruction = '(y/n)\n  '
 
+        if self.commit_type_index is None:
+            commit_type_question = {
+                'type': 'select',
+                'name': 'commit_type',
+                'message': 'Select the type of change you are committing:\n ',
+                'choices': self.commit_types,
+                'pointer': '>',
+                'instruction': select_instruction,
+                'validator': RequiredAnswerValidator,
+                'qmark': '\n*',
+            }
+        else:
+            from .completers import CommitTypeCompleter
+            from .validators import CommitTypeValidator
+
+            commit_type_question = {
+                'type': 'input',
+                'name': 'commit_type',
+                'message': 'Type of change you are committing:\n',
+                'instruction': search_instruction,
+                'validate': CommitTypeValidator(self.commit_type_index),
+                'completer': (
+                    CommitTypeCompleter(self.commit_type_index) if interactive else None
+                ),
+                'filter': (
+                    self._remember_commit_type
+                    if interactive
+                    else self._normalize_commit_type
+                ),
+                'qmark': '\n*',
+            }
+
         questions = [
             {
                 'type': 'input',
@@ -104,13 +280,22 @@ class CzBitbucketJiraPlugin(BaseCommitizen):
                     RequiredAnswerValidator if not self.user_jira_project_key else None
                 ),
                 'qmark': ' ' if self.user_jira_project_key else '\n*',
+                'default': (
+                    self.prefilled_answers.get('jira_project_key')
+                    or staged_project_key
+                    or ''
+                ),
+                'filter': self._remember_project_key,
             },
             {
                 'type': 'input',
                 'name': 'issue_epic_number',
                 'message': 'Issue epic number:\n ',
-                'validate': ValueMustBeIntegerValidator,
+                'validate': apply_multiple_validators(
+                    validators=[ValueMustBeIntegerValidator, *issue_validators]
+                ),
                 'qmark': '\n ',
+                'completer': issue_completers.get(False),
             },
             {
                 'type': 'input',
@@ -120,36 +305,35 @@ class CzBitbucketJiraPlugin(BaseCommitizen):
                     validators=[
                         RequiredAnswerValidator,
                         ValueMustBeIntegerValidator,
+                        *issue_validators,
                     ]
                 ),
                 'qmark': '\n*',
+                'completer': issue_completers.get(False),
             },
             {
                 'type': 'input',
                 'name': 'issue_subtasks',
                 'message': 'Issue subtask number:\n',
                 'instruction': multiple_items_instruction,
-                'validate': AllValuesMustBeIntegerValidator,
+                'validate': apply_multiple_validators(
+                    validators=[AllValuesMustBeIntegerValidator, *issue_validators]
+                ),
                 'qmark': '\n ',
+                'completer': issue_completers.get(True),
             },
             {
                 'type': 'input',
                 'name': 'issue_related_tasks',
                 'message': 'Issue related task number:\n',
                 'instruction': multiple_items_instruction,
-                'validate': AllValuesMustBeIntegerValidator,
+                'validate': apply_multiple_validators(
+                    validators=[AllValuesMustBeIntegerValidator, *issue_validators]
+                ),
                 'qmark': '\n ',
+                'completer': issue_completers.get(True),
             },
-            {
-                'type': 'select',
-                'name': 'commit_type',
-                'message': 'Select the type of change you are committing:\n ',
-                'choices': self.commit_types,
-                'pointer': '>',
-                'instruction': select_instruction,
-                'validator': RequiredAnswerValidator,
-                'qmark': '\n*',
-            },
+            commit_type_question,
             {
                 'type': 'input',
                 'name': 'commit_scope',
@@ -193,85 +377,311 @@ class CzBitbucketJiraPlugin(BaseCommitizen):
                 'qmark': '\n ',
             },
         ]
+
+        if not interactive:
+            return questions
+
+        for question in questions:
+            if question['name'] not in self.prefilled_answers:
+                continue
+
+            question['default'] = self.prefilled_answers[question['name']]
+
+            # `message()` takes the skipped answers from `prefilled_answers`
+            if self.user_prefill_skip_answered:
+                question['when'] = lambda _answers: False
+
+        if (
+            self.user_prefill_skip_answered
+            and 'jira_project_key' in self.prefilled_answers
+        ):
+            self._answered_jira_project_key = self.prefilled_answers['jira_project_key']
+
         return questions
 
-    def message(self, answers: dict) -> str:
-        jira_project_key = str(
-            answers.get('jira_project_key') or self.user_jira_project_key or ''
-        )
+    def get_issue_index(self):
+        """The Jira issue index set by `jira_issue_index`, or `None`.
 
-        if jira_project_key:
-            jira_project_key += '-'
+        A relative path is relative to the config file. The index file itself is
+        only opened on the first lookup.
+        """
+        if not self.user_jira_issue_index:
+            return None
 
-        issue_epic_number = answers.get('issue_epic_number')
-        issue_number = answers.get('issue_number')
-        issue_subtasks = answers.get('issue_subtasks')
-        issue_related_tasks = answers.get('issue_related_tasks')
+        if self._issue_index is None:
+            from .issue_index import IssueIndex
 
-        commit_type = answers.get('commit_type')
-        commit_scope = answers.get('commit_scope', '').strip()
+            path = Path(self.user_jira_issue_index).expanduser()
 
-        commit_title = answers.get('commit_title')
-        commit_title = commit_title[:1].lower() + commit_title[1:]
-        commit_title = commit_title.strip().rstrip('.')
+            if not path.is_absolute() and self.config.path:
+                path = Path(self.config.path).parent / path
 
-        commit_description = answers.get('commit_description')
-        is_breaking_change = answers.get('is_breaking_change')
-        footer = answers.get('footer')
+            if not path.is_file():
+                raise InvalidConfigurationError(
+                    f'Config `jira_issue_index` seems wrong. File not found: {path}'  # fmt: skip
+                )
 
-        breaking_change_sign = '!' if is_breaking_change else ''
-        breaking_change_text = 'BREAKING CHANGE' if is_breaking_change else ''
+            self._issue_index = IssueIndex(path)
 
-        # fmt: off
-        if commit_scope:
-            commit_message = (
-                f"{commit_type}({commit_scope}){breaking_change_sign}: "
-                f"{commit_title} [{jira_project_key}{issue_number}]"
+        return self._issue_index
+
+    def get_jira_client(self):
+        """Client of the Jira REST API, at `jira_api_url` (default: `jira_url`)."""
+        if self._jira_client is None:
+            from .jira_client import JiraClient
+            from .jira_client import JiraIssueCache
+
+            settings = self.config.settings
+            api_url = settings.get('jira_api_url') or self.jira_base_url
+            self._jira_client = JiraClient.from_environment(
+                api_url,
+                cache=JiraIssueCache.for_jira(
+                    api_url, ttl=settings.get('jira_api_cache_ttl', 86_400)
+                ),
             )
-        else:
-            commit_message = (
-                f"{commit_type}{breaking_change_sign}: "
-                f"{commit_title} [{jira_project_key}{issue_number}]"
+
+        return self._jira_client
+
+    def get_issue_summaries(self, issue_ids: Iterable[str]) -> dict:
+        """Summary of each issue Jira knows, `{}` if Jira can't be reached."""
+        if self._jira_unreachable:
+            return {}
+
+        try:
+            issues = self.get_jira_client().get_issues(issue_ids)
+        except (OSError, ValueError, KeyError):
+            # The changelog is still rendered, without summaries
+            self._jira_unreachable = True
+            return {}
+
+        return {key: issue.summary for key, issue in issues.items() if issue}
+
+    def _prefetch_history_issues(self, rev: str, issue_id: str) -> None:
+        """Look `issue_id` up with the issues of the commits rendered next, at
+        once, so the hook doesn't make a request per commit.
+
+        Commitizen renders the commits in `git log` order, so the next ones are
+        the `ISSUE_PREFETCH_SIZE` commits from `rev`: only the rendered range
+        and a bounded window past its end are looked up, not the whole history.
+        """
+        from .git_log import GitLogError
+        from .git_log import iter_git_log
+
+        repository = self.config.path.parent if self.config.path else None
+        issue_ids = {issue_id}
+
+        try:
+            issue_ids.update(
+                split_issue_id(title)[1]
+                for (title,) in iter_git_log(
+                    rev,
+                    fields=('title',),
+                    cwd=repository,
+                    extra_args=('-n', str(ISSUE_PREFETCH_SIZE)),
+                )
             )
+        except GitLogError:
+            pass
+
+        issue_ids.discard(None)
+        issue_ids -= self._prefetched_issue_ids
+        self._prefetched_issue_ids.update(issue_ids)
+        self.get_issue_summaries(issue_ids)
+
+    def get_component_matcher(self):
+        """Matcher of the `components` of the config, `None` without components."""
+        if not self.components:
+            return None
+
+        if self._component_matcher is None:
+            from .monorepo import ComponentMatcher
+
+            self._component_matcher = ComponentMatcher(self.components)
+
+        return self._component_matcher
+
+    def get_staged_project_key(self) -> Optional[str]:
+        """Jira project key of the components of the staged files, if they all
+        belong to components with the same key."""
+        matcher = self.get_component_matcher()
+
+        if matcher is None:
+            return None
+
+        from .git_log import get_staged_paths
+
+        repository = self.config.path.parent if self.config.path else None
+        project_keys = matcher.get_project_keys(get_staged_paths(cwd=repository))
+
+        return project_keys.pop() if len(project_keys) == 1 else None
+
+    def get_prefilled_answers(self) -> dict:
+        """Answers guessed from the current branch and its last commits when
+        `prefill_answers` is set, see `prefill.read_answers()`."""
+        if not self.user_prefill_answers:
+            return {}
+
+        from .prefill import read_answers
+
+        repository = self.config.path.parent if self.config.path else None
+
+        return read_answers(str(repository) if repository else None, self.commit_parser)
+
+    def get_prompt_project_key(self) -> str:
+        return self._answered_jira_project_key or self.user_jira_project_key or ''
+
+    def _remember_project_key(self, answer: str) -> str:
+        # Used as the question filter, so the issue questions asked next know it
+        self._answered_jira_project_key = answer.strip() if answer else None
+
+        return answer
+
+    def _normalize_commit_type(self, answer: str) -> str:
+        # The typed case is fixed
+        return self.commit_type_index.get_value(answer) or answer
+
+    def _remember_commit_type(self, answer: str) -> str:
+        # Used as the question filter of the prompt: the type is also moved to
+        # the front of the recent types of the next prompts
+        from .type_search import save_recent_types
+
+        value = self._normalize_commit_type(answer)
+        self.commit_type_index.remember(value)
+        save_recent_types(self.commit_type_index.recent_values)
+
+        return value
+
+    def message(self, answers: dict) -> str:
+        if self.prefilled_answers:
+            answers = {**self.prefilled_answers, **answers}
+
+        if self.render_message is None:
+            return self.render_default_message(answers)
+
+        return self.render_message(self.get_message_fields(answers)).rstrip()
+
+    def render_default_message(self, answers: dict) -> str:
+        """The message of `DEFAULT_COMMIT_MESSAGE_TEMPLATE`, rendered directly."""
+        get = answers.get
+
+        jira_project_key = get('jira_project_key') or self.user_jira_project_key
+        issue_prefix = f"{jira_project_key}-" if jira_project_key else ''  # fmt: skip
+
+        commit_scope = get('commit_scope', '').strip()
+        commit_scope = f"({commit_scope})" if commit_scope else ''  # fmt: skip
+        commit_title = get('commit_title')
+        commit_title = (commit_title[:1].lower() + commit_title[1:]).strip().rstrip('.')
+        commit_description = get('commit_description')
+
+        if get('is_breaking_change'):
+            breaking_change_sign = '!'
+            body = f"BREAKING CHANGE: {commit_description}" if commit_description else 'BREAKING CHANGE'  # fmt: skip
+        else:
+            breaking_change_sign = ''
+            body = commit_description or ''
+
+        # fmt: off
+        message = (
+            f"{get('commit_type')}{commit_scope}{breaking_change_sign}: "
+            f"{commit_title} [{issue_prefix}{get('issue_number')}]\n\n{body}"
+        )
         # fmt: on
 
-        if commit_description:
-            if is_breaking_change:
-                commit_message += f"\n\n{breaking_change_text}: {commit_description}"  # fmt: skip
-            else:
-                commit_message += f"\n\n{commit_description}"  # fmt: skip
+        issue_links = self._get_issue_links(issue_prefix, answers)[3]
+
+        if issue_links:
+            message = f"{message}\n\n{issue_links}"  # fmt: skip
+
+        footer = get('footer')
+
+        if footer:
+            message = f"{message}\n\n{footer}"  # fmt: skip
+
+        return message.rstrip()
+
+    def get_message_fields(self, answers: dict) -> dict:
+        """Fields available to `commit_message_template`, built from the answers."""
+        get = answers.get
+
+        jira_project_key = str(
+            get('jira_project_key') or self.user_jira_project_key or ''
+        )
+        issue_prefix = f"{jira_project_key}-" if jira_project_key else ''  # fmt: skip
+        issue_epic, issue_subtasks, issue_related_tasks, issue_links = (
+            self._get_issue_links(issue_prefix, answers)
+        )
+
+        commit_title = get('commit_title')
+        commit_title = (commit_title[:1].lower() + commit_title[1:]).strip().rstrip('.')
+
+        commit_description = get('commit_description') or ''
+        is_breaking_change = get('is_breaking_change')
+        breaking_change_text = 'BREAKING CHANGE' if is_breaking_change else ''
+
+        if commit_description and is_breaking_change:
+            body = f"{breaking_change_text}: {commit_description}"  # fmt: skip
         else:
-            commit_message += f"\n\n{breaking_change_text}"  # fmt: skip
+            body = commit_description or breaking_change_text
+
+        return {
+            'jira_project_key': jira_project_key,
+            'issue': f'{issue_prefix}{get("issue_number")}',  # fmt: skip
+            'issue_number': f'{get("issue_number")}',  # fmt: skip
+            'issue_epic': issue_epic,
+            'issue_epic_number': f'{get("issue_epic_number") or ""}',  # fmt: skip
+            'issue_subtasks': issue_subtasks,
+            'issue_related_tasks': issue_related_tasks,
+            'issue_links': issue_links,
+            'commit_type': f'{get("commit_type")}',  # fmt: skip
+            'commit_scope': get('commit_scope', '').strip(),
+            'breaking_change_sign': '!' if is_breaking_change else '',
+            'breaking_change_text': breaking_change_text,
+            'commit_title': commit_title,
+            'commit_description': f'{commit_description}',  # fmt: skip
+            'body': f'{body}',  # fmt: skip
+            'footer': f'{get("footer") or ""}',  # fmt: skip
+        }
+
+    @classmethod
+    def _get_issue_links(cls, issue_prefix: str, answers: dict) -> tuple:
+        """`(epic, subtasks, related tasks, lines)`: the prefixed issues and the
+        `issue ...: [...]` footer lines of the message, `''` when not given."""
+        get = answers.get
+        issue_epic_number = get('issue_epic_number')
+        issue_subtasks = get('issue_subtasks')
+        issue_related_tasks = get('issue_related_tasks')
+
+        if not (issue_epic_number or issue_subtasks or issue_related_tasks):
+            return '', '', '', ''
+
+        issue_links = []
 
         if issue_epic_number:
-            commit_message += f"\n\nissue epic: [{jira_project_key}{issue_epic_number}]"  # fmt: skip
+            issue_epic = f"{issue_prefix}{issue_epic_number}"  # fmt: skip
+            issue_links.append(f"issue epic: [{issue_epic}]")  # fmt: skip
+        else:
+            issue_epic = ''
 
         if issue_subtasks:
-            issue_subtasks = [task.strip() for task in issue_subtasks.split(',')]
-            issue_subtasks = list(OrderedDict.fromkeys(issue_subtasks))
-            subtasks_list = [f"{jira_project_key}{task.strip()}" for task in issue_subtasks]  # fmt: skip
-
-            if issue_epic_number:
-                commit_message += f"\nissue subtasks: [{', '.join(subtasks_list)}]"  # fmt: skip
-            else:
-                commit_message += f"\n\nissue subtasks: [{', '.join(subtasks_list)}]"  # fmt: skip
+            issue_subtasks = cls._join_issues(issue_prefix, issue_subtasks)
+            issue_links.append(f"issue subtasks: [{issue_subtasks}]")  # fmt: skip
+        else:
+            issue_subtasks = ''
 
         if issue_related_tasks:
-            issue_related_tasks = [
-                task.strip() for task in issue_related_tasks.split(',')
-            ]
-            issue_related_tasks = list(OrderedDict.fromkeys(issue_related_tasks))
-            related_tasks_list = [f"{jira_project_key}{task.strip()}" for task in issue_related_tasks]  # fmt: skip
+            issue_related_tasks = cls._join_issues(issue_prefix, issue_related_tasks)
+            issue_links.append(f"issue related tasks: [{issue_related_tasks}]")  # fmt: skip
+        else:
+            issue_related_tasks = ''
 
-            if issue_epic_number or issue_subtasks:
-                commit_message += f"\nissue related tasks: [{', '.join(related_tasks_list)}]"  # fmt: skip
-            else:
-                commit_message += f"\n\nissue related tasks: [{', '.join(related_tasks_list)}]"  # fmt: skip
+        return issue_epic, issue_subtasks, issue_related_tasks, '\n'.join(issue_links)
 
-        if footer:
-            commit_message += f"\n\n{footer}"  # fmt: skip
+    @staticmethod
+    def _join_issues(issue_prefix: str, issues: str) -> str:
+        """`'1, 2,1'` gives `'DEV-1, DEV-2'`: prefixed, in order and without repeats."""
+        issues = dict.fromkeys([issue.strip() for issue in issues.split(',')])
 
-        return commit_message.rstrip()
+        return ', '.join([f"{issue_prefix}{issue}" for issue in issues])  # fmt: skip
 
     def example(self) -> str:
         """Provide an example to help understand the style (OPTIONAL)
@@ -314,26 +724,66 @@ class CzBitbucketJiraPlugin(BaseCommitizen):
         """
         return 'We use this because is useful'
 
+    def find_increment(self, commits: Iterable[git.GitCommit]) -> Optional[str]:
+        """Version increment of the commits, same as Commitizen's
+        `bump.find_increment` with `bump_pattern` and `bump_map`, but stopping at
+        the first commit with the highest increment."""
+        return self.bump_classifier.find_increment(commit.message for commit in commits)
+
     def changelog_message_builder_hook(self, parsed_message: dict, commit: git.GitCommit):
-        if parsed_message.get('change_type') == 'BREAKING CHANGE':
-            return False
+        issue_summary = None
 
-        if parsed_message.get('breaking'):
-            parsed_message['change_type'] = 'BREAKING CHANGE'
+        if self.user_changelog_issue_summaries:
+            issue_id = split_issue_id(parsed_message.get('message'))[1]
 
-        issue_id_pattern = re.compile(r'\[([^\[\]]*)\](?!.*\[)')
+            if issue_id:
+                if issue_id not in self._prefetched_issue_ids:
+                    self._prefetch_history_issues(commit.rev, issue_id)
 
-        commit_hash = commit.rev[:7]
-        message = parsed_message.get('message')
-        message_without_issue_id = issue_id_pattern.sub('', message).strip()
+                issue_summary = self.get_issue_summaries([issue_id]).get(issue_id)
 
-        issue_id = issue_id_pattern.search(message).group(1)
+        return render_entry(
+            parsed_message, commit.rev, self.jira_browse_url, issue_summary
+        )
 
-        # fmt: off
-        parsed_message['message'] = (
-            f"{message_without_issue_id} "
-            f"[{issue_id}]({self.jira_base_url}/browse/{issue_id}) ({commit_hash})"
+    def render_changelog_entries(
+        self,
+        commits: Iterable[git.GitCommit],
+        workers: Optional[int] = None,
+        executor: Optional[str] = None,
+        chunk_size: int = 2_000,
+        serial_threshold: int = 20_000,
+    ) -> List[Optional[dict]]:
+        """Render the changelog entry of many commits at once, in their order.
+
+        Large inputs are spread in chunks over a process (or thread) pool, set by
+        `changelog_workers` and `changelog_executor` in the config file. Commits
+        whose title doesn't follow the convention give a `None` entry.
+        """
+        settings = self.config.settings
+        records = (
+            (commit.rev, commit.message, commit.author, commit.author_email)
+            for commit in commits
         )
-        # fmt: on
+        issue_summaries = None
+
+        if self.user_changelog_issue_summaries:
+            records = list(records)
+            issue_summaries = self.get_issue_summaries(
+                issue_id
+                for issue_id in (
+                    split_issue_id(record[1].partition('\n')[0])[1] for record in records
+                )
+                if issue_id
+            )
 
-        return parsed_message
+        return render_records_in_pool(
+            commit_parser=self.commit_parser,
+            jira_browse_url=self.jira_browse_url,
+            records=records,
+            issue_summaries=issue_summaries,
+            workers=workers or settings.get('changelog_workers'),
+            executor=executor or settings.get('changelog_executor', 'process'),
+            chunk_size=chunk_size,
+            serial_threshold=serial_threshold,
+        )
@@ -0,0 +1,136 @@
+"""Non-interactive rendering of many commit messages, from structured answers.
+
+Records are read, validated and rendered one at a time, so memory stays bounded
+no matter how many records the input has.
+"""
+
+from __future__ import annotations
+
+import csv
+import inspect
+import json
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from prompt_toolkit.validation import ValidationError
+
+
+TRUE_VALUES = ('1', 'true', 't', 'yes', 'y')
+
+INPUT_FORMATS = ('jsonl', 'csv')
+
+
+class RenderedMessage(NamedTuple):
+    record: int
+    message: Optional[str]
+    errors: List[str]
+
+
+def read_answer_records(file: IO[str], input_format: str = 'jsonl') -> Iterator[dict]:
+    """Yield each answer record of a JSONL or CSV file, one at a time.
+
+    A JSONL line that isn't valid JSON is yielded as a `ValueError`, so the
+    caller can report it without stopping the stream.
+    """
+    if input_format == 'csv':
+        yield from csv.DictReader(file)
+        return
+
+    if input_format != 'jsonl':
+        raise ValueError(f"Unknown input format {input_format!r}, use one of: {', '.join(INPUT_FORMATS)}")  # fmt: skip
+
+    for line in file:
+        if not line.strip():
+            continue
+
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            yield ValueError(f"Invalid JSON: {error}")  # fmt: skip
+
+
+def normalize_answers(answers: dict, questions: list) -> dict:
+    """Convert the raw values of a record (e.g.: CSV strings, JSON numbers) to the
+    types the prompt would have returned."""
+    normalized = dict(answers)
+
+    for question in questions:
+        name = question['name']
+        value = answers.get(name)
+
+        if question['type'] == 'confirm':
+            if isinstance(value, str):
+                value = value.strip().lower() in TRUE_VALUES
+
+            normalized[name] = bool(value)
+        else:
+            normalized[name] = '' if value is None else str(value)
+
+    return normalized
+
+
+def run_validator(validator, answer):
+    if inspect.isclass(validator) or hasattr(validator, 'validate'):
+        return validator.validate(answer)
+
+    return validator(answer)
+
+
+def validate_answers(answers: dict, questions: list) -> List[str]:
+    """Validate the answers with the same validators used by the questions."""
+    errors = []
+
+    for question in questions:
+        name = question['name']
+        validator = question.get('validate')
+
+        if question['type'] == 'select':
+            choices = [choice.get('value') for choice in question['choices']]
+
+            if answers.get(name) not in choices:
+                errors.append(f"{name}: must be one of {', '.join(choices)}.")  # fmt: skip
+
+            continue
+
+        if validator is not None:
+            try:
+                run_validator(validator, answers.get(name))
+            except ValidationError as error:
+                errors.append(f"{name}: {error.message}")  # fmt: skip
+                continue
+
+        # The prompt filters each answer after validating it, before the next
+        # question, a filter may be needed by the next validators.
+        if question.get('filter'):
+            answers[name] = question['filter'](answers.get(name))
+
+    return errors
+
+
+def render_messages(cz, records: Iterable[dict]) -> Iterator[RenderedMessage]:
+    """Validate and render each answer record with `cz.message()`.
+
+    Invalid records yield their errors instead of a message, the stream goes on.
+    """
+    questions = cz.build_questions(interactive=False)
+
+    for index, answers in enumerate(records, start=1):
+        if isinstance(answers, Exception):
+            yield RenderedMessage(index, None, [str(answers)])
+            continue
+
+        if not isinstance(answers, dict):
+            yield RenderedMessage(index, None, ['Record must be an object.'])
+            continue
+
+        answers = normalize_answers(answers, questions)
+        errors = validate_answers(answers, questions)
+
+        if errors:
+            yield RenderedMessage(index, None, errors)
+        else:
+            yield RenderedMessage(index, cz.message(answers), [])
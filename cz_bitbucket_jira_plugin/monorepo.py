@@ -0,0 +1,270 @@
+"""Monorepo mode: components of the repository, each with its own paths, scopes,
+Jira project key and changelog file.
+
+Components are set in the `[tool.commitizen.components.<name>]` tables:
+
+    [tool.commitizen.components.billing]
+    paths = ["services/billing/**", "libs/invoices"]
+    scopes = ["billing"]
+    jira_project_key = "BILL"
+    changelog_file = "services/billing/CHANGELOG.md"
+
+A commit belongs to every component one of its changed files or its scope
+matches. The changelogs of all the components are built from a single read of
+the history, file lists included.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+
+class Component(NamedTuple):
+    name: str
+    paths: Tuple[str, ...]
+    scopes: Tuple[str, ...]
+    jira_project_key: Optional[str]
+    changelog_file: str
+
+
+def _string_tuple(value, name: str, key: str) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        value = [value]
+
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"`components.{name}.{key}` must be a list of strings.")  # fmt: skip
+
+    return tuple(value)
+
+
+def load_components(settings: dict) -> List[Component]:
+    """Components of the `components` table of the settings, in config order.
+
+    Raise `ValueError` if a component is malformed.
+    """
+    components = []
+
+    for name, table in (settings.get('components') or {}).items():
+        if not isinstance(table, dict):
+            raise ValueError(f"`components.{name}` must be a table.")  # fmt: skip
+
+        paths = _string_tuple(table.get('paths', []), name, 'paths')
+        scopes = _string_tuple(table.get('scopes', []), name, 'scopes')
+
+        if not paths and not scopes:
+            raise ValueError(f"`components.{name}` needs `paths` or `scopes`.")  # fmt: skip
+
+        components.append(
+            Component(
+                name=name,
+                paths=paths,
+                scopes=scopes,
+                jira_project_key=table.get('jira_project_key'),
+                changelog_file=table.get('changelog_file')
+                or f'{name}/CHANGELOG.md',  # fmt: skip
+            )
+        )
+
+    return components
+
+
+def glob_to_regex(glob: str) -> str:
+    """Regex of a path glob: `*` and `?` don't match `/`, `**` matches any number
+    of directories. A glob without wildcards matches that path and everything
+    below it.
+    """
+    glob = glob.strip('/')
+
+    if '*' not in glob and '?' not in glob:
+        return re.escape(glob) + '(?:/.*)?'
+
+    parts = []
+    index = 0
+
+    while index < len(glob):
+        if glob.startswith('**/', index):
+            parts.append('(?:.*/)?')
+            index += 3
+        elif glob.startswith('**', index):
+            parts.append('.*')
+            index += 2
+        elif glob[index] == '*':
+            parts.append('[^/]*')
+            index += 1
+        elif glob[index] == '?':
+            parts.append('[^/]')
+            index += 1
+        else:
+            parts.append(re.escape(glob[index]))
+            index += 1
+
+    return ''.join(parts)
+
+
+class ComponentMatcher:
+    """Find the components of paths and commits.
+
+    Each component is a single pattern, the alternation of its globs, and each
+    distinct path is matched once against all of them.
+    """
+
+    def __init__(self, components: Iterable[Component], cache_size: int = 65_536):
+        self.components = list(components)
+        self.path_patterns = [
+            re.compile(
+                '|'.join(f'(?:{glob_to_regex(glob)})' for glob in component.paths)
+            )  # fmt: skip
+            if component.paths
+            else None
+            for component in self.components
+        ]
+        self.scopes: Dict[str, Tuple[int, ...]] = {}
+
+        for position, component in enumerate(self.components):
+            for scope in component.scopes:
+                self.scopes[scope] = self.scopes.get(scope, ()) + (position,)
+
+        self.match_path = lru_cache(maxsize=cache_size)(self._match_path)
+
+    def _match_path(self, path: str) -> Tuple[int, ...]:
+        return tuple(
+            position
+            for position, pattern in enumerate(self.path_patterns)
+            if pattern is not None and pattern.fullmatch(path)
+        )
+
+    def match(self, paths: Iterable[str], scope: str | None = None) -> set[int]:
+        """Positions of the components matched by the paths or the scope."""
+        positions = set(self.scopes.get(scope, ())) if scope else set()
+
+        for path in paths:
+            positions.update(self.match_path(path))
+
+        return positions
+
+    def get_project_keys(self, paths: Iterable[str]) -> set[str]:
+        """Jira project keys of the components the paths belong to."""
+        return {
+            self.components[position].jira_project_key
+            for position in self.match(paths)
+            if self.components[position].jira_project_key
+        }
+
+
+# Fields of the `git log` read, in the order `GitCommit` takes them
+HISTORY_FIELDS = ('rev', 'title', 'body', 'author', 'author_email')
+
+
+def split_history(
+    matcher: ComponentMatcher,
+    commit_parser_pattern: re.Pattern,
+    history: Iterable[tuple],
+) -> List[list]:
+    """Spread the `(fields, paths)` of the history over the components: a list
+    of `GitCommit` for each component, in history order."""
+    from commitizen.git import GitCommit
+
+    commits: List[list] = [[] for _ in matcher.components]
+
+    for (rev, title, body, author, author_email), paths in history:
+        parsed = commit_parser_pattern.match(title)
+        scope = parsed.groupdict().get('scope') if parsed else None
+        positions = matcher.match(paths, scope)
+
+        if not positions:
+            continue
+
+        commit = GitCommit(
+            rev=rev,
+            title=title.strip(),
+            body=body.strip(),
+            author=author,
+            author_email=author_email,
+        )
+
+        for position in positions:
+            commits[position].append(commit)
+
+    return commits
+
+
+def render_component_changelogs(
+    cz,
+    rev_range: str | None = None,
+) -> Dict[Component, str]:
+    """Changelog of each component of the plugin, from one read of the history
+    of the repository of the current directory.
+
+    Each changelog is built like `cz changelog` builds the repository one, with
+    the same tags, template and hooks, from the commits of its component.
+    """
+    from commitizen import changelog
+    from commitizen import git
+    from commitizen.changelog_formats import get_changelog_format
+    from commitizen.version_schemes import get_version_scheme
+
+    from .git_log import iter_git_log_paths
+
+    config = cz.config
+    settings = config.settings
+    matcher = cz.get_component_matcher()
+    scheme = get_version_scheme(config)
+    tags = changelog.get_version_tags(scheme, git.get_tags(), settings['tag_format'])
+    history = iter_git_log_paths(
+        rev_range, fields=HISTORY_FIELDS, extra_args=('--topo-order',)
+    )
+    component_commits = split_history(matcher, cz.commit_parser_pattern, history)
+
+    extras = {**cz.template_extras, **(settings.get('extras') or {})}
+    change_type_order = settings.get('change_type_order') or cz.change_type_order
+    changelogs = {}
+
+    for component, commits in zip(matcher.components, component_commits):
+        template = (
+            settings.get('template')
+            or get_changelog_format(config, component.changelog_file).template
+        )
+        tree = changelog.generate_tree_from_commits(
+            commits,
+            tags,
+            cz.commit_parser,
+            cz.changelog_pattern,
+            change_type_map=settings.get('change_type_map') or cz.change_type_map,
+            changelog_message_builder_hook=cz.changelog_message_builder_hook,
+            merge_prerelease=settings.get('changelog_merge_prerelease') or False,
+            scheme=scheme,
+        )
+
+        if change_type_order:
+            tree = changelog.order_changelog_tree(tree, change_type_order)
+
+        changelogs[component] = changelog.render_changelog(
+            tree, loader=cz.template_loader, template=template, **extras
+        ).lstrip('\n')
+
+    return changelogs
+
+
+def write_component_changelogs(
+    cz,
+    rev_range: str | None = None,
+) -> List[Path]:
+    """Write the changelog file of each component and return their paths."""
+    written = []
+    encoding = cz.config.settings.get('encoding') or 'utf-8'
+
+    for component, text in render_component_changelogs(cz, rev_range).items():
+        path = Path(component.changelog_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding=encoding)
+        written.append(path)
+
+    return written
@@ -0,0 +1,395 @@
+"""Changelog of a product made of many repositories that use the plugin.
+
+The history of each repository is read by its own `git log` subprocess, from a
+pool of threads, and parsed with the rules of the plugin (commit types and
+`changelog_type_map`). Entries are then merged: grouped by day and section,
+newest first, and an issue changed in several repositories (or commits) is a
+single entry, listing all of them.
+
+The entries of each repository are cached by its `HEAD` revision, the range
+and the plugin rules: a repository that didn't change isn't read again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .functions import get_cache_dir
+from .git_log import GitLogError
+from .git_log import iter_git_log
+from .parsers import compile_commit_parser
+from .parsers import split_issue_id
+
+
+OUTPUT_FORMATS = ('markdown', 'json')
+
+# Bump it whenever the cached entries change, so old caches are discarded.
+CACHE_FORMAT_VERSION = 1
+
+
+class Repository(NamedTuple):
+    name: str
+    path: Path
+    rev_range: Optional[str] = None
+
+
+class RepositoryEntry(NamedTuple):
+    repository: str
+    rev: str
+    timestamp: int
+    section: str
+    scope: Optional[str]
+    title: str
+    issue: Optional[str]
+
+
+class MergedEntry(NamedTuple):
+    date: str
+    section: str
+    scope: Optional[str]
+    title: str
+    issue: Optional[str]
+    # `(repository, rev)` of every commit of the entry, newest first
+    refs: Tuple[Tuple[str, str], ...]
+
+
+def load_repositories(settings: dict, base_path: Path | None = None) -> List[Repository]:
+    """Repositories of the `repositories` setting: paths, or tables with a `path`,
+    an optional `rev_range` and an optional `name` (default: the directory name).
+
+    Relative paths are relative to `base_path`. Raise `ValueError` if an item is
+    malformed.
+    """
+    repositories = []
+
+    for item in settings.get('repositories') or []:
+        if isinstance(item, str):
+            item = {'path': item}
+
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise ValueError(f"Each of `repositories` must be a path or a table with a `path`, got {item!r}.")  # fmt: skip
+
+        path = Path(item['path']).expanduser()
+
+        if not path.is_absolute() and base_path is not None:
+            path = base_path / path
+
+        repositories.append(
+            Repository(item.get('name') or path.name, path, item.get('rev_range'))
+        )
+
+    return repositories
+
+
+def get_range_tips(path: Path, rev_range: Optional[str] = None) -> Optional[tuple]:
+    """Commits the revision range (default: `HEAD`) resolves to, the excluded
+    ones included (e.g.: `v1.0..main` gives `main` and `^v1.0`), or `None`."""
+    result = subprocess.run(
+        ['git', 'rev-parse', rev_range or 'HEAD', '--'],
+        cwd=path,
+        capture_output=True,
+        text=True,
+    )
+
+    return tuple(result.stdout.split()[:-1]) if result.returncode == 0 else None
+
+
+def parse_repository_log(
+    repository: Repository,
+    commits: Iterable[Tuple[str, str, str]],
+    commit_parser: str,
+    change_type_map: Mapping[str, str],
+) -> List[RepositoryEntry]:
+    """Entries of the `(rev, commit timestamp, title)` commits of a repository.
+
+    Titles that don't follow the convention, and types that aren't on
+    `change_type_map` (breaking changes apart), are left out.
+    """
+    match = compile_commit_parser(commit_parser).match
+    entries = []
+
+    for rev, timestamp, title in commits:
+        parsed = match(title)
+
+        if parsed is None:
+            continue
+
+        change_type = parsed.group('change_type')
+
+        if parsed.group('breaking'):
+            section = 'BREAKING CHANGE'
+        elif change_type in change_type_map:
+            section = change_type_map[change_type]
+        else:
+            continue
+
+        message, issue = split_issue_id(parsed.group('message') or '')
+        entries.append(
+            RepositoryEntry(
+                repository.name,
+                rev,
+                int(timestamp),
+                section,
+                parsed.group('scope') or None,
+                message,
+                issue.upper() if issue else None,
+            )
+        )
+
+    return entries
+
+
+def get_config_fingerprint(
+    jira_base_url: str, change_type_map, commit_types, **extra
+) -> str:
+    """Fingerprint of the plugin settings that affect the cached entries."""
+    payload = json.dumps(
+        {
+            'version': CACHE_FORMAT_VERSION,
+            'jira_base_url': jira_base_url,
+            'change_type_map': change_type_map,
+            'commit_types': commit_types,
+            **extra,
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class RepositoryEntryCache:
+    """Entries of a repository, stored with the key they were read for."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    @classmethod
+    def for_repository(cls, repository: Path):
+        digest = hashlib.sha1(str(Path(repository).resolve()).encode()).hexdigest()
+
+        return cls(get_cache_dir() / 'repositories' / f"{digest}.pickle")  # fmt: skip
+
+    def get(self, key: tuple) -> Optional[List[RepositoryEntry]]:
+        try:
+            with open(self.path, mode='rb') as file:
+                data = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+
+        return data['entries'] if data.get('key') == key else None
+
+    def set(self, key: tuple, entries: List[RepositoryEntry]) -> None:
+        # Written right away: each repository is read by its own thread
+        temp_path = self.path.with_suffix(f".{os.getpid()}.tmp")  # fmt: skip
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(temp_path, mode='wb') as file:
+                pickle.dump(
+                    {'key': key, 'entries': entries},
+                    file,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+
+def read_repository(
+    repository: Repository,
+    commit_parser: str,
+    change_type_map: Mapping[str, str],
+    fingerprint: str = '',
+    use_cache: bool = True,
+) -> List[RepositoryEntry]:
+    """Entries of one repository, from the cache if its range didn't move.
+
+    Raise `GitLogError` if the history can't be read.
+    """
+    if not Path(repository.path).is_dir():
+        raise GitLogError(f"{repository.path}: not a directory")  # fmt: skip
+
+    cache = key = None
+
+    if use_cache:
+        tips = get_range_tips(repository.path, repository.rev_range)
+
+        if tips is not None:
+            cache = RepositoryEntryCache.for_repository(repository.path)
+            key = (tips, repository.rev_range, repository.name, fingerprint)
+            entries = cache.get(key)
+
+            if entries is not None:
+                return entries
+
+    commits = iter_git_log(
+        repository.rev_range,
+        fields=('rev', 'commit_timestamp', 'title'),
+        cwd=repository.path,
+    )
+    entries = parse_repository_log(repository, commits, commit_parser, change_type_map)
+
+    if cache is not None:
+        cache.set(key, entries)
+
+    return entries
+
+
+def read_repositories(
+    repositories: Sequence[Repository],
+    commit_parser: str,
+    change_type_map: Mapping[str, str],
+    fingerprint: str = '',
+    use_cache: bool = True,
+    workers: int | None = None,
+) -> List[List[RepositoryEntry]]:
+    """Entries of each repository, in order, read by a pool of threads.
+
+    The threads mostly wait on their `git` subprocess, so the histories are
+    read concurrently.
+    """
+    workers = workers or min(len(repositories), (os.cpu_count() or 1) * 2, 32)
+
+    def read(repository: Repository) -> List[RepositoryEntry]:
+        return read_repository(
+            repository, commit_parser, change_type_map, fingerprint, use_cache
+        )
+
+    if workers <= 1 or len(repositories) <= 1:
+        return [read(repository) for repository in repositories]
+
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(read, repositories))
+
+
+def merge_entries(entry_lists: Iterable[List[RepositoryEntry]]) -> List[MergedEntry]:
+    """Merge the entries of all the repositories, newest first.
+
+    Entries of the same issue (and section) are merged into the newest one,
+    which keeps the refs of all of them. Entries without an issue are never
+    merged.
+    """
+    entries = sorted(
+        (entry for entries in entry_lists for entry in entries),
+        key=lambda entry: entry.timestamp,
+        reverse=True,
+    )
+    merged: Dict[tuple, list] = {}
+
+    for entry in entries:
+        key = (
+            (entry.section, entry.issue)
+            if entry.issue
+            else (entry.repository, entry.rev, entry.section)
+        )
+        item = merged.get(key)
+
+        if item is None:
+            merged[key] = [entry, [(entry.repository, entry.rev)]]
+        else:
+            item[1].append((entry.repository, entry.rev))
+
+    return [
+        MergedEntry(
+            time.strftime('%Y-%m-%d', time.gmtime(entry.timestamp)),
+            entry.section,
+            entry.scope,
+            entry.title,
+            entry.issue,
+            tuple(dict.fromkeys(refs)),
+        )
+        for entry, refs in merged.values()
+    ]
+
+
+def render_markdown(
+    entries: Sequence[MergedEntry],
+    jira_browse_url: str,
+    change_type_order: Iterable[str] = (),
+) -> Iterator[str]:
+    """Yield the Markdown lines of merged entries: a heading per day, then per
+    section in `change_type_order`."""
+    order = {section: position for position, section in enumerate(change_type_order)}
+    days: Dict[str, Dict[str, List[MergedEntry]]] = {}
+
+    for entry in entries:
+        days.setdefault(entry.date, {}).setdefault(entry.section, []).append(entry)
+
+    for day, sections in days.items():
+        yield f"## {day}\n"  # fmt: skip
+
+        for section in sorted(sections, key=lambda name: order.get(name, len(order))):
+            yield '\n'
+            yield f"### {section}\n"  # fmt: skip
+            yield '\n'
+
+            for entry in sections[section]:
+                refs = ', '.join(f"{name}@{rev[:7]}" for name, rev in entry.refs)  # fmt: skip
+                scope = f"**{entry.scope}**: " if entry.scope else ''  # fmt: skip
+
+                if entry.issue:
+                    yield f"- {scope}{entry.title} [{entry.issue}]({jira_browse_url}{entry.issue}) ({refs})\n"  # fmt: skip
+                else:
+                    yield f"- {scope}{entry.title} ({refs})\n"  # fmt: skip
+
+        yield '\n'
+
+
+def write_aggregated_changelog(
+    cz,
+    repositories: Sequence[Repository],
+    output: IO[str],
+    output_format: str = 'markdown',
+    workers: int | None = None,
+    use_cache: bool = True,
+) -> List[MergedEntry]:
+    """Write the merged changelog of `repositories` with the rules of the plugin,
+    as Markdown or as a JSON list of entries."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}, use one of: {', '.join(OUTPUT_FORMATS)}")  # fmt: skip
+
+    fingerprint = get_config_fingerprint(
+        jira_base_url=cz.jira_base_url,
+        change_type_map=cz.change_type_map,
+        commit_types=cz.commit_types,
+    )
+    entries = merge_entries(
+        read_repositories(
+            repositories,
+            cz.commit_parser,
+            cz.change_type_map,
+            fingerprint,
+            use_cache=use_cache,
+            workers=workers,
+        )
+    )
+
+    if output_format == 'json':
+        json.dump([entry._asdict() for entry in entries], output, indent=2)
+        output.write('\n')
+    else:
+        output.writelines(
+            render_markdown(entries, cz.jira_browse_url, cz.change_type_order)
+        )
+
+    return entries
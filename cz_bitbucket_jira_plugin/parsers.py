@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
+
+# A Jira project key (`DEV`, `MY-PRJ`), and a full issue key: `(project, number)`
+# groups. Each `-` is followed by a letter in the project, a digit in the number.
+PROJECT_KEY = r'[A-Za-z][A-Za-z0-9_]*(?:-[A-Za-z][A-Za-z0-9_]*)*'
+ISSUE_KEY_PATTERN = re.compile(rf'({PROJECT_KEY})-([0-9]+)')
+
+
+def split_issue_key(key: str) -> tuple[str, int]:
+    """`'dev-12'` gives `('DEV', 12)`. Raise `ValueError` if it isn't an issue key."""
+    match = ISSUE_KEY_PATTERN.fullmatch(key.strip())
+
+    if match is None:
+        raise ValueError(f"Invalid issue key {key!r}")  # fmt: skip
+
+    return match.group(1).upper(), int(match.group(2))
+
+
+def split_issue_id(title: str) -> tuple[str, str | None]:
+    """Split a commit title into the title itself and its trailing issue id.
+
+    The issue id is the content of the last `[...]` group of the title, as long
+    as no other `[` follows it. `'feat: add x [DEV-1]'` gives
+    `('feat: add x', 'DEV-1')`. It's equivalent to the
+    `\\[([^\\[\\]]*)\\](?!.*\\[)` pattern, but runs in a single linear scan.
+    """
+    start = title.rfind('[')
+
+    if start == -1:
+        return title.strip(), None
+
+    end = title.find(']', start)
+
+    if end == -1:
+        return title.strip(), None
+
+    return (title[:start] + title[end + 1 :]).strip(), title[start + 1 : end]
+
+
+# The `issue epic:`, `issue subtasks:` and `issue related tasks:` lines written
+# by `message()`, all found in one scan of the body: `(name, keys)` groups
+ISSUE_FOOTER_PATTERN = re.compile(
+    r'^(issue epic|issue subtasks|issue related tasks): \[([^\[\]\n]*)\][ \t]*$',
+    re.MULTILINE,
+)
+
+
+def build_alternation(values: Iterable[str]) -> str:
+    """Build a regex alternation matching exactly the given literal values.
+
+    The values are factored by their common prefixes (like a trie), so
+    `['feat-ui', 'feat-api', 'fix']` gives `(?:f(?:eat\\-(?:api|ui)|ix))`
+    instead of `feat\\-ui|feat\\-api|fix`. The regex engine tests each
+    shared prefix once, no matter how many values share it.
+    """
+    trie: dict = {}
+
+    for value in values:
+        node = trie
+
+        for char in value:
+            node = node.setdefault(char, {})
+
+        node[''] = {}
+
+    branches = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(trie.items())
+        if char
+    ]
+
+    return f"(?:{'|'.join(branches)})"  # fmt: skip
+
+
+def _trie_to_regex(node: dict) -> str:
+    is_leaf = '' in node
+    branches = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+
+    if not branches:
+        return ''
+
+    if len(branches) == 1 and not is_leaf:
+        return branches[0]
+
+    if len(branches) == 1 and len(branches[0]) == 1:
+        return f"{branches[0]}?"  # fmt: skip
+
+    # Longer values are tried first, the end of a shorter value is optional
+    return f"(?:{'|'.join(branches)}){'?' if is_leaf else ''}"  # fmt: skip
+
+
+@lru_cache(maxsize=None)
+def build_commit_parser(commit_types: tuple[str, ...]) -> str:
+    """Build the `commit_parser` pattern for the given commit type values.
+
+    Memoized, instances sharing the same commit types share the same string.
+    """
+    change_types = build_alternation(commit_types + ('BREAKING CHANGE',))
+
+    # fmt: off
+    return (
+        fr"^((?P<change_type>{change_types})"
+        r'(?:\((?P<scope>[^()\r\n]*)\)|\()?(?P<breaking>!)?|\w+!):\s(?P<message>.*)'
+    )
+    # fmt: on
+
+
+@lru_cache(maxsize=None)
+def compile_commit_parser(commit_parser: str) -> re.Pattern:
+    """Compile a `commit_parser` the way Commitizen does, once per process."""
+    return re.compile(commit_parser, re.MULTILINE)
@@ -0,0 +1,74 @@
+"""Chunked, order-preserving fan out of pure functions over worker pools."""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from itertools import chain
+from itertools import islice
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+
+# Executor classes of `concurrent.futures`, imported only when a pool is needed
+EXECUTORS = {'process': 'ProcessPoolExecutor', 'thread': 'ThreadPoolExecutor'}
+
+
+def iter_chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def map_chunks(
+    function: Callable,
+    records: Iterable,
+    *args,
+    workers: int | None = None,
+    executor: str = 'process',
+    chunk_size: int = 2_000,
+    serial_threshold: int = 20_000,
+) -> Iterator:
+    """Yield `function(*args, chunk)` for each chunk of records, in order.
+
+    Inputs smaller than `serial_threshold` run serially, since starting the pool
+    would cost more than it saves. At most `2 * workers` chunks are in flight, so
+    the records are consumed lazily. Closing the generator early cancels the
+    chunks not started yet. For a process pool, `function` must be defined at
+    module level.
+    """
+    workers = workers or os.cpu_count() or 1
+    records = iter(records)
+    head = list(islice(records, serial_threshold)) if workers > 1 else []
+
+    if workers <= 1 or len(head) < serial_threshold:
+        for chunk in iter_chunks(chain(head, records), chunk_size):
+            yield function(*args, chunk)
+
+        return
+
+    try:
+        executor_class_name = EXECUTORS[executor]
+    except KeyError:
+        raise ValueError(f"Unknown executor {executor!r}, use one of: {', '.join(EXECUTORS)}")  # fmt: skip
+
+    import concurrent.futures
+
+    executor_class = getattr(concurrent.futures, executor_class_name)
+    pending = deque()
+
+    with executor_class(max_workers=workers) as pool:
+        try:
+            for chunk in iter_chunks(chain(head, records), chunk_size):
+                pending.append(pool.submit(function, *args, chunk))
+
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
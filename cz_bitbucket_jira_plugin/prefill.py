@@ -0,0 +1,144 @@
+"""Answers of `cz commit` guessed from the current branch and its last commits.
+
+The issue key usually is in the branch name (`feature/DEV-1234-login`), and the
+previous commits of that issue give the epic, the subtasks, the related tasks
+and the scope, from the footers written by `message()`. The branch and its
+history are read with a single `git log` call, bounded in time so the prompt
+never waits on a huge repository, and only once per process.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .parsers import compile_commit_parser
+from .parsers import ISSUE_FOOTER_PATTERN
+from .parsers import split_issue_id
+from .parsers import split_issue_key
+
+
+HISTORY_SIZE = 20
+TIMEOUT = 0.5
+
+# Jira keys are upper-cased in branch names, so `release-2024` isn't one
+BRANCH_ISSUE_PATTERN = re.compile(r'(?<![A-Za-z0-9_])([A-Z][A-Z0-9_]*)-([0-9]+)')
+
+FOOTER_QUESTIONS = {
+    'issue epic': 'issue_epic_number',
+    'issue subtasks': 'issue_subtasks',
+    'issue related tasks': 'issue_related_tasks',
+}
+
+
+def parse_branch_issue(branch: Optional[str]) -> Optional[Tuple[str, str]]:
+    """`(project key, issue number)` of the first issue key of a branch name."""
+    if not branch:
+        return None
+
+    match = BRANCH_ISSUE_PATTERN.search(branch)
+
+    return (match.group(1), match.group(2)) if match else None
+
+
+def _split_issue(value: str) -> Optional[Tuple[str, int]]:
+    """`(project, number)` of an issue key, `('', number)` of a bare number."""
+    value = value.strip()
+
+    if value.isdigit():
+        return '', int(value)
+
+    try:
+        return split_issue_key(value)
+    except ValueError:
+        return None
+
+
+def guess_answers(
+    branch: Optional[str],
+    commits: List[Tuple[str, str]],
+    commit_parser: str,
+) -> Dict[str, str]:
+    """Answers guessed from the branch name and its `(title, body)` commits,
+    newest first.
+
+    The previous commit of the issue of the branch gives the other answers. If
+    the branch has no issue key, the previous commit gives them all.
+    """
+    answers: Dict[str, str] = {}
+    branch_issue = parse_branch_issue(branch)
+    target = (branch_issue[0], int(branch_issue[1])) if branch_issue else None
+    reference = None
+
+    for title, body in commits:
+        issue = split_issue_id(title)[1]
+        issue = _split_issue(issue) if issue else None
+
+        if target is None or issue == target:
+            reference = (title, body, issue)
+            break
+
+    if target is None and reference is not None and reference[2]:
+        project, number = reference[2]
+
+        if project:
+            branch_issue = (project, str(number))
+
+    if branch_issue is not None:
+        answers['jira_project_key'], answers['issue_number'] = branch_issue
+
+    if reference is None:
+        return answers
+
+    title, body, _ = reference
+    project = branch_issue[0] if branch_issue else ''
+
+    for name, value in ISSUE_FOOTER_PATTERN.findall(body):
+        # The questions take numbers of the project, other projects are left out
+        issues = [_split_issue(key) for key in value.split(',')]
+        numbers = [
+            str(issue[1]) for issue in issues if issue and issue[0] in (project, '')
+        ]
+
+        if numbers:
+            question = FOOTER_QUESTIONS[name]
+            answers[question] = numbers[0] if question == 'issue_epic_number' else ', '.join(numbers)  # fmt: skip
+
+    # A custom `commit_parser` may have no scope
+    parsed = compile_commit_parser(commit_parser).match(title)
+    scope = parsed.groupdict().get('scope') if parsed is not None else None
+
+    if scope:
+        answers['commit_scope'] = scope
+
+    return answers
+
+
+@lru_cache(maxsize=None)
+def _read_answers(
+    cwd: str, commit_parser: str, count: int, timeout: float
+) -> Tuple[Tuple[str, str], ...]:
+    from .git_log import get_branch_history
+
+    branch, commits = get_branch_history(count, cwd=cwd, timeout=timeout)
+
+    return tuple(guess_answers(branch, commits, commit_parser).items())
+
+
+def read_answers(
+    cwd: Optional[str],
+    commit_parser: str,
+    count: int = HISTORY_SIZE,
+    timeout: float = TIMEOUT,
+) -> Dict[str, str]:
+    """Answers guessed from the repository at `cwd`, `{}` if git fails or is too
+    slow. Git is only called once per repository and process."""
+    # The cache is keyed by the repository, not by the current directory
+    cwd = os.path.abspath(cwd or os.getcwd())
+
+    return dict(_read_answers(cwd, commit_parser, count, timeout))
@@ -0,0 +1,206 @@
+"""Opt-in instrumentation of the plugin, to find out where `cz` spends its time.
+
+Enable it with the `CZ_BITBUCKET_JIRA_PROFILE` environment variable (or the
+`profile` config key) set to the output file:
+
+    CZ_BITBUCKET_JIRA_PROFILE=cz-profile.json cz changelog
+
+Each plugin stage (construction, `questions()`, `message()`, each changelog hook
+call...) is timed and counted. At exit the file is written with those stages,
+the hits and misses of the pattern caches and the config file reads, either
+as JSON or, for `*.trace.json` files or `profile_format = "chrome"`, as a Chrome
+trace (open it on `chrome://tracing` or https://ui.perfetto.dev).
+
+When it's disabled nothing is wrapped, the plugin runs its plain methods.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable
+
+
+PROFILE_ENV_VAR = 'CZ_BITBUCKET_JIRA_PROFILE'
+PROFILE_FORMAT_ENV_VAR = 'CZ_BITBUCKET_JIRA_PROFILE_FORMAT'
+PROFILE_FORMATS = ('json', 'chrome')
+
+# Plugin methods timed when profiling, besides the construction
+PLUGIN_STAGES = (
+    'questions',
+    'message',
+    'changelog_message_builder_hook',
+    'render_changelog_entries',
+    'find_increment',
+)
+
+# `lru_cache` factories of the plugin patterns and templates: `(module, function)`.
+# A miss builds the pattern, but `re.compile()` may still answer it from the
+# `re` module cache, so misses aren't regex compilations.
+PATTERN_CACHES = (
+    ('cz_bitbucket_jira_plugin.parsers', 'build_commit_parser'),
+    ('cz_bitbucket_jira_plugin.parsers', 'compile_commit_parser'),
+    ('cz_bitbucket_jira_plugin.templates', 'compile_template'),
+    ('cz_bitbucket_jira_plugin.bump', 'build_bump_classifier'),
+)
+
+# Each call is a trace event; beyond this, calls are only counted
+MAX_TRACE_EVENTS = 100_000
+
+
+class Profiler:
+    def __init__(self, path: str, output_format: str = 'json') -> None:
+        if output_format not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format {output_format!r}, use one of: {', '.join(PROFILE_FORMATS)}")  # fmt: skip
+
+        self.path = path
+        self.output_format = output_format
+        self.origin = time.perf_counter()
+        # name -> [calls, total seconds, max seconds]
+        self.stages: dict[str, list] = {}
+        # (name, start, duration, thread id)
+        self.events: list[tuple[str, float, float, int]] = []
+        self._lock = threading.Lock()
+        atexit.register(self.write)
+
+    def record(self, name: str, start: float, end: float) -> None:
+        duration = end - start
+
+        with self._lock:
+            stage = self.stages.get(name)
+
+            if stage is None:
+                self.stages[name] = [1, duration, duration]
+            else:
+                stage[0] += 1
+                stage[1] += duration
+                stage[2] = max(stage[2], duration)
+
+            if len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append((name, start, duration, threading.get_ident()))
+
+    def wrap(self, name: str, function: Callable) -> Callable:
+        """Return `function`, timed as the `name` stage."""
+        perf_counter = time.perf_counter
+        record = self.record
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, start, perf_counter())
+
+        return wrapper
+
+    def instrument(self, plugin) -> None:
+        """Time the `PLUGIN_STAGES` methods of a plugin instance."""
+        for name in PLUGIN_STAGES:
+            method = getattr(plugin, name, None)
+
+            if method is not None:
+                setattr(plugin, name, self.wrap(f"plugin.{name}", method))  # fmt: skip
+
+    def get_stats(self) -> dict:
+        stages = {
+            name: {
+                'calls': calls,
+                'total_ms': round(total * 1e3, 3),
+                'mean_ms': round(total / calls * 1e3, 6),
+                'max_ms': round(maximum * 1e3, 3),
+            }
+            for name, (calls, total, maximum) in sorted(self.stages.items())
+        }
+        pattern_caches = {}
+
+        # Only modules already imported, profiling must not import anything
+        for module_name, function_name in PATTERN_CACHES:
+            module = sys.modules.get(module_name)
+
+            if module is not None:
+                info = getattr(module, function_name).cache_info()
+                name = f"{module_name.rpartition('.')[2]}.{function_name}"  # fmt: skip
+                pattern_caches[name] = {'misses': info.misses, 'hits': info.hits}
+
+        functions = sys.modules.get('cz_bitbucket_jira_plugin.functions')
+
+        return {
+            'pid': os.getpid(),
+            'argv': sys.argv,
+            'wall_ms': round((time.perf_counter() - self.origin) * 1e3, 3),
+            'stages': stages,
+            'pattern_caches': pattern_caches,
+            'config_files': dict(functions.config_file_reads) if functions else {},
+        }
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = [
+            {
+                'name': name,
+                'cat': name.partition('.')[0],
+                'ph': 'X',
+                'ts': round((start - self.origin) * 1e6, 3),
+                'dur': round(duration * 1e6, 3),
+                'pid': pid,
+                'tid': thread_id,
+            }
+            for name, start, duration, thread_id in self.events
+        ]
+
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': self.get_stats(),
+        }
+
+    def write(self) -> None:
+        data = (
+            self.to_chrome_trace() if self.output_format == 'chrome' else self.get_stats()
+        )
+
+        try:
+            with open(self.path, mode='w', encoding='utf-8') as file:
+                json.dump(data, file, indent=2)
+        except OSError as error:
+            print(f"cz-bitbucket-jira: can't write the profile: {error}", file=sys.stderr)  # fmt: skip
+
+    def close(self) -> None:
+        """Write the output now, instead of at exit."""
+        atexit.unregister(self.write)
+        self.write()
+
+
+_profiler: Profiler | None = None
+
+
+def get_profiler(settings: dict | None = None) -> Profiler | None:
+    """The profiler of this process, or `None` if profiling isn't enabled.
+
+    The environment variables take precedence over the `profile` and
+    `profile_format` config keys.
+    """
+    global _profiler
+
+    if _profiler is None:
+        settings = settings or {}
+        path = os.environ.get(PROFILE_ENV_VAR) or settings.get('profile')
+
+        if not path:
+            return None
+
+        output_format = (
+            os.environ.get(PROFILE_FORMAT_ENV_VAR)
+            or settings.get('profile_format')
+            or ('chrome' if str(path).endswith('.trace.json') else 'json')
+        )
+        _profiler = Profiler(str(path), output_format)
+
+    return _profiler
@@ -0,0 +1,176 @@
+"""Release notes grouped by Jira epic, then by changelog section.
+
+The epic of a commit is its `issue epic: [KEY-N]` line, written by `message()`.
+Commits are read in a single streaming pass: each message is parsed once, title
+and footers, and only its rendered entry line is kept, so memory grows with the
+size of the notes, not with the size of the messages.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+from .changelog import render_entry
+from .parsers import compile_commit_parser
+from .parsers import ISSUE_FOOTER_PATTERN
+
+
+# Commits without an `issue epic:` line
+NO_EPIC = None
+
+
+class ReleaseNotes:
+    """Rendered entries grouped by epic, then by section, in arrival order."""
+
+    def __init__(self) -> None:
+        self.groups: Dict[Optional[str], Dict[str, List[str]]] = {}
+        self.commits = 0
+        self.entries = 0
+
+    def add(self, epic: Optional[str], section: str, entry: str) -> None:
+        sections = self.groups.get(epic)
+
+        if sections is None:
+            sections = self.groups[epic] = {}
+
+        entries = sections.get(section)
+
+        if entries is None:
+            sections[section] = [entry]
+        else:
+            entries.append(entry)
+
+        self.entries += 1
+
+    @property
+    def epics(self) -> List[str]:
+        return [epic for epic in self.groups if epic is not NO_EPIC]
+
+
+def get_epic(body: str) -> Optional[str]:
+    """Key of the `issue epic: [KEY-N]` line of a message body, if any."""
+    for name, keys in ISSUE_FOOTER_PATTERN.findall(body):
+        if name == 'issue epic' and keys.strip():
+            return keys.strip().upper()
+
+    return None
+
+
+def collect_release_notes(
+    commits: Iterable[Tuple[str, str]],
+    commit_parser: str,
+    jira_browse_url: str,
+    change_type_map: Mapping[str, str],
+) -> ReleaseNotes:
+    """Group the `(rev, message)` commits by epic and section.
+
+    Commits whose type isn't on `change_type_map` are left out, except breaking
+    changes, which have their own section.
+    """
+    match = compile_commit_parser(commit_parser).match
+    notes = ReleaseNotes()
+
+    for rev, message in commits:
+        notes.commits += 1
+        title, _, body = message.partition('\n')
+        parsed = match(title)
+
+        if parsed is None:
+            continue
+
+        parsed_message = parsed.groupdict()
+        change_type = parsed_message.get('change_type')
+
+        if change_type not in change_type_map and not parsed_message.get('breaking'):
+            continue
+
+        entry = render_entry(parsed_message, rev, jira_browse_url)
+
+        if not entry:
+            continue
+
+        section = change_type_map.get(entry['change_type'], entry['change_type'])
+        scope = entry.get('scope')
+        line = f"- **{scope}**: {entry['message']}" if scope else f"- {entry['message']}"  # fmt: skip
+        notes.add(get_epic(body) if body else None, section, line)
+
+    return notes
+
+
+def render_release_notes(
+    notes: ReleaseNotes,
+    jira_browse_url: str,
+    change_type_order: Iterable[str] = (),
+    epic_summaries: Optional[Mapping[str, str]] = None,
+    title: Optional[str] = None,
+) -> Iterator[str]:
+    """Yield the Markdown lines of the notes.
+
+    Epics come in the order of their most recent commit, sections in
+    `change_type_order` (the others after them, in arrival order), and the
+    commits without an epic last.
+    """
+    order = {section: position for position, section in enumerate(change_type_order)}
+    epic_summaries = epic_summaries or {}
+
+    if title:
+        yield f"# {title}\n"  # fmt: skip
+        yield '\n'
+
+    epics = notes.epics + ([NO_EPIC] if NO_EPIC in notes.groups else [])
+
+    for epic in epics:
+        if epic is NO_EPIC:
+            yield '## Other changes\n'
+        elif epic in epic_summaries:
+            yield f"## {epic_summaries[epic]} ([{epic}]({jira_browse_url}{epic}))\n"  # fmt: skip
+        else:
+            yield f"## [{epic}]({jira_browse_url}{epic})\n"  # fmt: skip
+
+        sections = notes.groups[epic]
+
+        for section in sorted(sections, key=lambda name: order.get(name, len(order))):
+            yield '\n'
+            yield f"### {section}\n"  # fmt: skip
+            yield '\n'
+
+            for line in sections[section]:
+                yield f"{line}\n"  # fmt: skip
+
+        yield '\n'
+
+
+def write_release_notes(
+    cz, output, rev_range: str | None = None, title: Optional[str] = None
+) -> ReleaseNotes:
+    """Write the release notes of `rev_range` with the settings of the plugin.
+
+    With `changelog_issue_summaries`, the epics are titled with their Jira
+    summaries, looked up in one batch.
+    """
+    from .git_log import iter_git_log
+
+    notes = collect_release_notes(
+        iter_git_log(rev_range, fields=('rev', 'message')),
+        cz.commit_parser,
+        cz.jira_browse_url,
+        cz.change_type_map,
+    )
+    epic_summaries = None
+
+    if cz.user_changelog_issue_summaries and notes.epics:
+        epic_summaries = cz.get_issue_summaries(notes.epics)
+
+    output.writelines(
+        render_release_notes(
+            notes, cz.jira_browse_url, cz.change_type_order, epic_summaries, title
+        )
+    )
+
+    return notes
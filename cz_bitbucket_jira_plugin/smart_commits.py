@@ -0,0 +1,323 @@
+"""Bitbucket/Jira Smart Commit commands, and their totals per issue.
+
+A Smart Commit line starts with one or more issue keys followed by commands:
+
+    DEV-1 DEV-2 #comment Fixed the login #time 1d 2h 30m #done
+
+`#time` logs work (`w`, `d`, `h` and `m`, with Jira's default of 5 days a week
+and 8 hours a day), `#comment` adds a comment and any other command is a
+workflow transition. Each command runs until the next one or the end of the
+line.
+
+Messages are scanned with precompiled patterns, a commit at a time, and the
+commands found for each commit are cached by revision: the next report over
+an overlapping range lists the revisions of the range, then only reads and
+parses the messages of the new commits.
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import hashlib
+import json
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from .functions import get_cache_dir
+
+
+# Bump it whenever the parsed commands change, so old caches are discarded.
+CACHE_FORMAT_VERSION = 1
+
+OUTPUT_FORMATS = ('json', 'csv')
+
+# Issue keys, then the commands: `DEV-1, DEV-2 #done`
+SMART_COMMIT_PATTERN = re.compile(
+    r'^[ \t]*((?:[A-Za-z][A-Za-z0-9_]*-[0-9]+[ \t,]+)+)(#[A-Za-z].*)$', re.MULTILINE
+)
+# A command starts a line or follows a space, so `#12` in a comment isn't one
+COMMAND_PATTERN = re.compile(r'(?:^|(?<=\s))#([A-Za-z][A-Za-z0-9_-]*)')
+TIME_PATTERN = re.compile(r'\s*([0-9]+(?:\.[0-9]+)?)([wdhm])\b')
+
+TIME_UNIT_MINUTES = {'w': 5 * 8 * 60, 'd': 8 * 60, 'h': 60, 'm': 1}
+
+
+class SmartCommand(NamedTuple):
+    issues: Tuple[str, ...]
+    # `time`, `comment` or the transition, lower-cased
+    command: str
+    # Comment text, worklog comment or transition comment
+    text: str
+    # Logged by `#time`, 0 for other commands
+    minutes: int
+
+
+def parse_time(argument: str) -> Tuple[int, str]:
+    """`'1d 2h fixed it'` gives `(600, 'fixed it')`: the minutes and the rest."""
+    minutes = 0.0
+    position = 0
+
+    while match := TIME_PATTERN.match(argument, position):
+        minutes += float(match.group(1)) * TIME_UNIT_MINUTES[match.group(2)]
+        position = match.end()
+
+    return round(minutes), argument[position:].strip()
+
+
+def parse_smart_commands(message: str) -> Tuple[SmartCommand, ...]:
+    """Smart Commit commands of a commit message, in order."""
+    if '#' not in message:
+        return ()
+
+    commands = []
+
+    for keys, text in SMART_COMMIT_PATTERN.findall(message):
+        # The pattern already checked the keys: splitting them is linear, while
+        # `findall()` would retry each key from each of its letters
+        issues = tuple(key.upper() for key in keys.replace(',', ' ').split())
+        matches = list(COMMAND_PATTERN.finditer(text))
+
+        for index, match in enumerate(matches):
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+            command = match.group(1).lower()
+            argument = text[match.end() : end].strip()
+            minutes = 0
+
+            if command == 'time':
+                minutes, argument = parse_time(argument)
+
+            commands.append(SmartCommand(issues, command, argument, minutes))
+
+    return tuple(commands)
+
+
+class IssueActivity:
+    """Totals of the Smart Commit commands of a single issue."""
+
+    __slots__ = ('issue', 'revs', 'minutes', 'transitions', 'last_transition', 'comments')
+
+    def __init__(self, issue: str) -> None:
+        self.issue = issue
+        self.revs: List[str] = []
+        self.minutes = 0
+        self.transitions: Dict[str, int] = {}
+        self.last_transition: Optional[str] = None
+        self.comments: List[str] = []
+
+    def to_dict(self) -> dict:
+        return {
+            'issue': self.issue,
+            'commits': len(self.revs),
+            'time_minutes': self.minutes,
+            'time': format_minutes(self.minutes),
+            'transitions': self.transitions,
+            'last_transition': self.last_transition,
+            'comments': self.comments,
+        }
+
+
+def format_minutes(minutes: int) -> str:
+    """`600` gives `'1d 2h'`, with Jira's default units."""
+    parts = []
+
+    for unit, unit_minutes in TIME_UNIT_MINUTES.items():
+        value, minutes = divmod(minutes, unit_minutes)
+
+        if value:
+            parts.append(f"{value}{unit}")  # fmt: skip
+
+    return ' '.join(parts) or '0m'
+
+
+def aggregate(
+    commits: Iterable[Tuple[str, Tuple[SmartCommand, ...]]],
+) -> Dict[str, IssueActivity]:
+    """Totals per issue of the `(rev, commands)` commits, given newest first like
+    `git log`: the last transition is the one of the newest commit."""
+    activities: Dict[str, IssueActivity] = {}
+
+    for rev, commands in commits:
+        for command in commands:
+            for issue in command.issues:
+                activity = activities.get(issue)
+
+                if activity is None:
+                    activity = activities[issue] = IssueActivity(issue)
+
+                if not activity.revs or activity.revs[-1] != rev:
+                    activity.revs.append(rev)
+
+                if command.command == 'time':
+                    activity.minutes += command.minutes
+                elif command.command == 'comment':
+                    if command.text:
+                        activity.comments.append(command.text)
+                else:
+                    activity.transitions[command.command] = (
+                        activity.transitions.get(command.command, 0) + 1
+                    )
+
+                    if activity.last_transition is None:
+                        activity.last_transition = command.command
+
+    return activities
+
+
+class SmartCommitCache:
+    """Persistent cache of the Smart Commit commands of each revision."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[SmartCommand, ...]] | None = None
+        self._dirty = False
+
+    @classmethod
+    def for_repository(cls, repository: str | Path | None = None):
+        repository = Path(repository or Path.cwd()).resolve()
+        digest = hashlib.sha1(str(repository).encode()).hexdigest()
+
+        return cls(get_cache_dir() / 'smart_commits' / f"{digest}.pickle")  # fmt: skip
+
+    @property
+    def entries(self) -> Dict[str, Tuple[SmartCommand, ...]]:
+        if self._entries is None:
+            self._entries = self._load()
+
+        return self._entries
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, mode='rb') as file:
+                data = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return {}
+
+        if data.get('version') != CACHE_FORMAT_VERSION:
+            return {}
+
+        return data.get('entries', {})
+
+    def get(self, rev: str) -> Optional[Tuple[SmartCommand, ...]]:
+        commands = self.entries.get(rev)
+
+        if commands is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return commands
+
+    def set(self, rev: str, commands: Tuple[SmartCommand, ...]) -> None:
+        self.entries[rev] = commands
+
+        if not self._dirty:
+            self._dirty = True
+            atexit.register(self.save)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        temp_path = self.path.with_suffix(f".{os.getpid()}.tmp")  # fmt: skip
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(temp_path, mode='wb') as file:
+                pickle.dump(
+                    {'version': CACHE_FORMAT_VERSION, 'entries': self.entries},
+                    file,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+
+            os.replace(temp_path, self.path)
+        except OSError:
+            return
+
+        self._dirty = False
+        atexit.unregister(self.save)
+
+
+def iter_range_commands(
+    rev_range: str | None = None,
+    cache: SmartCommitCache | None = None,
+    cwd: str | Path | None = None,
+) -> Iterator[Tuple[str, Tuple[SmartCommand, ...]]]:
+    """Yield `(rev, commands)` for each commit of `rev_range`, newest first.
+
+    With a cache, only the messages of the commits not in it are read from git
+    and parsed. Raise `GitLogError` if the history can't be read.
+    """
+    from .git_log import iter_git_log
+    from .git_log import iter_git_log_revs
+
+    if cache is None:
+        for rev, message in iter_git_log(rev_range, fields=('rev', 'message'), cwd=cwd):
+            yield rev, parse_smart_commands(message)
+
+        return
+
+    revs = [rev for (rev,) in iter_git_log(rev_range, fields=('rev',), cwd=cwd)]
+    found = {rev: cache.get(rev) for rev in revs}
+    missing = [rev for rev, commands in found.items() if commands is None]
+
+    if missing:
+        for rev, message in iter_git_log_revs(missing, cwd=cwd):
+            found[rev] = parse_smart_commands(message)
+            cache.set(rev, found[rev])
+
+    for rev in revs:
+        yield rev, found[rev]
+
+
+CSV_COLUMNS = (
+    'issue',
+    'commits',
+    'time_minutes',
+    'time',
+    'transitions',
+    'last_transition',
+    'comments',
+)
+
+
+def write_report(
+    activities: Dict[str, IssueActivity], output: IO[str], output_format: str = 'json'
+) -> None:
+    """Write the totals, sorted by issue key, as JSON or CSV.
+
+    In CSV, transitions are `name:count` and comments are joined with ` | `.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}, use one of: {', '.join(OUTPUT_FORMATS)}")  # fmt: skip
+
+    rows = [activities[issue].to_dict() for issue in sorted(activities)]
+
+    if output_format == 'json':
+        json.dump(rows, output, indent=2)
+        output.write('\n')
+        return
+
+    writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+
+    for row in rows:
+        row['transitions'] = ' '.join(
+            f'{name}:{count}'
+            for name, count in row['transitions'].items()  # fmt: skip
+        )
+        row['comments'] = ' | '.join(row['comments'])
+        writer.writerow(row)
@@ -0,0 +1,125 @@
+"""A tiny template language for commit messages, compiled to Python functions.
+
+- `{field}` is replaced by the value of the field;
+- `{?field}...{/field}` is rendered only if the field isn't empty;
+- `{!field}...{/field}` is rendered only if the field is empty;
+- `{{` and `}}` are literal braces.
+
+Templates are parsed once into `str.format()` strings, one per section, so
+rendering a message is a `format_map()` call per section.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Callable
+from typing import Dict
+
+
+TEMPLATE_FIELDS = (
+    'jira_project_key',
+    'issue',
+    'issue_number',
+    'issue_epic',
+    'issue_epic_number',
+    'issue_subtasks',
+    'issue_related_tasks',
+    'issue_links',
+    'commit_type',
+    'commit_scope',
+    'breaking_change_sign',
+    'breaking_change_text',
+    'commit_title',
+    'commit_description',
+    'body',
+    'footer',
+)
+
+TOKEN_PATTERN = re.compile(r'\{\{|\}\}|\{([?!/]?)(\w+)\}|[{}]')
+
+
+def _parse(template: str) -> list:
+    """Parse a template into a tree of `('text', str)`, `('field', name)` and
+    `('section', name, negated, children)` nodes."""
+    root: list = []
+    stack = [(None, root)]
+    position = 0
+
+    def add_text(text):
+        if text:
+            stack[-1][1].append(('text', text))
+
+    for token in TOKEN_PATTERN.finditer(template):
+        add_text(template[position : token.start()])
+        position = token.end()
+        kind, name = token.groups()
+
+        if token.group() in ('{{', '}}'):
+            add_text(token.group()[0])
+        elif name is None:
+            raise ValueError(f"Unexpected {token.group()!r} at position {token.start()}, use '{{{{' or '}}}}' for literal braces.")  # fmt: skip
+        elif name not in TEMPLATE_FIELDS:
+            raise ValueError(f"Unknown field {name!r}, use one of: {', '.join(TEMPLATE_FIELDS)}.")  # fmt: skip
+        elif kind == '/':
+            if stack[-1][0] != name:
+                raise ValueError(f"Unexpected {token.group()!r} at position {token.start()}.")  # fmt: skip
+
+            stack.pop()
+        elif kind in ('?', '!'):
+            children: list = []
+            stack[-1][1].append(('section', name, kind == '!', children))
+            stack.append((name, children))
+        else:
+            stack[-1][1].append(('field', name))
+
+    if len(stack) > 1:
+        raise ValueError(f"Section {{?{stack[-1][0]}}} is never closed with {{/{stack[-1][0]}}}.")  # fmt: skip
+
+    add_text(template[position:])
+
+    return root
+
+
+def _compile(nodes: list, sections: list) -> str:
+    """Build the `str.format()` string of a tree. Each section becomes a
+    `{_<n>}` field, added to `sections` as `(key, name, shown, string_format)`
+    in rendering order, the inner sections first."""
+    string_format = []
+
+    for node in nodes:
+        if node[0] == 'text':
+            string_format.append(node[1].replace('{', '{{').replace('}', '}}'))
+        elif node[0] == 'field':
+            string_format.append(f"{{{node[1]}}}")  # fmt: skip
+        else:
+            _, name, negated, children = node
+            section_format = _compile(children, sections)
+            key = f"_{len(sections)}"  # fmt: skip
+            sections.append((key, name, not negated, section_format))
+            string_format.append(f"{{{key}}}")  # fmt: skip
+
+    return ''.join(string_format)
+
+
+@lru_cache(maxsize=None)
+def compile_template(template: str) -> Callable[[Dict[str, str]], str]:
+    """Compile a template into a function that renders a dict of string fields.
+
+    Raises `ValueError` if the template is invalid.
+    """
+    sections: list = []
+    string_format = _compile(_parse(template), sections)
+
+    if not sections:
+        return string_format.format_map
+
+    def render(fields: Dict[str, str]) -> str:
+        values = dict(fields)
+
+        for key, name, shown, section_format in sections:
+            values[key] = section_format.format_map(values) if bool(values[name]) is shown else ''  # fmt: skip
+
+        return string_format.format_map(values)
+
+    return render
@@ -0,0 +1,240 @@
+"""Search of the commit types, for the prompt of large `commit_types` catalogs.
+
+The index is built once: a prefix trie of the values, a prefix trie of the
+words of the names and the trigrams of both. A keystroke then walks a trie or
+reads the shortest trigram posting, in catalog order, and stops at `limit`
+matches: it never scans the whole catalog.
+
+Matches are ranked by tier (the value itself, a value prefix, a name word
+prefix, then anywhere in the value or the name), the recently used types first
+in each tier, then in catalog order.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+from .functions import get_cache_dir
+
+
+RECENT_TYPES_SIZE = 5
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Tiers of a match, best first
+EXACT, VALUE_PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+class CommitTypeIndex:
+    """Index of the `{'value', 'name'}` commit types."""
+
+    def __init__(
+        self, commit_types: Sequence[Mapping[str, str]], recent: Iterable[str] = ()
+    ) -> None:
+        self.commit_types = list(commit_types)
+        self.values = [str(commit_type['value']) for commit_type in self.commit_types]
+        self._positions: Dict[str, int] = {}
+        # Each trie node is `{character: node}`, its matches under the `''` key
+        self._value_trie: dict = {'': []}
+        self._word_trie: dict = {'': []}
+        self._trigrams: Dict[str, List[int]] = {}
+        self._texts: List[str] = []
+
+        for position, commit_type in enumerate(self.commit_types):
+            value = self.values[position].lower()
+            name = str(commit_type.get('name') or '').lower()
+            text = f'{value}\n{name}'
+
+            self._positions.setdefault(value, position)
+            self._texts.append(text)
+            self._insert(self._value_trie, value, position)
+
+            for word in set(WORD_PATTERN.findall(name)):
+                self._insert(self._word_trie, word, position)
+
+            for trigram in {text[start : start + 3] for start in range(len(text) - 2)}:
+                self._trigrams.setdefault(trigram, []).append(position)
+
+        self.recent: List[int] = []
+        self.set_recent(recent)
+
+    @staticmethod
+    def _insert(trie: dict, word: str, position: int) -> None:
+        node = trie
+
+        for character in word:
+            node = node.get(character) or node.setdefault(character, {'': []})
+            positions = node['']
+
+            # A type adds each prefix once, even if two of its words share it
+            if not positions or positions[-1] != position:
+                positions.append(position)
+
+    @staticmethod
+    def _lookup(trie: dict, prefix: str) -> List[int]:
+        node = trie
+
+        for character in prefix:
+            node = node.get(character)
+
+            if node is None:
+                return []
+
+        return node['']
+
+    def set_recent(self, values: Iterable[str]) -> None:
+        """Set the recently used types, most recent first. Unknown values are
+        left out."""
+        positions = (self._positions.get(value.lower()) for value in values)
+        recent = [position for position in positions if position is not None]
+        self.recent = list(dict.fromkeys(recent))[:RECENT_TYPES_SIZE]
+
+    @property
+    def recent_values(self) -> List[str]:
+        return [self.values[position] for position in self.recent]
+
+    def remember(self, value: str) -> None:
+        """Move `value` to the front of the recently used types."""
+        self.set_recent([value, *self.recent_values])
+
+    def _tier(self, position: int, query: str) -> Optional[int]:
+        value, _, name = self._texts[position].partition('\n')
+
+        if value == query:
+            return EXACT
+
+        if value.startswith(query):
+            return VALUE_PREFIX
+
+        if ' ' not in query and any(
+            word.startswith(query) for word in WORD_PATTERN.findall(name)
+        ):
+            return WORD_PREFIX
+
+        if query in self._texts[position]:
+            return SUBSTRING
+
+        return None
+
+    def _iter_tier(self, tier: int, query: str) -> Iterable[int]:
+        if tier == EXACT:
+            position = self._positions.get(query)
+            return () if position is None else (position,)
+
+        if tier == VALUE_PREFIX:
+            return self._lookup(self._value_trie, query)
+
+        if tier == WORD_PREFIX:
+            return () if ' ' in query else self._lookup(self._word_trie, query)
+
+        if len(query) < 3:
+            return ()
+
+        # Any posting holds all the matches, the shortest one is scanned
+        postings = []
+
+        for start in range(len(query) - 2):
+            posting = self._trigrams.get(query[start : start + 3])
+
+            if posting is None:
+                return ()
+
+            postings.append(posting)
+
+        texts = self._texts
+
+        return (
+            position for position in min(postings, key=len) if query in texts[position]
+        )
+
+    def iter_search(self, query: str) -> Iterator[int]:
+        """Positions of the types matching `query`, best first."""
+        query = query.strip().lower()
+
+        if not query:
+            yield from self.recent
+            recent = set(self.recent)
+            yield from (
+                position
+                for position in range(len(self.commit_types))
+                if position not in recent
+            )
+            return
+
+        recent_tiers = [(self._tier(position, query), position) for position in self.recent]  # fmt: skip
+        seen = set()
+
+        for tier in (EXACT, VALUE_PREFIX, WORD_PREFIX, SUBSTRING):
+            for recent_tier, position in recent_tiers:
+                if recent_tier == tier and position not in seen:
+                    seen.add(position)
+                    yield position
+
+            for position in self._iter_tier(tier, query):
+                if position not in seen:
+                    seen.add(position)
+                    yield position
+
+    def search(self, query: str, limit: int = 10) -> List[Mapping[str, str]]:
+        """The commit types matching `query`, best first, at most `limit`."""
+        matches = []
+
+        for position in self.iter_search(query):
+            matches.append(self.commit_types[position])
+
+            if len(matches) >= limit:
+                break
+
+        return matches
+
+    def get_value(self, value: str) -> Optional[str]:
+        """The value of the commit type typed as `value`, whatever its case."""
+        position = self._positions.get(value.strip().lower())
+
+        return None if position is None else self.values[position]
+
+    def __contains__(self, value: str) -> bool:
+        return value.strip().lower() in self._positions
+
+
+def get_recent_types_path() -> Path:
+    return get_cache_dir() / 'recent_commit_types.json'
+
+
+def load_recent_types(path: Optional[Path] = None) -> List[str]:
+    """The recently used commit type values, most recent first."""
+    try:
+        with open(path or get_recent_types_path(), encoding='utf-8') as file:
+            values = json.load(file)
+    except (OSError, ValueError):
+        return []
+
+    if not isinstance(values, list):
+        return []
+
+    return [value for value in values if isinstance(value, str)]
+
+
+def save_recent_types(values: Sequence[str], path: Optional[Path] = None) -> None:
+    path = path or get_recent_types_path()
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")  # fmt: skip
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(temp_path, mode='w', encoding='utf-8') as file:
+            json.dump(list(values), file)
+
+        os.replace(temp_path, path)
+    except OSError:
+        return
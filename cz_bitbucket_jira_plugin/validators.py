@@ -1,33 +1,160 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
 import re
+import threading
 from typing import Callable
 from typing import List
 
+from prompt_toolkit.application.current import get_app_or_none
 from prompt_toolkit.document import Document
+from prompt_toolkit.validation import ValidationError
 from prompt_toolkit.validation import Validator
 
 from .exceptions import AllValuesMustBeIntegerException
+from .exceptions import IssueNotFoundException
 from .exceptions import MinimumLengthException
 from .exceptions import RequiredAnswerException
+from .exceptions import UnknownCommitTypeException
 from .exceptions import ValueMustBeIntegerException
 
 
-def apply_multiple_validators(validators: List[Callable]):
-    def apply_validators(answer):
-        for validator in validators:
-            if inspect.isclass(validator):
-                result = validator.validate(answer)
-            else:
-                result = validator(answer)
+# Anything that is not a number, comma or whitespace character
+INVALID_INTEGER_LIST_CHARS = re.compile(r'[^0-9,\s]')
+
+
+class CallableValidator(Validator):
+    """Validator of a function returning `True`, or an error message."""
+
+    def __init__(self, function: Callable) -> None:
+        self.function = function
+
+    def validate(self, answer):
+        if isinstance(answer, Document):
+            answer = answer.text
+
+        result = self.function(answer)
+
+        if result is not True:
+            raise ValidationError(cursor_position=0, message=result or 'Invalid input.')
+
+        return True
+
+
+def as_validator(validator) -> Validator:
+    """Return a `Validator` instance from a `Validator` class, instance or function."""
+    if inspect.isclass(validator):
+        return validator()
+
+    if isinstance(validator, Validator):
+        return validator
+
+    return CallableValidator(validator)
+
+
+class ValidatorChain(Validator):
+    """Apply many validators to an answer, in order, stopping at the first error.
+
+    The chain is resolved once, when it's built, not on each keystroke. While
+    typing, each validator runs its own `validate_async`, so a
+    `BackgroundValidator` of the chain doesn't block the prompt.
+    """
+
+    def __init__(self, validators: List) -> None:
+        self.validators = tuple(as_validator(validator) for validator in validators)
 
-            if result != True:  # noqa: E712
-                return result
+    def validate(self, answer):
+        for validator in self.validators:
+            validator.validate(answer)
 
         return True
 
-    return apply_validators
+    async def validate_async(self, document: Document) -> None:
+        for validator in self.validators:
+            await validator.validate_async(document)
+
+
+def apply_multiple_validators(validators: List[Callable]) -> ValidatorChain:
+    return ValidatorChain(validators)
+
+
+class BackgroundValidator(Validator):
+    """Run a slow validator (e.g.: an issue lookup) off the prompt thread.
+
+    While typing, the validation waits for `delay` seconds without keystrokes
+    (debouncing), then runs in a daemon thread, so the event loop, and the
+    typing, is never blocked by it, and a lookup still running when the prompt
+    exits doesn't keep the interpreter waiting. A validation superseded by a
+    newer input is dropped before it starts; one already running is left to
+    finish, but its result isn't reported. On [enter] the validator runs
+    synchronously, as usual.
+    """
+
+    def __init__(self, validator, delay: float = 0.15) -> None:
+        self.validator = as_validator(validator)
+        self.delay = delay
+        self._generation = 0
+
+    def validate(self, answer):
+        return self.validator.validate(answer)
+
+    def _validate_in_thread(self, text: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def set_outcome(error):
+            if future.done():
+                return
+
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+        def run():
+            try:
+                self.validator.validate(text)
+            except Exception as exception:
+                error = exception
+            else:
+                error = None
+
+            try:
+                loop.call_soon_threadsafe(set_outcome, error)
+            except RuntimeError:
+                # The prompt is over and its event loop closed
+                pass
+
+        threading.Thread(target=run, name='cz-validator', daemon=True).start()
+
+        return future
+
+    def _is_superseded(self, generation: int, text: str) -> bool:
+        if generation != self._generation:
+            return True
+
+        # While prompting, only one validation runs at a time, and the prompt
+        # validates again if its text changed meanwhile.
+        app = get_app_or_none()
+
+        return app is not None and app.current_buffer.text != text
+
+    async def validate_async(self, document: Document) -> None:
+        self._generation += 1
+        generation = self._generation
+        text = document.text
+
+        await asyncio.sleep(self.delay)
+
+        if self._is_superseded(generation, text):
+            return
+
+        try:
+            await self._validate_in_thread(text)
+        except ValidationError:
+            if not self._is_superseded(generation, text):
+                raise
 
 
 class RequiredAnswerValidator(Validator):
@@ -68,11 +195,7 @@ class AllValuesMustBeIntegerValidator(Validator):
         if answer in ['', None]:
             return True
 
-        # Anything that is not a number, comma or whitespace character
-        pattern = re.compile(r'[^0-9,\s]+')
-        invalid_chars = pattern.findall(str(answer))
-
-        if invalid_chars:
+        if INVALID_INTEGER_LIST_CHARS.search(str(answer)):
             raise AllValuesMustBeIntegerException
 
         return True
@@ -90,3 +213,63 @@ class MinimumLengthValidator(Validator):
             raise MinimumLengthException(minimum_length=self.minimum_length)
 
         return True
+
+
+class IssueExistsValidator(Validator):
+    """Check that each comma separated issue number exists on the issue index
+    (an `IssueIndex` or a `JiraClient`), all numbers looked up at once.
+
+    A missing issue is reported on the `source` of the index it was looked up
+    on. `get_project_key` is called on each validation, the project key may be
+    answered on a previous question. Non integer values are left to the other
+    validators.
+    """
+
+    def __init__(self, issue_index, get_project_key: Callable[[], str]) -> None:
+        self.issue_index = issue_index
+        self.get_project_key = get_project_key
+
+    def validate(self, answer):
+        if isinstance(answer, Document):
+            answer = answer.text
+
+        if answer in ['', None]:
+            return True
+
+        project_key = self.get_project_key()
+
+        if not project_key:
+            return True
+
+        numbers = [number.strip() for number in str(answer).split(',')]
+        numbers = [int(number) for number in numbers if number.isdigit()]
+
+        try:
+            issues = self.issue_index.get_many(project_key, numbers)
+        except OSError:
+            # Jira can't be reached, don't block the commit on it
+            return True
+
+        for number in numbers:
+            if issues[number] is None:
+                raise IssueNotFoundException(
+                    issue_key=f'{project_key}-{number}', source=self.issue_index.source
+                )
+
+        return True
+
+
+class CommitTypeValidator(Validator):
+    """Only accept the values of the commit types of a `CommitTypeIndex`."""
+
+    def __init__(self, type_index) -> None:
+        self.type_index = type_index
+
+    def validate(self, answer):
+        if isinstance(answer, Document):
+            answer = answer.text
+
+        if answer not in self.type_index:
+            raise UnknownCommitTypeException(commit_type=answer)
+
+        return True
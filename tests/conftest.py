@@ -1,10 +1,29 @@
+import json
 import os
+import re
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 
 import pytest
 from commitizen.config import BaseConfig
 from commitizen.config import TomlConfig
 
 from cz_bitbucket_jira_plugin.defaults import JIRA_URL_EXAMPLE
+from cz_bitbucket_jira_plugin.functions import _config_files_cache
+from cz_bitbucket_jira_plugin.functions import CACHE_DIR_ENV_VAR
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(cache_dir))
+    _config_files_cache.clear()
+
+    yield cache_dir
+
+    _config_files_cache.clear()
 
 
 @pytest.fixture()
@@ -26,3 +45,149 @@ def setup_tmpdir(tmpdir):
         os.chdir(path)
 
         yield path
+
+
+@pytest.fixture
+def make_git_repository(tmp_path):
+    """Return a function that creates a git repository with one commit per
+    message, the first message being the oldest commit.
+
+    Commits are empty, unless the message is a `(message, paths)` tuple: then
+    each path is written and added to the commit.
+    """
+
+    def make_git_repository(messages, name='repository'):
+        path = tmp_path / name
+        path.mkdir()
+        env = {
+            **os.environ,
+            'GIT_AUTHOR_NAME': 'Dracula',
+            'GIT_AUTHOR_EMAIL': 'dracula@transylvania.ro',
+            'GIT_COMMITTER_NAME': 'Dracula',
+            'GIT_COMMITTER_EMAIL': 'dracula@transylvania.ro',
+        }
+        subprocess.run(['git', 'init', '-q', '-b', 'main'], cwd=path, check=True)
+
+        for message in messages:
+            if isinstance(message, tuple):
+                message, paths = message
+
+                for file_path in paths:
+                    (path / file_path).parent.mkdir(parents=True, exist_ok=True)
+                    (path / file_path).write_text(message)
+
+                subprocess.run(['git', 'add', '--', *paths], cwd=path, check=True)
+
+            subprocess.run(
+                ['git', 'commit', '-q', '--allow-empty', '--cleanup=verbatim', '-F', '-'],
+                cwd=path,
+                env=env,
+                input=message.encode(),
+                check=True,
+            )
+
+        return path
+
+    return make_git_repository
+
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    """Answers the JQL `key in (...)` searches of the Jira Cloud REST API."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        server.searches.append(payload)
+        server.authorizations.append(self.headers.get('Authorization'))
+
+        if self.path != '/rest/api/3/search/jql' or server.status != 200:
+            return self._send(server.status or 404, {'errorMessages': ['Nope']})
+
+        if server.body is not None:
+            return self._send(200, server.body)
+
+        keys = re.fullmatch(r'key in \((.*)\)', payload['jql']).group(1).split(', ')
+        unknown_keys = [key for key in keys if key.upper() not in server.issues]
+
+        # Like Jira Cloud, the whole search is rejected
+        if unknown_keys:
+            return self._send(
+                400,
+                {
+                    'errorMessages': [
+                        f"An issue with key '{key}' does not exist for field 'key'."
+                        for key in unknown_keys
+                    ]
+                },
+            )
+
+        issues = [
+            {
+                'key': key.upper(),
+                'fields': {
+                    'summary': server.issues[key.upper()][0],
+                    'issuetype': {'name': server.issues[key.upper()][1]},
+                },
+            }
+            for key in keys
+        ]
+        start = int(payload.get('nextPageToken') or 0)
+        end = start + min(payload['maxResults'], server.page_size)
+        page = {'issues': issues[start:end], 'isLast': end >= len(issues)}
+
+        if end < len(issues):
+            page['nextPageToken'] = str(end)
+
+        self._send(200, page)
+
+    def _send(self, status, data):
+        body = data if isinstance(data, bytes) else json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+
+        if self.server.close_connections:
+            self.send_header('Connection', 'close')
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_jira():
+    """A local stand-in of the Jira REST API.
+
+    Set `issues` (`{key: (summary, type)}`) and inspect `searches`,
+    `connections` and `authorizations`. `status` makes every search fail,
+    `body` makes them answer it as is, and `page_size` limits the issues of
+    each page.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeJiraHandler)
+    server.daemon_threads = True
+    server.issues = {}
+    server.searches = []
+    server.authorizations = []
+    server.connections = 0
+    server.status = 200
+    server.body = None
+    server.page_size = 5000
+    server.close_connections = False
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True
+    )
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,225 @@
+import csv
+import io
+import json
+import os
+import subprocess
+
+from commitizen.config import read_cfg
+
+from cz_bitbucket_jira_plugin.analytics import aggregate
+from cz_bitbucket_jira_plugin.analytics import build_record_pattern
+from cz_bitbucket_jira_plugin.analytics import read_columns
+from cz_bitbucket_jira_plugin.analytics import write_report
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.multi_repo import Repository
+from cz_bitbucket_jira_plugin.parsers import build_commit_parser
+from cz_bitbucket_jira_plugin.parsers import compile_commit_parser
+from cz_bitbucket_jira_plugin.parsers import ISSUE_FOOTER_PATTERN
+from cz_bitbucket_jira_plugin.parsers import split_issue_id
+
+
+COMMIT_TYPES = tuple(commit_type['value'] for commit_type in DEFAULT_COMMIT_TYPES)
+
+CONFIG = """\
+[tool.commitizen]
+name = "cz_bitbucket_jira_plugin"
+jira_url = "https://dracula.atlassian.net"
+tag_format = "v$version"
+"""
+
+# Oldest first: message, commit date, tag
+MESSAGES = [
+    ('init: set up the repository', '2023-12-30T10:00:00Z', None),
+    (
+        'feat(api): add answers [DEV-1]\n\nissue epic: [DEV-100]',
+        '2024-01-05T10:00:00Z',
+        None,
+    ),
+    (
+        'fix: reject empty answers [dev-2]\n\nissue epic: [dev-100]',
+        '2024-02-01T10:00:00Z',
+        'v0.1.0',
+    ),
+    ('feat!: change the answers [DEV-3]', '2024-04-02T10:00:00Z', None),
+    ('Merge branch main', '2024-04-03T10:00:00Z', None),
+    (
+        'fix(ui): align the prompt [DEV-3]\n\nissue epic: [DEV-200]',
+        '2024-05-01T10:00:00Z',
+        'v1.0.0',
+    ),
+    ('BREAKING CHANGE: drop the old prompt', '2024-07-01T10:00:00Z', None),
+]
+
+
+def make_repository(make_git_repository, name='repository'):
+    path = make_git_repository([], name=name)
+    (path / 'cz.toml').write_text(CONFIG)
+
+    for message, date, tag in MESSAGES:
+        env = {
+            **os.environ,
+            'GIT_AUTHOR_NAME': 'Dracula',
+            'GIT_AUTHOR_EMAIL': 'dracula@transylvania.ro',
+            'GIT_COMMITTER_NAME': 'Dracula',
+            'GIT_COMMITTER_EMAIL': 'dracula@transylvania.ro',
+            'GIT_AUTHOR_DATE': date,
+            'GIT_COMMITTER_DATE': date,
+        }
+        subprocess.run(
+            ['git', 'commit', '-q', '--allow-empty', '-F', '-'],
+            cwd=path,
+            env=env,
+            input=message.encode(),
+            check=True,
+        )
+
+        if tag:
+            subprocess.run(['git', 'tag', tag], cwd=path, check=True)
+
+    return path
+
+
+def test_record_pattern_should_parse_like_the_plugin():
+    commit_parser = compile_commit_parser(build_commit_parser(COMMIT_TYPES))
+    titles = [
+        'feat(api): add answers [DEV-1]',
+        'feat(api)!: add answers',
+        'feat(: weird scope [DEV-2] and [more',
+        'other!: untyped breaking change [DEV-3] done',
+        'BREAKING CHANGE: removed [x] [DEV-4]',
+        'feature: not a type [DEV-5]',
+        'feat:no space [DEV-6]',
+        'fix: [a[b] [DEV-7]] tail',
+        'Merge branch main',
+        '',
+    ]
+    bodies = [
+        '',
+        'issue epic: [DEV-9]',
+        'text\nissue epic: [DEV-9] \nmore',
+        'xissue epic: [DEV-9]',
+    ]
+    records = [
+        (str(number), f'tag: v{number}' if number % 2 else '', title, body)
+        for number, title in enumerate(titles)
+        for body in bodies
+    ]
+    chunk = b''.join('\x1f'.join(record).encode() + b'\0' for record in records)
+
+    rows = build_record_pattern(COMMIT_TYPES).findall(chunk)
+
+    assert len(rows) == len(records)
+
+    for (timestamp, refs, title, body), row in zip(records, rows):
+        parsed = commit_parser.match(title)
+        change_type = parsed.group('change_type') if parsed else None
+        breaking = bool(parsed and (parsed.group('breaking') or not change_type))
+        epics = [
+            keys
+            for name, keys in ISSUE_FOOTER_PATTERN.findall(body)
+            if name == 'issue epic'
+        ]
+
+        assert row[:2] == (timestamp.encode(), refs.encode())
+        assert row[2].decode() == (change_type or ''), title
+        assert bool(row[3]) == breaking, title
+        assert row[4].decode() == (split_issue_id(title)[1] or ''), title
+        assert row[5].decode() == (epics[0] if epics else ''), body
+
+
+def test_analytics_should_aggregate_the_history(make_git_repository, monkeypatch):
+    monkeypatch.chdir(make_repository(make_git_repository))
+    cz = CzBitbucketJiraPlugin(read_cfg())
+
+    report = aggregate(read_columns(cz, [Repository('repository', None)]))
+
+    assert report['commits'] == 7
+    assert report['types_per_quarter'] == {
+        '2023-Q4': {'init': 1},
+        '2024-Q1': {'feat': 1, 'fix': 1},
+        '2024-Q2': {'feat': 1, '(none)': 1, 'fix': 1},
+        '2024-Q3': {'BREAKING CHANGE': 1},
+    }
+    assert report['issues_per_release'] == {
+        'Unreleased': {'commits': 1, 'issues': 0},
+        'v1.0.0': {'commits': 3, 'issues': 1},
+        'v0.1.0': {'commits': 3, 'issues': 2},
+    }
+    assert report['breaking_changes']['breaking'] == 2
+    assert report['breaking_changes']['rate'] == round(2 / 7, 4)
+    assert report['breaking_changes']['per_quarter']['2024-Q2'] == {
+        'commits': 3,
+        'breaking': 1,
+        'rate': 0.3333,
+    }
+    assert report['commits_per_epic'] == {'DEV-100': 2, 'DEV-200': 1}
+
+
+def test_analytics_should_label_the_releases_of_many_repositories(
+    make_git_repository, monkeypatch
+):
+    paths = [make_repository(make_git_repository, name) for name in ('api', 'web')]
+    monkeypatch.chdir(paths[0])
+    cz = CzBitbucketJiraPlugin(read_cfg())
+
+    columns = read_columns(cz, [Repository(path.name, path) for path in paths])
+    report = aggregate(columns)
+
+    assert report['commits'] == 14
+    assert report['repositories'] == ['api', 'web']
+    assert list(report['issues_per_release']) == [
+        'api@Unreleased',
+        'api@v1.0.0',
+        'api@v0.1.0',
+        'web@Unreleased',
+        'web@v1.0.0',
+        'web@v0.1.0',
+    ]
+    assert report['commits_per_epic'] == {'DEV-100': 4, 'DEV-200': 2}
+
+
+def test_analytics_report_formats():
+    report = {
+        'commits': 2,
+        'repositories': ['repository'],
+        'types_per_quarter': {'2024-Q1': {'feat': 2}},
+        'issues_per_release': {'v1.0.0': {'commits': 2, 'issues': 1}},
+        'breaking_changes': {
+            'commits': 2,
+            'breaking': 1,
+            'rate': 0.5,
+            'per_quarter': {'2024-Q1': {'commits': 2, 'breaking': 1, 'rate': 0.5}},
+        },
+        'commits_per_epic': {'DEV-1': 2},
+    }
+    output = io.StringIO()
+    write_report(report, output, 'json')
+
+    assert json.loads(output.getvalue()) == report
+
+    output = io.StringIO()
+    write_report(report, output, 'csv')
+    rows = list(csv.reader(io.StringIO(output.getvalue())))
+
+    assert rows[0] == ['metric', 'group', 'key', 'value']
+    assert ['types_per_quarter', '2024-Q1', 'feat', '2'] in rows
+    assert ['issues_per_release', 'v1.0.0', 'issues', '1'] in rows
+    assert ['breaking_changes', 'all', 'rate', '0.5'] in rows
+    assert ['commits_per_epic', 'DEV-1', 'commits', '2'] in rows
+    assert len(rows) == 11
+
+
+def test_analytics_command(make_git_repository, monkeypatch, capsys):
+    monkeypatch.chdir(make_repository(make_git_repository))
+
+    assert main(['analytics', '--rev-range', 'v0.1.0..HEAD']) == 0
+
+    captured = capsys.readouterr()
+
+    assert json.loads(captured.out)['commits'] == 4
+    assert captured.err == '4 commits from 1 repositories.\n'
+
+    assert main(['analytics', 'missing']) == 2
+    assert 'missing: not a directory' in capsys.readouterr().err
@@ -0,0 +1,131 @@
+import random
+import subprocess
+
+import pytest
+from commitizen import bump
+from commitizen import git
+
+from cz_bitbucket_jira_plugin.bump import BumpClassifier
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.defaults import BUMP_MAP
+from cz_bitbucket_jira_plugin.defaults import BUMP_PATTERN
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+
+
+# Default types, user types and keywords that only match some keys by prefix
+KEYWORDS = [commit_type['value'] for commit_type in DEFAULT_COMMIT_TYPES] + [
+    'feature',
+    'hotfix',
+    'fixup',
+    'chore',
+    'Fix',
+    'deleted',
+    'BREAKING CHANGE',
+    'BREAKING-CHANGE',
+]
+
+
+def random_message(rng: random.Random) -> str:
+    lines = []
+
+    for _ in range(rng.randint(1, 4)):
+        keyword = rng.choice(KEYWORDS)
+        scope = rng.choice(['', '(api)', '(a) (b)'])
+        breaking = rng.choice(['', '', '!'])
+        separator = rng.choice([': ', ': ', ' '])
+        lines.append(f'{keyword}{scope}{breaking}{separator}change things [DEV-1]')
+
+    return '\n'.join(rng.choice([lines, lines + ['', 'plain body line']]))
+
+
+def commitizen_increment(messages, bump_map=BUMP_MAP):
+    commits = [git.GitCommit(rev='0' * 40, title=message) for message in messages]
+
+    return bump.find_increment(commits, regex=BUMP_PATTERN, increments_map=bump_map)
+
+
+def test_classifier_should_match_commitizen_find_increment():
+    rng = random.Random(0)
+    classifier = BumpClassifier(BUMP_PATTERN, BUMP_MAP)
+
+    for _ in range(2_000):
+        messages = [random_message(rng) for _ in range(rng.randint(1, 4))]
+
+        assert classifier.find_increment(messages) == commitizen_increment(messages), (
+            messages
+        )
+
+
+@pytest.mark.parametrize(
+    'message, expected',
+    [
+        ('feat: add validator [DEV-1]', 'MINOR'),
+        ('feature(api): add validator', 'MINOR'),
+        ('docs!: remove the old API', 'MAJOR'),
+        ('delete: remove the old API', 'MAJOR'),
+        ('chore: nothing to release', None),
+        ('not a convention', None),
+        ('fix: x\n\nBREAKING CHANGE: drop python 3.7', 'MAJOR'),
+    ],
+)
+def test_classifier_should_classify_messages(message, expected):
+    assert BumpClassifier(BUMP_PATTERN, BUMP_MAP).classify(message) == expected
+
+
+def test_keys_with_groups_should_keep_their_precedence():
+    bump_map = {r'(fix|perf)(\(.+\))?': 'PATCH', r'(f)(e)at': 'MINOR', r'.+!': 'MAJOR'}
+    messages = ['feat(ui)!: x', 'perf: x', 'feat: x']
+    classifier = BumpClassifier(BUMP_PATTERN, bump_map)
+
+    for message in messages:
+        assert classifier.find_increment([message]) == commitizen_increment(
+            [message], bump_map
+        )
+
+
+def test_classifier_should_stop_at_the_highest_increment():
+    consumed = []
+
+    def messages():
+        for message in ['fix: a', 'feat: b', 'feat!: c', 'fix: d', 'feat: e']:
+            consumed.append(message)
+            yield message
+
+    assert BumpClassifier(BUMP_PATTERN, BUMP_MAP).find_increment(messages()) == 'MAJOR'
+    assert consumed == ['fix: a', 'feat: b', 'feat!: c']
+
+
+def test_highest_increment_should_come_from_the_map():
+    classifier = BumpClassifier(BUMP_PATTERN, {'feat': 'MINOR', 'fix': 'PATCH'})
+
+    assert classifier.highest == 'MINOR'
+    assert classifier.find_increment(['fix: a', 'feat: b', 'feat!: c']) == 'MINOR'
+
+
+def test_plugin_should_find_the_increment_of_commits(setup_tmpdir, default_config):
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    commits = [
+        git.GitCommit(rev='0' * 40, title='fix: a', body=''),
+        git.GitCommit(rev='1' * 40, title='docs: b', body='BREAKING CHANGE: c'),
+    ]
+
+    assert cz.find_increment(commits) == 'MAJOR'
+
+
+def test_increment_command_should_start_at_the_latest_tag(
+    make_git_repository, monkeypatch, capsys
+):
+    repository = make_git_repository(['feat!: a', 'feat: b', 'fix: c'])
+    monkeypatch.chdir(repository)
+
+    assert main(['increment']) == 0
+    assert capsys.readouterr().out == 'MAJOR\n'
+
+    subprocess.run(['git', 'tag', 'v1.0.0', 'HEAD~1'], check=True)
+
+    assert main(['increment']) == 0
+    assert capsys.readouterr().out == 'PATCH\n'
+
+    assert main(['increment', 'HEAD..HEAD']) == 0
+    assert capsys.readouterr().out == 'NONE\n'
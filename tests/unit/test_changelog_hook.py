@@ -0,0 +1,67 @@
+import re
+
+import pytest
+from commitizen import git
+
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.parsers import split_issue_id
+
+
+LEGACY_ISSUE_ID_PATTERN = re.compile(r'\[([^\[\]]*)\](?!.*\[)')
+
+REV = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+
+
+@pytest.mark.parametrize(
+    'title',
+    [
+        'add new validator [DEV-1]',
+        'add [WIP] validator [DEV-1]',
+        'add validator [DEV-1] at the end',
+        '[DEV-1] add validator',
+        'add validator []',
+        'add validator [a] [b] [DEV-12]   ',
+        'add ] validator ] [DEV-1] ]',
+    ],
+)
+def test_split_issue_id_should_match_legacy_pattern(title):
+    expected_title = LEGACY_ISSUE_ID_PATTERN.sub('', title).strip()
+    expected_issue_id = LEGACY_ISSUE_ID_PATTERN.search(title).group(1)
+
+    assert split_issue_id(title) == (expected_title, expected_issue_id)
+
+
+@pytest.mark.parametrize('title', ['add validator', 'add [validator', '[a] add [b'])
+def test_split_issue_id_without_issue_id_should_return_None(title):
+    assert split_issue_id(title) == (title.strip(), None)
+
+
+def test_hook_should_link_issue_id(setup_tmpdir, default_config):
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    commit = git.GitCommit(rev=REV, title='feat: add validator [DEV-1]')
+    parsed_message = {'change_type': 'feat', 'message': 'add validator [DEV-1]'}
+
+    result = cz.changelog_message_builder_hook(parsed_message, commit)
+
+    assert result['message'] == (
+        'add validator [DEV-1](https://<project name>.atlassian.net/browse/DEV-1) '
+        '(4b825dc)'
+    )
+
+
+def test_hook_should_flag_breaking_change(setup_tmpdir, default_config):
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    commit = git.GitCommit(rev=REV, title='feat!: add validator [DEV-1]')
+    parsed_message = {'change_type': 'feat', 'breaking': '!', 'message': 'x [DEV-1]'}
+
+    result = cz.changelog_message_builder_hook(parsed_message, commit)
+
+    assert result['change_type'] == 'BREAKING CHANGE'
+
+
+def test_hook_should_skip_breaking_change_footer(setup_tmpdir, default_config):
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    commit = git.GitCommit(rev=REV, title='BREAKING CHANGE: x')
+    parsed_message = {'change_type': 'BREAKING CHANGE', 'message': 'x'}
+
+    assert cz.changelog_message_builder_hook(parsed_message, commit) is False
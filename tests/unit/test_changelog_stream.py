@@ -0,0 +1,181 @@
+import io
+import os
+import subprocess
+import tracemalloc
+
+from commitizen import changelog
+from commitizen import git
+from commitizen.changelog_formats import get_changelog_format
+from commitizen.config import read_cfg
+from commitizen.version_schemes import get_version_scheme
+
+from cz_bitbucket_jira_plugin.changelog_stream import iter_changelog_records
+from cz_bitbucket_jira_plugin.changelog_stream import stream_changelog
+from cz_bitbucket_jira_plugin.changelog_stream import write_changelog
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.defaults import CHANGELOG_TYPE_MAP
+from cz_bitbucket_jira_plugin.defaults import CHANGELOG_TYPE_ORDER
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.parsers import build_commit_parser
+
+
+BROWSE_URL = 'https://dracula.atlassian.net/browse/'
+COMMIT_PARSER = build_commit_parser(
+    tuple(commit_type['value'] for commit_type in DEFAULT_COMMIT_TYPES)
+)
+
+CONFIG = """\
+[tool.commitizen]
+name = "cz_bitbucket_jira_plugin"
+jira_url = "https://dracula.atlassian.net"
+tag_format = "v$version"
+"""
+
+# Oldest first, with the tag of the commit
+MESSAGES = [
+    ('init: set up the repository', None),
+    ('feat: add validators [DEV-1]', None),
+    ('fix(api): reject empty answers [DEV-2]\n\nBody.', None),
+    ('chore: bump the dependencies', 'v0.1.0'),
+    ('Merge branch main', 'v0.2.0'),
+    ('other!: drop the old prompt', None),
+    ('docs: explain the validators [dev-3]', None),
+    ('BREAKING CHANGE: removed the API', 'v1.0.0'),
+    ('feat-web: not a type [DEV-4]', None),
+    ('feat!: change the answers [DEV-5]', None),
+    ('perf(parser): compile once', None),
+]
+
+
+def make_repository(make_git_repository):
+    repository = make_git_repository([message for message, _ in MESSAGES])
+    (repository / 'cz.toml').write_text(CONFIG)
+
+    for back, (_, tag) in enumerate(reversed(MESSAGES)):
+        if tag:
+            subprocess.run(
+                ['git', 'tag', tag, f'HEAD~{back}'], cwd=repository, check=True
+            )
+
+    return repository
+
+
+def render_with_commitizen(cz):
+    config = cz.config
+    scheme = get_version_scheme(config)
+    tree = changelog.generate_tree_from_commits(
+        git.get_commits(args='--topo-order'),
+        changelog.get_version_tags(scheme, git.get_tags(), config.settings['tag_format']),
+        cz.commit_parser,
+        cz.changelog_pattern,
+        change_type_map=cz.change_type_map,
+        changelog_message_builder_hook=cz.changelog_message_builder_hook,
+        scheme=scheme,
+    )
+    tree = changelog.order_changelog_tree(tree, cz.change_type_order)
+
+    return changelog.render_changelog(
+        tree,
+        loader=cz.template_loader,
+        template=get_changelog_format(config, 'CHANGELOG.md').template,
+    ).lstrip('\n')
+
+
+def test_changelog_should_be_the_commitizen_one(make_git_repository, monkeypatch):
+    monkeypatch.chdir(make_repository(make_git_repository))
+    cz = CzBitbucketJiraPlugin(read_cfg())
+
+    output = io.StringIO()
+    writer = write_changelog(cz, output)
+
+    assert output.getvalue() == render_with_commitizen(cz)
+    assert output.getvalue().startswith('## Unreleased\n\n### BREAKING CHANGE\n')
+    assert (writer.releases, writer.entries) == (4, 7)
+
+    # Spools moved to temporary files give the same output
+    spooled_output = io.StringIO()
+    write_changelog(cz, spooled_output, spool_size=10)
+
+    assert spooled_output.getvalue() == output.getvalue()
+
+
+def test_records_should_share_their_strings():
+    commits = [
+        (f'{number:040x}', f'feat(ui): change {number} [DEV-{number % 3}]')
+        for number in range(10)
+    ]
+    records = [
+        record
+        for _, record in iter_changelog_records(
+            commits, COMMIT_PARSER, CHANGELOG_TYPE_MAP
+        )
+    ]
+
+    assert records[0].section == 'New features'
+    assert records[0].scope is records[9].scope
+    assert records[0].section is records[9].section
+    assert records[0].issue is records[3].issue
+    assert not hasattr(records[0], '__dict__')
+
+
+def synthetic_commits(count: int):
+    for number in range(count):
+        yield (
+            f'{number:040x}',
+            f'{("feat", "fix", "docs")[number % 3]}(scope{number % 50}): '
+            f'change the answers of the prompt {number} [DEV-{number}]',
+        )
+
+
+def test_changelog_memory_should_not_grow_with_the_history():
+    with open(os.devnull, mode='w', encoding='utf-8') as output:
+        tracemalloc.start()
+
+        try:
+            writer = stream_changelog(
+                synthetic_commits(100_000),
+                output,
+                COMMIT_PARSER,
+                BROWSE_URL,
+                CHANGELOG_TYPE_MAP,
+                CHANGELOG_TYPE_ORDER,
+                spool_size=100_000,
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert writer.entries == 100_000
+    # ~12 MB of entries in one release: only the spools stay in memory
+    assert peak < 5_000_000
+
+
+def test_changelog_command(make_git_repository, monkeypatch, capsys):
+    monkeypatch.chdir(make_repository(make_git_repository))
+
+    assert main(['changelog', 'v1.0.0..HEAD', '--unreleased-version', 'v1.1.0']) == 0
+
+    assert capsys.readouterr().err == '2 entries in 1 release(s).\n'
+
+    with open('CHANGELOG.md', encoding='utf-8') as file:
+        text = file.read()
+
+    assert text.startswith('## v1.1.0 (')
+    assert '- **parser**: compile once (' in text
+
+
+def test_changelog_command_should_keep_the_changelog_on_error(
+    make_git_repository, monkeypatch, capsys
+):
+    monkeypatch.chdir(make_repository(make_git_repository))
+
+    with open('CHANGELOG.md', mode='w', encoding='utf-8') as file:
+        file.write('## v1.0.0\n')
+
+    assert main(['changelog', 'v9.9.9..HEAD']) == 2
+
+    with open('CHANGELOG.md', encoding='utf-8') as file:
+        assert file.read() == '## v1.0.0\n'
+
+    assert not [name for name in os.listdir() if name.endswith('.tmp')]
@@ -0,0 +1,115 @@
+"""The `check` command runs in the commit-msg git hook, on every commit. It must
+start fast and never import Commitizen or the prompt libraries."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+# Startup cost of the command on top of the bare interpreter, in milliseconds
+STARTUP_BUDGET_MS = float(os.environ.get('CZ_BITBUCKET_JIRA_STARTUP_BUDGET_MS', 60))
+
+FORBIDDEN_MODULES = ('commitizen', 'prompt_toolkit', 'questionary', 'jinja2')
+
+CONFIG_CONTENT = """
+[tool.commitizen]
+name = "cz-bitbucket-jira-plugin"
+jira_url = "https://dracula.atlassian.net"
+"""
+
+MESSAGE = """feat(api)!: add the bat mode [DEV-1]
+
+BREAKING CHANGE: the human mode was removed
+
+issue epic: [DEV-2]
+issue subtasks: [DEV-3, DEV-4]
+"""
+
+# Runs `check` like the CLI does, then prints the imported modules
+CHECK_STATEMENT = """\
+import json, sys
+from cz_bitbucket_jira_plugin.cli import main
+code = main(['check', 'COMMIT_EDITMSG'])
+print(json.dumps({'code': code, 'modules': sorted(sys.modules)}))
+"""
+
+
+@pytest.fixture
+def repository(tmp_path, isolated_cache_dir):
+    (tmp_path / 'cz.toml').write_text(CONFIG_CONTENT)
+    (tmp_path / 'COMMIT_EDITMSG').write_text(MESSAGE)
+
+    return tmp_path
+
+
+def run(repository, *args, cache_dir=None):
+    """Run the interpreter with `args`, return the result and the elapsed ms."""
+    env = dict(os.environ)
+
+    if cache_dir:
+        env['CZ_BITBUCKET_JIRA_CACHE_DIR'] = str(cache_dir)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args],
+        cwd=repository,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_check(repository, cache_dir=None):
+    """Exit code of `check` and the modules it imported, on a fresh interpreter."""
+    result, _ = run(repository, '-c', CHECK_STATEMENT, cache_dir=cache_dir)
+
+    assert result.returncode == 0, result.stderr
+
+    output = json.loads(result.stdout.splitlines()[-1])
+
+    return output['code'], output['modules']
+
+
+def heavy_modules(modules):
+    return [module for module in modules if module.split('.')[0] in FORBIDDEN_MODULES]
+
+
+def test_check_should_not_import_heavy_modules(repository, tmp_path):
+    code, modules = run_check(repository, cache_dir=tmp_path / 'cold-cache')
+
+    assert code == 0
+    assert 'cz_bitbucket_jira_plugin.checker' in modules
+    assert not heavy_modules(modules)
+
+
+def test_check_should_read_the_config_snapshot(repository):
+    run_check(repository)
+
+    code, modules = run_check(repository)
+
+    assert code == 0
+    # The config comes from the snapshot, TOML isn't parsed again.
+    assert 'tomli' not in modules
+    assert not heavy_modules(modules)
+
+
+@pytest.mark.parametrize('cold', [True, False], ids=['cold', 'warm'])
+def test_check_should_start_within_budget(repository, tmp_path, cold):
+    command = ('-m', 'cz_bitbucket_jira_plugin', 'check', 'COMMIT_EDITMSG')
+    bare_ms = min(run(repository, '-c', 'pass')[1] for _ in range(5))
+    timings = []
+
+    for attempt in range(5):
+        cache_dir = tmp_path / f'cold-cache-{attempt}' if cold else None
+        result, elapsed_ms = run(repository, *command, cache_dir=cache_dir)
+
+        assert result.returncode == 0, result.stderr
+        timings.append(elapsed_ms)
+
+    assert min(timings) - bare_ms < STARTUP_BUDGET_MS
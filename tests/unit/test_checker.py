@@ -0,0 +1,55 @@
+import pytest
+
+from cz_bitbucket_jira_plugin.checker import check_commit_message
+from cz_bitbucket_jira_plugin.cli import main
+
+
+COMMIT_TYPES = ['feat', 'fix', 'docs']
+
+
+@pytest.mark.parametrize(
+    'message',
+    [
+        'feat: add validator [DEV-1]',
+        'fix(cli)!: remove option [DEV-1032]\n\nBREAKING CHANGE: removed',
+        'docs: update readme [1]',
+        (
+            'feat: add validator [DEV-1]\n\nbody\n\n'
+            'issue epic: [DEV-2]\n'
+            'issue subtasks: [DEV-3, DEV-4]\n'
+            'issue related tasks: [DEV-5]\n\n'
+            'DEV-1 #done'
+        ),
+        'feat: add validator [DEV-1]\n# Please enter the commit message',
+        "Merge branch 'main' into feature/DEV-1",
+        'fixup! feat: add validator [DEV-1]',
+    ],
+)
+def test_valid_message_should_return_no_errors(message):
+    assert check_commit_message(message, COMMIT_TYPES) == []
+
+
+@pytest.mark.parametrize(
+    'message',
+    [
+        '',
+        '# only comments',
+        'feat: add validator',
+        'feat: add validator [DEV-1] later',
+        'feat: [DEV-1]',
+        'chore: add validator [DEV-1]',
+        'feat!add validator [DEV-1]',
+        'BREAKING CHANGE: removed [DEV-1]',
+        'other!: drop the legacy mode [DEV-1]',
+        'feat: add validator [DEV-1]\n\nissue epic: DEV-2',
+        'feat: add validator [DEV-1]\n\nissue subtasks: [DEV-3,DEV-4]',
+    ],
+)
+def test_invalid_message_should_return_errors(message):
+    assert check_commit_message(message, COMMIT_TYPES)
+
+
+def test_cli_should_return_exit_code(setup_tmpdir, capsys):
+    assert main(['check', '--message', 'feat: add validator [DEV-1]']) == 0
+    assert main(['check', '--message', 'feat: add validator']) == 1
+    assert 'commit validation: failed!' in capsys.readouterr().err
@@ -0,0 +1,172 @@
+import json
+import os
+import subprocess
+
+import pytest
+
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.commit_index import CommitIssueIndex
+from cz_bitbucket_jira_plugin.commit_index import extract_issue_keys
+
+
+MESSAGES = [
+    'feat: add the plugin [DEV-1]',
+    (
+        'feat(api): add validators [DEV-2]\n\n'
+        'issue epic: [DEV-1]\n'
+        'issue subtasks: [DEV-3, dev-4]\n'
+        'issue related tasks: [OPS-7]'
+    ),
+    'docs: explain the validators',
+    'fix: validate the answers [DEV-3]\n\nissue related tasks: [DEV-1, 12]',
+]
+
+
+def commit(repository, message):
+    subprocess.run(
+        ['git', 'commit', '-q', '--allow-empty', '-m', message],
+        cwd=repository,
+        env={
+            **os.environ,
+            'GIT_AUTHOR_NAME': 'Dracula',
+            'GIT_AUTHOR_EMAIL': 'dracula@transylvania.ro',
+            'GIT_COMMITTER_NAME': 'Dracula',
+            'GIT_COMMITTER_EMAIL': 'dracula@transylvania.ro',
+        },
+        check=True,
+    )
+
+
+def git(repository, *args):
+    subprocess.run(['git', *args], cwd=repository, capture_output=True, check=True)
+
+
+@pytest.fixture
+def repository(make_git_repository):
+    return make_git_repository(MESSAGES)
+
+
+@pytest.fixture
+def commit_index(repository, tmp_path):
+    commit_index = CommitIssueIndex(tmp_path / 'commits.sqlite', repository)
+
+    yield commit_index
+
+    commit_index.close()
+
+
+@pytest.mark.parametrize(
+    'message, expected',
+    [
+        ('feat: add x [DEV-1]', [('DEV-1', 'issue')]),
+        ('feat: add x [1]', []),
+        ('feat: add x', []),
+        (
+            MESSAGES[1],
+            [
+                ('DEV-2', 'issue'),
+                ('DEV-1', 'epic'),
+                ('DEV-3', 'subtask'),
+                ('DEV-4', 'subtask'),
+                ('OPS-7', 'related'),
+            ],
+        ),
+        (
+            'fix: y [DEV-1]\n\nsee issue epic: [DEV-2]\nissue epic: DEV-3',
+            [('DEV-1', 'issue')],
+        ),
+    ],
+)
+def test_extract_issue_keys(message, expected):
+    assert extract_issue_keys(message) == expected
+
+
+def test_find_should_list_every_role_newest_first(commit_index):
+    assert commit_index.update() == 4
+
+    assert [(ref.role, ref.title) for ref in commit_index.find('dev-1')] == [
+        ('related', 'fix: validate the answers [DEV-3]'),
+        ('epic', 'feat(api): add validators [DEV-2]'),
+        ('issue', 'feat: add the plugin [DEV-1]'),
+    ]
+    assert [ref.role for ref in commit_index.find('DEV-3')] == ['issue', 'subtask']
+    assert [ref.role for ref in commit_index.find('DEV-3', roles=['subtask'])] == [
+        'subtask'
+    ]
+    assert commit_index.find('DEV-99') == []
+
+
+def test_update_should_only_read_the_new_commits(commit_index, repository):
+    commit_index.update()
+    assert commit_index.update() == 0
+
+    commit(repository, 'fix: handle empty answers [DEV-1]')
+
+    assert commit_index.update() == 1
+    assert len(commit_index.find('DEV-1')) == 4
+    assert commit_index.find('DEV-1')[0].title == 'fix: handle empty answers [DEV-1]'
+
+
+def test_update_should_drop_the_commits_of_a_rewritten_history(commit_index, repository):
+    commit_index.update()
+
+    subprocess.run(['git', 'reset', '-q', '--hard', 'HEAD~2'], cwd=repository, check=True)
+    commit(repository, 'fix: validate the answers again [DEV-5]')
+
+    assert commit_index.update() == 1
+    assert [ref.role for ref in commit_index.find('DEV-3')] == ['subtask']
+    assert len(commit_index.find('DEV-5')) == 1
+
+
+def test_update_should_not_index_a_branch_again(commit_index, repository):
+    commit_index.update()
+    git(repository, 'checkout', '-q', '-b', 'feature', 'HEAD~1')
+    commit(repository, 'feat: add the feature [DEV-6]')
+
+    assert commit_index.update() == 1
+
+    git(repository, 'checkout', '-q', '-')
+
+    assert commit_index.update() == 0
+
+    git(repository, 'checkout', '-q', 'feature')
+
+    assert commit_index.update() == 0
+    assert len(commit_index.find('DEV-6')) == 1
+    assert len(commit_index.find('DEV-3')) == 2
+
+
+def test_update_should_drop_the_commits_of_a_deleted_branch(commit_index, repository):
+    git(repository, 'checkout', '-q', '-b', 'feature')
+    commit(repository, 'feat: add the feature [DEV-6]')
+    commit_index.update()
+    git(repository, 'checkout', '-q', '-')
+    git(repository, 'branch', '-q', '-D', 'feature')
+    commit(repository, 'fix: handle empty answers [DEV-1]')
+
+    assert commit_index.update() == 1
+    assert commit_index.find('DEV-6') == []
+    assert len(commit_index.find('DEV-1')) == 4
+
+
+def test_commits_command(repository, monkeypatch, capsys):
+    monkeypatch.chdir(repository)
+
+    assert main(['commits', 'DEV-3', '--format', 'json']) == 0
+
+    captured = capsys.readouterr()
+    refs = json.loads(captured.out)['DEV-3']
+
+    assert '4 new commit(s) indexed.' in captured.err
+    assert [ref['role'] for ref in refs] == ['issue', 'subtask']
+    assert len(refs[0]['rev']) == 40
+
+    assert main(['commits', 'DEV-1', '--role', 'epic']) == 0
+
+    captured = capsys.readouterr()
+
+    assert captured.err == ''
+    assert captured.out.split('\t')[2:] == [
+        'epic',
+        'feat(api): add validators [DEV-2]\n',
+    ]
@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.parsers import build_alternation
+from cz_bitbucket_jira_plugin.parsers import build_commit_parser
+
+
+COMMIT_TYPES = ('feat', 'feat-ui', 'feat-api', 'fix', 'fix.ci', 'c++', 'f')
+
+
+def flat_commit_parser(commit_types):
+    piped_commit_types = '|'.join(
+        [re.escape(value) for value in commit_types] + ['BREAKING CHANGE']
+    )
+
+    return (
+        rf'^((?P<change_type>{piped_commit_types})'
+        r'(?:\((?P<scope>[^()\r\n]*)\)|\()?(?P<breaking>!)?|\w+!):\s(?P<message>.*)?'
+    )
+
+
+@pytest.mark.parametrize(
+    'value', [*COMMIT_TYPES, 'fea', 'feat-', 'feat-uix', 'fixxci', 'c+', '']
+)
+def test_alternation_should_match_exactly_the_values(value):
+    pattern = re.compile(build_alternation(COMMIT_TYPES))
+
+    assert bool(pattern.fullmatch(value)) is (value in COMMIT_TYPES)
+
+
+@pytest.mark.parametrize(
+    'message',
+    [
+        'feat: add validator [DEV-1]',
+        'feat-ui(button)!: add validator [DEV-1]',
+        'feat-api: add validator [DEV-1]',
+        'fix.ci: pipeline [DEV-1]',
+        'c++: speed up [DEV-1]',
+        'f: short [DEV-1]',
+        'fixxci: not a type [DEV-1]',
+        'other!: breaking [DEV-1]',
+        'BREAKING CHANGE: removed the API',
+        'feat-web: unknown type [DEV-1]',
+    ],
+)
+def test_commit_parser_should_match_like_flat_alternation(message):
+    flat_pattern = re.compile(flat_commit_parser(COMMIT_TYPES))
+    trie_pattern = re.compile(build_commit_parser(COMMIT_TYPES))
+
+    flat_match = flat_pattern.match(message)
+    trie_match = trie_pattern.match(message)
+
+    assert bool(flat_match) is bool(trie_match)
+
+    if flat_match:
+        assert trie_match.groupdict() == flat_match.groupdict()
+
+
+def test_compiled_parser_should_be_shared_between_instances(setup_tmpdir, default_config):
+    first = CzBitbucketJiraPlugin(config=default_config)
+    second = CzBitbucketJiraPlugin(config=default_config)
+
+    assert first.commit_parser_pattern is second.commit_parser_pattern
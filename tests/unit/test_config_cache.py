@@ -0,0 +1,79 @@
+import os
+
+import pytest
+import tomli
+
+from cz_bitbucket_jira_plugin import functions
+from cz_bitbucket_jira_plugin.functions import clear_config_cache
+from cz_bitbucket_jira_plugin.functions import get_config_file
+from cz_bitbucket_jira_plugin.functions import get_user_prompt_style
+
+
+CONFIG_CONTENT = """
+[tool.commitizen]
+name = "cz-bitbucket-jira-plugin"
+prompt_style = [
+    { identifier = "question", style = "fg:#50FA7B bold" },
+]
+"""
+
+
+@pytest.fixture
+def parse_counter(monkeypatch):
+    calls = []
+    original_load = tomli.load
+
+    def counting_load(file):
+        calls.append(file.name)
+        return original_load(file)
+
+    monkeypatch.setattr(tomli, 'load', counting_load)
+
+    return calls
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'pyproject.toml'
+    path.write_text(CONFIG_CONTENT)
+
+    return path
+
+
+def test_config_file_should_be_parsed_once_per_process(config_file, parse_counter):
+    for _ in range(5):
+        get_config_file()
+        style = get_user_prompt_style()
+
+    assert style == {'style': [('question', 'fg:#50FA7B bold')]}
+    assert len(parse_counter) == 1
+
+
+def test_disk_snapshot_should_skip_parsing_on_next_process(config_file, parse_counter):
+    get_user_prompt_style()
+
+    # Simulate a new process: only the on-disk snapshot survives.
+    functions._config_files_cache.clear()
+    get_user_prompt_style()
+
+    assert len(parse_counter) == 1
+
+
+def test_modified_config_file_should_be_parsed_again(config_file, parse_counter):
+    get_user_prompt_style()
+
+    config_file.write_text(CONFIG_CONTENT.replace('bold', 'italic'))
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert get_user_prompt_style() == {'style': [('question', 'fg:#50FA7B italic')]}
+    assert len(parse_counter) == 2
+
+
+def test_clear_config_cache_should_force_parsing(config_file, parse_counter):
+    get_user_prompt_style()
+    clear_config_cache()
+    get_user_prompt_style()
+
+    assert len(parse_counter) == 2
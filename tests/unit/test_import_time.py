@@ -0,0 +1,94 @@
+"""Commitizen imports the plugin on every `cz` call, even for commands that never
+show a prompt (`cz bump`, `cz changelog`, `cz version`...). Keep it cheap."""
+
+import os
+import subprocess
+import sys
+
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+
+
+# Cumulative import cost of each plugin module, in microseconds, Commitizen
+# itself excluded
+MODULE_IMPORT_BUDGET_US = int(
+    os.environ.get('CZ_BITBUCKET_JIRA_IMPORT_BUDGET_US', 10_000)
+)
+
+PROMPT_ONLY_MODULES = [
+    'cz_bitbucket_jira_plugin.validators',
+    'cz_bitbucket_jira_plugin.exceptions',
+    'cz_bitbucket_jira_plugin.checker',
+    'tomli',
+]
+
+
+def get_import_times(statement, cwd=None):
+    """Run `statement` on a fresh interpreter and return the cumulative import
+    time, in microseconds, of each imported module."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        _, cumulative, module = line.split('|')
+
+        if cumulative.strip().isdigit():
+            import_times[module.strip()] = int(cumulative)
+
+    return import_times
+
+
+def test_plugin_import_should_not_load_prompt_only_modules():
+    # Commitizen loads the plugin entry point while importing `commitizen.cz`
+    import_times = get_import_times('import commitizen.cz')
+
+    assert 'cz_bitbucket_jira_plugin.parsers' in import_times
+    assert not [module for module in PROMPT_ONLY_MODULES if module in import_times]
+
+
+def test_plugin_modules_should_import_within_budget():
+    import_times = get_import_times('import commitizen.cz')
+    over_budget = {
+        module: cumulative
+        for module, cumulative in import_times.items()
+        if module.startswith('cz_bitbucket_jira_plugin')
+        and cumulative > MODULE_IMPORT_BUDGET_US
+    }
+
+    assert over_budget == {}
+
+
+def test_plugin_should_not_load_profiling_unless_enabled(tmp_path):
+    (tmp_path / 'cz.toml').write_text(
+        '[tool.commitizen]\nname = "cz-bitbucket-jira-plugin"\n'
+    )
+    import_times = get_import_times(
+        'from commitizen.config.base_config import BaseConfig\n'
+        'from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin\n'
+        'config = BaseConfig()\n'
+        "config.update({'jira_url': 'https://dracula.atlassian.net'})\n"
+        'CzBitbucketJiraPlugin(config=config)',
+        cwd=tmp_path,
+    )
+
+    assert 'cz_bitbucket_jira_plugin.templates' in import_times
+    assert 'cz_bitbucket_jira_plugin.profiling' not in import_times
+
+
+def test_questions_should_load_validators(setup_tmpdir, default_config):
+    questions = CzBitbucketJiraPlugin(config=default_config).questions()
+
+    assert 'cz_bitbucket_jira_plugin.validators' in sys.modules
+    assert [question['name'] for question in questions][:3] == [
+        'jira_project_key',
+        'issue_epic_number',
+        'issue_number',
+    ]
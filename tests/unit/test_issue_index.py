@@ -0,0 +1,189 @@
+import io
+import json
+
+import pytest
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.completers import IssueNumberCompleter
+from cz_bitbucket_jira_plugin.issue_index import Issue
+from cz_bitbucket_jira_plugin.issue_index import IssueIndex
+from cz_bitbucket_jira_plugin.issue_index import read_jira_export
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.messages import render_messages
+from cz_bitbucket_jira_plugin.parsers import split_issue_key
+
+
+NUMBERS = [1, 2, 12, 13, 120, 121, 129, 130, 1200, 1299, 12000]
+
+
+@pytest.mark.parametrize(
+    'key, expected',
+    [('DEV-12', ('DEV', 12)), (' dev-12 ', ('DEV', 12)), ('MY-PRJ-2', ('MY-PRJ', 2))],
+)
+def test_split_issue_key(key, expected):
+    assert split_issue_key(key) == expected
+
+
+@pytest.mark.parametrize('key', ['12', 'DEV', 'DEV-', 'DEV-1x', '1-2', 'DEV-1) OR (1=1'])
+def test_split_issue_key_should_reject_other_values(key):
+    with pytest.raises(ValueError):
+        split_issue_key(key)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = tmp_path / 'issues.sqlite'
+    issues = [Issue('DEV', number, f'Issue {number}', 'Task') for number in NUMBERS]
+    IssueIndex.build(path, [*issues, Issue('OPS', 12, 'Other project', 'Bug')])
+
+    return path
+
+
+def test_jira_csv_export_should_be_read():
+    export = io.StringIO(
+        'Summary,Issue key,Issue id,Issue Type\n'
+        'Create the plugin,DEV-1,10001,Story\n'
+        'Not an issue,,10002,Task\n'
+    )
+
+    assert list(read_jira_export(export)) == [
+        Issue('DEV', 1, 'Create the plugin', 'Story')
+    ]
+
+
+def test_jsonl_export_should_accept_rest_api_issues():
+    export = io.StringIO(
+        json.dumps({'key': 'DEV-1', 'summary': 'Flat', 'type': 'Bug'})
+        + '\n\n'
+        + json.dumps(
+            {
+                'key': 'MY-PRJ-2',
+                'fields': {'summary': 'From the API', 'issuetype': {'name': 'Epic'}},
+            }
+        )
+    )
+
+    assert list(read_jira_export(export, input_format='jsonl')) == [
+        Issue('DEV', 1, 'Flat', 'Bug'),
+        Issue('MY-PRJ', 2, 'From the API', 'Epic'),
+    ]
+
+
+def test_index_should_find_issues_by_key(index_path):
+    index = IssueIndex(index_path)
+
+    assert index.get('DEV', 12) == Issue('DEV', 12, 'Issue 12', 'Task')
+    assert index.get('DEV', 14) is None
+    assert 'OPS-12' in index
+    assert 'OPS-13' not in index
+    assert 'OPS' not in index
+
+
+def test_rebuilding_should_replace_the_index(index_path):
+    index = IssueIndex(index_path)
+    assert index.get('DEV', 1)
+
+    assert IssueIndex.build(index_path, [Issue('NEW', 1, 'New', 'Task')]) == 1
+
+    assert IssueIndex(index_path).get('DEV', 1) is None
+    assert IssueIndex(index_path).get('NEW', 1)
+
+
+@pytest.mark.parametrize(
+    'prefix, expected',
+    [
+        ('12', [12, 120, 121, 129, 1200, 1299, 12000]),
+        ('129', [129, 1299]),
+        ('3', []),
+        ('012', []),
+        ('1a', []),
+        ('', [12000, 1299, 1200]),
+    ],
+)
+def test_completion_should_list_shortest_numbers_first(index_path, prefix, expected):
+    issues = IssueIndex(index_path).complete('DEV', prefix, limit=len(NUMBERS))
+
+    assert [issue.number for issue in issues][: len(expected) or None] == expected
+
+
+def test_completion_should_stop_at_the_limit(index_path):
+    issues = IssueIndex(index_path).complete('DEV', '1', limit=4)
+
+    assert [issue.number for issue in issues] == [1, 12, 13, 120]
+
+
+def test_completion_should_ignore_the_project_key_case(index_path):
+    issues = IssueIndex(index_path).complete('dev', '1', limit=4)
+
+    assert [issue.number for issue in issues] == [1, 12, 13, 120]
+
+
+def test_completer_should_complete_the_last_of_many_numbers(index_path):
+    completer = IssueNumberCompleter(IssueIndex(index_path), lambda: 'DEV', multiple=True)
+
+    completions = list(completer.get_completions(Document('1, 129'), CompleteEvent()))
+
+    assert [completion.text for completion in completions] == ['129', '1299']
+    assert completions[0].start_position == -3
+    assert completions[0].display_meta_text == 'Task: Issue 129'
+
+
+def test_index_should_be_opened_on_the_first_lookup(
+    setup_tmpdir, default_config, index_path
+):
+    default_config.update({'jira_issue_index': str(index_path)})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+
+    assert cz._issue_index is None
+
+    cz.questions()
+    assert cz._issue_index._connection is None
+
+
+def test_missing_index_file_should_raise(setup_tmpdir, default_config, tmp_path):
+    from commitizen.exceptions import InvalidConfigurationError
+
+    default_config.update({'jira_issue_index': str(tmp_path / 'missing.sqlite')})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+
+    with pytest.raises(InvalidConfigurationError, match='jira_issue_index'):
+        cz.questions()
+
+
+def test_rendered_records_should_be_checked_on_the_index(
+    setup_tmpdir, default_config, index_path
+):
+    default_config.update({'jira_issue_index': str(index_path)})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    answers = {
+        'issue_number': '12',
+        'issue_subtasks': '13, 14',
+        'commit_type': 'feat',
+        'commit_title': 'Link the commits with the Jira issues',
+    }
+
+    rendered = list(
+        render_messages(
+            cz,
+            [
+                {**answers, 'jira_project_key': 'DEV'},
+                {**answers, 'jira_project_key': 'OPS', 'issue_subtasks': ''},
+            ],
+        )
+    )
+
+    assert rendered[0].errors == [
+        'issue_subtasks: Issue DEV-14 not found on the Jira issue index.'
+    ]
+    assert rendered[1].errors == []
+
+
+def test_index_command_should_build_the_index_from_a_csv_export(tmp_path):
+    export = tmp_path / 'export.csv'
+    export.write_text('Issue key,Summary,Issue Type\nDEV-7,Seven,Bug\n')
+
+    assert main(['index', str(export), '-o', str(tmp_path / 'issues.sqlite')]) == 0
+
+    assert 'DEV-7' in IssueIndex(tmp_path / 'issues.sqlite')
@@ -0,0 +1,273 @@
+import subprocess
+
+import pytest
+from commitizen import git
+
+from cz_bitbucket_jira_plugin import main
+from cz_bitbucket_jira_plugin.exceptions import IssueNotFoundException
+from cz_bitbucket_jira_plugin.issue_index import Issue
+from cz_bitbucket_jira_plugin.jira_client import API_TOKEN_ENV_VAR
+from cz_bitbucket_jira_plugin.jira_client import JiraClient
+from cz_bitbucket_jira_plugin.jira_client import JiraClientError
+from cz_bitbucket_jira_plugin.jira_client import JiraIssueCache
+from cz_bitbucket_jira_plugin.jira_client import USER_ENV_VAR
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.messages import render_messages
+from cz_bitbucket_jira_plugin.validators import IssueExistsValidator
+
+
+REV = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+
+
+@pytest.fixture
+def client(fake_jira, tmp_path):
+    fake_jira.issues = {
+        f'DEV-{number}': (f'Issue {number}', 'Task') for number in range(1, 301)
+    }
+    client = JiraClient(
+        fake_jira.url, cache=JiraIssueCache(tmp_path / 'jira.pickle'), batch_size=100
+    )
+
+    yield client
+
+    client.close()
+
+
+def test_lookups_should_be_batched_in_a_single_search(client, fake_jira):
+    issues = client.get_issues(
+        [f'DEV-{number}' for number in range(1, 251)] + ['DEV-999']
+    )
+
+    # The batch with the unknown key is searched again without it
+    assert len(fake_jira.searches) == 4
+    assert issues['DEV-1'] == Issue('DEV', 1, 'Issue 1', 'Task')
+    assert issues['DEV-999'] is None
+    assert len(issues) == 251
+    # Batches are searched concurrently, in any order
+    assert sorted(len(search['jql'].split(', ')) for search in fake_jira.searches) == [
+        50,
+        51,
+        100,
+        100,
+    ]
+    assert fake_jira.connections <= client.pool_size
+
+
+def test_search_should_follow_the_pages(client, fake_jira):
+    fake_jira.page_size = 40
+
+    issues = client.get_issues([f'DEV-{number}' for number in range(1, 101)])
+
+    assert all(issues.values())
+    assert [search.get('nextPageToken') for search in fake_jira.searches] == [
+        None,
+        '40',
+        '80',
+    ]
+
+
+def test_connections_should_be_reused(client, fake_jira):
+    for number in range(1, 6):
+        client.get('DEV', number)
+
+    assert len(fake_jira.searches) == 5
+    assert fake_jira.connections == client.pool.created == 1
+
+
+def test_connections_closed_by_the_server_should_not_be_reused(client, fake_jira):
+    fake_jira.close_connections = True
+
+    client.get('DEV', 1)
+    client.get('DEV', 2)
+
+    assert fake_jira.connections == client.pool.created == 2
+
+
+def test_cached_keys_should_not_hit_the_network(client, fake_jira, tmp_path):
+    keys = ['DEV-1', 'DEV-2', 'DEV-999']
+    client.get_issues(keys)
+    client.cache.save()
+
+    other_client = JiraClient(
+        fake_jira.url, cache=JiraIssueCache(tmp_path / 'jira.pickle')
+    )
+    issues = other_client.get_issues(keys + ['DEV-3'])
+
+    # DEV-999 was rejected by the first search, then DEV-1 and DEV-2 found
+    assert len(fake_jira.searches) == 3
+    assert fake_jira.searches[2]['jql'] == 'key in (DEV-3)'
+    assert issues['DEV-999'] is None
+    assert (other_client.cache.hits, other_client.cache.misses) == (3, 1)
+
+
+def test_expired_keys_should_be_looked_up_again(client, fake_jira):
+    client.get('DEV', 1)
+    client.cache.entries['DEV-1'] = (0, None)
+
+    assert client.get('DEV', 1) == Issue('DEV', 1, 'Issue 1', 'Task')
+    assert len(fake_jira.searches) == 2
+
+
+def test_strings_that_are_not_issue_keys_should_not_be_searched(client, fake_jira):
+    assert client.get_issues(['WIP', 'DEV-1) OR (1=1']) == {
+        'WIP': None,
+        'DEV-1) OR (1=1': None,
+    }
+    assert fake_jira.searches == []
+
+
+def test_credentials_should_be_read_from_the_environment(fake_jira, monkeypatch):
+    monkeypatch.setenv(USER_ENV_VAR, 'dracula@transylvania.ro')
+    monkeypatch.setenv(API_TOKEN_ENV_VAR, 'garlic')
+
+    JiraClient.from_environment(fake_jira.url).get('DEV', 1)
+
+    assert fake_jira.authorizations == ['Basic ZHJhY3VsYUB0cmFuc3lsdmFuaWEucm86Z2FybGlj']
+
+
+def test_failed_search_should_raise_and_not_be_cached(client, fake_jira):
+    fake_jira.status = 500
+
+    with pytest.raises(JiraClientError, match='500'):
+        client.get('DEV', 1)
+
+    assert client.cache.entries == {}
+
+
+@pytest.mark.parametrize(
+    'body',
+    [
+        b'<html><body>Log in</body></html>',
+        b'{"issues": [{"key": "DEV"}]}',
+        b'{"issues": [{"fields": {}}]}',
+        b'[]',
+    ],
+)
+def test_unexpected_search_response_should_raise_and_not_be_cached(
+    client, fake_jira, body
+):
+    fake_jira.body = body
+
+    with pytest.raises(JiraClientError, match='Unexpected Jira search response'):
+        client.get('DEV', 1)
+
+    assert client.cache.entries == {}
+
+
+def test_validator_should_look_all_numbers_up_at_once(client, fake_jira):
+    validator = IssueExistsValidator(client, lambda: 'DEV')
+
+    assert validator.validate('1, 2, 3') is True
+    assert len(fake_jira.searches) == 1
+
+    with pytest.raises(IssueNotFoundException, match='DEV-999 not found on Jira'):
+        validator.validate('1, 999')
+
+
+def test_validator_should_not_block_when_jira_is_down(client, fake_jira):
+    fake_jira.status = 503
+
+    assert IssueExistsValidator(client, lambda: 'DEV').validate('1') is True
+
+
+@pytest.fixture
+def cz(setup_tmpdir, default_config, fake_jira):
+    fake_jira.issues = {
+        'DEV-1': ('Create the "plugin"', 'Story'),
+        'DEV-2': ('Two', 'Bug'),
+    }
+    default_config.update(
+        {
+            'jira_api': True,
+            'jira_api_url': fake_jira.url,
+            'changelog_issue_summaries': True,
+        }
+    )
+
+    return CzBitbucketJiraPlugin(config=default_config)
+
+
+def test_rendered_records_should_be_checked_on_jira(cz):
+    answers = {
+        'jira_project_key': 'DEV',
+        'issue_number': '1',
+        'issue_subtasks': '2, 3',
+        'commit_type': 'feat',
+        'commit_title': 'Link the commits with the Jira issues',
+    }
+
+    rendered = list(render_messages(cz, [answers]))
+
+    assert rendered[0].errors == ['issue_subtasks: Issue DEV-3 not found on Jira.']
+
+
+def test_hook_should_add_the_issue_summary(cz):
+    commit = git.GitCommit(rev=REV, title='feat: add validator [DEV-1]')
+    parsed_message = {'change_type': 'feat', 'message': 'add validator [DEV-1]'}
+
+    result = cz.changelog_message_builder_hook(parsed_message, commit)
+
+    assert result['issue_summary'] == 'Create the "plugin"'
+    assert result['message'] == (
+        'add validator [DEV-1](https://<project name>.atlassian.net/browse/DEV-1 '
+        '"Create the \\"plugin\\"") (4b825dc)'
+    )
+
+
+def render_history(cz, messages):
+    revs = subprocess.run(
+        ['git', 'log', '--format=%H'], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    for rev, message in zip(revs, reversed(messages)):
+        commit = git.GitCommit(rev=rev, title=message)
+        cz.changelog_message_builder_hook(
+            {'change_type': 'feat', 'message': message.partition(': ')[2]}, commit
+        )
+
+
+def get_searched_keys(search):
+    return sorted(search['jql'][8:-1].split(', '))
+
+
+def test_hook_should_render_without_summary_on_unexpected_response(cz, fake_jira):
+    fake_jira.body = b'<html><body>Log in</body></html>'
+    commit = git.GitCommit(rev=REV, title='feat: add validator [DEV-1]')
+    parsed_message = {'change_type': 'feat', 'message': 'add validator [DEV-1]'}
+
+    result = cz.changelog_message_builder_hook(parsed_message, commit)
+
+    assert 'issue_summary' not in result
+    assert result['message'] == (
+        'add validator [DEV-1](https://<project name>.atlassian.net/browse/DEV-1) '
+        '(4b825dc)'
+    )
+
+
+def test_hook_should_look_the_history_up_in_one_search(
+    cz, fake_jira, make_git_repository, monkeypatch
+):
+    messages = [f'feat: add validator {number} [DEV-{number}]' for number in (1, 2, 3)]
+    monkeypatch.chdir(make_git_repository(messages))
+    fake_jira.issues['DEV-3'] = ('Three', 'Task')
+
+    render_history(cz, messages)
+
+    assert len(fake_jira.searches) == 1
+    assert get_searched_keys(fake_jira.searches[0]) == ['DEV-1', 'DEV-2', 'DEV-3']
+
+
+def test_hook_should_only_look_the_next_commits_up(
+    cz, fake_jira, make_git_repository, monkeypatch
+):
+    messages = [f'feat: add validator {number} [DEV-{number}]' for number in range(1, 6)]  # fmt: skip
+    monkeypatch.chdir(make_git_repository(messages))
+    monkeypatch.setattr(main, 'ISSUE_PREFETCH_SIZE', 2)
+    fake_jira.issues.update({f'DEV-{number}': ('Issue', 'Task') for number in (4, 5)})
+
+    # An incremental changelog of the last 2 commits
+    render_history(cz, messages[-2:])
+
+    assert [get_searched_keys(search) for search in fake_jira.searches] == [
+        ['DEV-4', 'DEV-5']
+    ]
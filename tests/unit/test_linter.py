@@ -0,0 +1,121 @@
+import json
+import sys
+from xml.etree import ElementTree
+
+import pytest
+
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.git_log import _iter_records
+from cz_bitbucket_jira_plugin.git_log import GitLogError
+from cz_bitbucket_jira_plugin.git_log import iter_git_log
+from cz_bitbucket_jira_plugin.linter import lint_commits
+from cz_bitbucket_jira_plugin.linter import lint_range
+from cz_bitbucket_jira_plugin.linter import report_to_junit
+
+
+COMMIT_TYPES = ['feat', 'fix']
+
+MESSAGES = [
+    'feat: add the bat mode [DEV-1]\n\nissue epic: [DEV-2]',
+    'wip',
+    'fix: remove the human mode [DEV-3]',
+    'fix: forgot the issue',
+]
+
+
+def test_git_log_should_stream_every_field(make_git_repository):
+    repository = make_git_repository(MESSAGES)
+
+    records = list(iter_git_log(fields=('title', 'message', 'author'), cwd=repository))
+
+    assert [record[0] for record in records] == [
+        message.partition('\n')[0] for message in reversed(MESSAGES)
+    ]
+    assert records[-1][1].strip() == MESSAGES[0]
+    assert {record[2] for record in records} == {'Dracula'}
+
+
+def test_git_log_should_raise_GitLogError(make_git_repository):
+    repository = make_git_repository(MESSAGES)
+
+    with pytest.raises(GitLogError):
+        list(iter_git_log('unknown-branch', cwd=repository))
+
+
+def test_git_errors_should_not_block_on_a_full_stderr_pipe():
+    # A child writing more than a pipe buffer on stderr before exiting
+    command = [
+        sys.executable,
+        '-c',
+        'import sys; sys.stderr.write("w" * 1_000_000); sys.stdout.write("a\\0b")',
+    ]
+
+    assert list(_iter_records(command, None)) == ['a', 'b']
+
+    with pytest.raises(GitLogError, match='^w+$'):
+        list(_iter_records([*command[:2], f'{command[2]}; sys.exit(1)'], None))
+
+
+def test_lint_range_should_report_invalid_commits(make_git_repository):
+    repository = make_git_repository(MESSAGES)
+
+    report = lint_range(None, COMMIT_TYPES, cwd=repository)
+
+    assert report.checked == 4
+    assert [failure.title for failure in report.failures] == [
+        'fix: forgot the issue',
+        'wip',
+    ]
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_pool_should_report_failures_in_order(executor):
+    records = [(f'{index:040x}', MESSAGES[index % 4]) for index in range(100)]
+
+    report = lint_commits(
+        records,
+        COMMIT_TYPES,
+        workers=2,
+        executor=executor,
+        chunk_size=7,
+        serial_threshold=10,
+    )
+
+    assert report.checked == 100
+    assert [failure.rev for failure in report.failures] == [
+        rev for rev, message in records if message in ('wip', 'fix: forgot the issue')
+    ]
+
+
+def test_fail_fast_should_stop_reading_commits():
+    def records():
+        yield ('a' * 40, 'wip')
+        raise AssertionError('The linter should have stopped')
+
+    report = lint_commits(
+        records(), COMMIT_TYPES, fail_fast=True, workers=1, chunk_size=1
+    )
+
+    assert (report.checked, len(report.failures)) == (1, 1)
+
+
+def test_junit_report_should_list_every_commit(make_git_repository):
+    repository = make_git_repository(MESSAGES)
+
+    testsuite = ElementTree.fromstring(
+        report_to_junit(lint_range(None, COMMIT_TYPES, cwd=repository))
+    )
+
+    assert testsuite.get('tests') == '4'
+    assert testsuite.get('failures') == '2'
+    assert len(testsuite.findall('testcase')) == 4
+    assert [
+        testcase.find('failure') is not None for testcase in testsuite.iter('testcase')
+    ] == [True, False, True, False]
+
+
+def test_lint_command_should_write_json_report(make_git_repository, monkeypatch, capsys):
+    monkeypatch.chdir(make_git_repository(MESSAGES[:1]))
+
+    assert main(['lint']) == 0
+    assert json.loads(capsys.readouterr().out)['checked'] == 1
@@ -0,0 +1,148 @@
+import itertools
+
+import pytest
+from commitizen.exceptions import InvalidConfigurationError
+
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_MESSAGE_TEMPLATE
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.templates import compile_template
+
+
+ANSWER_OPTIONS = {
+    'jira_project_key': ['', 'DEV'],
+    'issue_epic_number': ['', '959'],
+    'issue_subtasks': ['', '1033, 1034,1033'],
+    'issue_related_tasks': ['', ' 1005 '],
+    'commit_scope': ['', ' api '],
+    'commit_title': ['Create the validator.', ' add validator '],
+    'commit_description': ['', 'Allow us to apply multiple validators'],
+    'is_breaking_change': [False, True],
+    'footer': ['', 'CZ-1032 #done\n'],
+}
+
+
+def all_answers():
+    for values in itertools.product(*ANSWER_OPTIONS.values()):
+        yield {
+            'issue_number': '1032',
+            'commit_type': 'feat',
+            **dict(zip(ANSWER_OPTIONS, values)),
+        }
+
+
+ANSWERS = {
+    'jira_project_key': 'DEV',
+    'issue_number': '1032',
+    'commit_type': 'feat',
+    'commit_title': 'Create the validator.',
+}
+
+
+@pytest.mark.parametrize(
+    'answers, expected',
+    [
+        ({}, 'feat: create the validator [DEV-1032]'),
+        (
+            {'jira_project_key': '', 'commit_scope': ' api ', 'commit_title': 'Add it. '},
+            'feat(api): add it [CZ-1032]',
+        ),
+        (
+            {'is_breaking_change': True},
+            'feat!: create the validator [DEV-1032]\n\nBREAKING CHANGE',
+        ),
+        (
+            {'is_breaking_change': True, 'commit_description': 'Drop the old one'},
+            'feat!: create the validator [DEV-1032]\n\nBREAKING CHANGE: Drop the old one',
+        ),
+        (
+            {'commit_description': 'Allow us to apply multiple validators'},
+            'feat: create the validator [DEV-1032]\n\n'
+            'Allow us to apply multiple validators',
+        ),
+        (
+            {'issue_subtasks': '1033, 1034,1033'},
+            'feat: create the validator [DEV-1032]\n\n\n\n'
+            'issue subtasks: [DEV-1033, DEV-1034]',
+        ),
+        (
+            {
+                'issue_epic_number': '959',
+                'issue_subtasks': '1033',
+                'issue_related_tasks': ' 1005 ',
+                'footer': 'CZ-1032 #done\n',
+            },
+            'feat: create the validator [DEV-1032]\n\n\n\n'
+            'issue epic: [DEV-959]\n'
+            'issue subtasks: [DEV-1033]\n'
+            'issue related tasks: [DEV-1005]\n\n'
+            'CZ-1032 #done',
+        ),
+        (
+            {'commit_description': 'Body', 'issue_related_tasks': '1005'},
+            'feat: create the validator [DEV-1032]\n\n'
+            'Body\n\n'
+            'issue related tasks: [DEV-1005]',
+        ),
+    ],
+)
+def test_default_template_should_render_the_message(
+    setup_tmpdir, default_config, answers, expected
+):
+    default_config.update({'jira_project_key': 'CZ'})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+
+    assert cz.message({**ANSWERS, **answers}) == expected
+
+
+@pytest.mark.parametrize('user_jira_project_key', [None, 'CZ'])
+def test_default_message_should_be_the_default_template_one(
+    setup_tmpdir, default_config, user_jira_project_key
+):
+    default_config.update({'jira_project_key': user_jira_project_key})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    render = compile_template(DEFAULT_COMMIT_MESSAGE_TEMPLATE)
+
+    for answers in all_answers():
+        assert cz.message(answers) == render(cz.get_message_fields(answers)).rstrip()
+
+
+def test_custom_template_should_be_used(setup_tmpdir, default_config):
+    default_config.update(
+        {
+            'commit_message_template': (
+                '[{issue}] {commit_type}: {commit_title}'
+                '{?issue_epic}\n\nEpic: {issue_epic}{/issue_epic}'
+                '{!issue_epic}\n\nNo epic{/issue_epic}'
+            )
+        }
+    )
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    answers = {
+        'jira_project_key': 'DEV',
+        'issue_number': '1',
+        'commit_type': 'fix',
+        'commit_title': 'Fix the {braces}',
+        'issue_epic_number': '2',
+    }
+
+    assert cz.message(answers) == '[DEV-1] fix: fix the {braces}\n\nEpic: DEV-2'
+    assert cz.message({**answers, 'issue_epic_number': ''}).endswith('No epic')
+
+
+@pytest.mark.parametrize(
+    'template',
+    ['{unknown}', '{?footer}never closed', '{/footer}', '{?footer}{/body}', 'a { b'],
+)
+def test_invalid_template_should_raise_InvalidConfigurationError(
+    setup_tmpdir, default_config, template
+):
+    default_config.update({'commit_message_template': template})
+
+    with pytest.raises(InvalidConfigurationError):
+        CzBitbucketJiraPlugin(config=default_config)
+
+
+def test_literal_braces_should_be_escaped():
+    render = compile_template("{{{commit_type}}} '\\n' }}")
+
+    assert render({'commit_type': 'feat'}) == "{feat} '\\n' }"
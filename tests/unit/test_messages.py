@@ -0,0 +1,111 @@
+import io
+import json
+
+import pytest
+
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.messages import read_answer_records
+from cz_bitbucket_jira_plugin.messages import render_messages
+from cz_bitbucket_jira_plugin.type_search import load_recent_types
+
+
+VALID_ANSWERS = {
+    'jira_project_key': 'DEV',
+    'issue_number': 1032,
+    'issue_subtasks': '1033, 1034',
+    'commit_type': 'feat',
+    'commit_title': 'Create `apply_multiple_validators` function.',
+    'commit_description': 'Allow us to apply multiple validators to a single question',
+    'is_breaking_change': False,
+}
+
+EXPECTED_MESSAGE = (
+    'feat: create `apply_multiple_validators` function [DEV-1032]\n'
+    '\n'
+    'Allow us to apply multiple validators to a single question\n'
+    '\n'
+    'issue subtasks: [DEV-1033, DEV-1034]'
+)
+
+
+@pytest.fixture
+def cz(setup_tmpdir, default_config):
+    return CzBitbucketJiraPlugin(config=default_config)
+
+
+def test_valid_records_should_be_rendered(cz):
+    rendered = list(render_messages(cz, [VALID_ANSWERS, VALID_ANSWERS]))
+
+    assert [message.record for message in rendered] == [1, 2]
+    assert [message.message for message in rendered] == [EXPECTED_MESSAGE] * 2
+    assert not any(message.errors for message in rendered)
+
+
+def test_invalid_records_should_not_stop_the_stream(cz):
+    records = [
+        {**VALID_ANSWERS, 'issue_number': 'DEV'},
+        {**VALID_ANSWERS, 'commit_type': 'chore', 'commit_title': 'short'},
+        ValueError('Invalid JSON'),
+        VALID_ANSWERS,
+    ]
+
+    rendered = list(render_messages(cz, records))
+
+    assert rendered[0].errors == ['issue_number: Value must be integer.']
+    assert len(rendered[1].errors) == 2
+    assert rendered[2].errors == ['Invalid JSON']
+    assert rendered[3].message == EXPECTED_MESSAGE
+
+
+def test_csv_records_should_be_normalized(cz):
+    file = io.StringIO(
+        'jira_project_key,issue_number,commit_type,commit_title,is_breaking_change\n'
+        'DEV,7,fix,Fix the parser when the title is empty,yes\n'
+    )
+
+    (rendered,) = render_messages(cz, read_answer_records(file, input_format='csv'))
+
+    assert rendered.message == (
+        'fix!: fix the parser when the title is empty [DEV-7]\n\nBREAKING CHANGE'
+    )
+
+
+def test_render_command_should_write_one_line_per_record(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'cz.toml').write_text(
+        '[tool.commitizen]\n'
+        'name = "cz-bitbucket-jira-plugin"\n'
+        'jira_url = "https://dracula.atlassian.net"\n'
+    )
+    (tmp_path / 'answers.jsonl').write_text(
+        f'{json.dumps(VALID_ANSWERS)}\nnot json\n{json.dumps(VALID_ANSWERS)}\n'
+    )
+
+    exit_code = main(['render', 'answers.jsonl', '--output', 'messages.jsonl'])
+    lines = (tmp_path / 'messages.jsonl').read_text().splitlines()
+
+    assert exit_code == 1
+    assert [json.loads(line).get('message') for line in lines] == [
+        EXPECTED_MESSAGE,
+        None,
+        EXPECTED_MESSAGE,
+    ]
+
+
+def test_records_should_be_validated_without_side_effects(
+    setup_tmpdir, default_config, monkeypatch
+):
+    default_config.update({'commit_type_search': True, 'prefill_answers': True})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+
+    def fail():
+        raise AssertionError('Nothing is read from git on batch renders')
+
+    monkeypatch.setattr(cz, 'get_prefilled_answers', fail)
+    monkeypatch.setattr(cz, 'get_staged_project_key', fail)
+
+    rendered = list(render_messages(cz, [{**VALID_ANSWERS, 'commit_type': 'FEAT'}]))
+
+    assert rendered[0].message == EXPECTED_MESSAGE
+    assert load_recent_types() == []
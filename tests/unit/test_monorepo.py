@@ -0,0 +1,207 @@
+import re
+import subprocess
+
+import pytest
+from commitizen.exceptions import InvalidConfigurationError
+
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.git_log import iter_git_log_paths
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.monorepo import ComponentMatcher
+from cz_bitbucket_jira_plugin.monorepo import glob_to_regex
+from cz_bitbucket_jira_plugin.monorepo import load_components
+
+
+COMPONENTS = {
+    'billing': {
+        'paths': ['services/billing/**', 'libs/invoices'],
+        'scopes': ['billing'],
+        'jira_project_key': 'BILL',
+        'changelog_file': 'services/billing/CHANGELOG.md',
+    },
+    'shop': {
+        'paths': ['services/shop/**/*.py'],
+        'jira_project_key': 'SHOP',
+        'changelog_file': 'services/shop/CHANGELOG.md',
+    },
+    'docs': {'paths': ['**/*.md'], 'changelog_file': 'docs/CHANGELOG.md'},
+}
+
+CONFIG = """\
+[tool.commitizen]
+name = "cz_bitbucket_jira_plugin"
+jira_url = "https://dracula.atlassian.net"
+
+[tool.commitizen.components.billing]
+paths = ["services/billing/**"]
+scopes = ["billing"]
+changelog_file = "services/billing/CHANGELOG.md"
+
+[tool.commitizen.components.shop]
+paths = ["services/shop"]
+changelog_file = "services/shop/CHANGELOG.md"
+"""
+
+
+@pytest.fixture
+def matcher():
+    return ComponentMatcher(load_components({'components': COMPONENTS}))
+
+
+@pytest.mark.parametrize(
+    'glob, path, expected',
+    [
+        ('services/billing/**', 'services/billing/api/views.py', True),
+        ('services/billing/**', 'services/billing-v2/views.py', False),
+        ('libs/invoices', 'libs/invoices/pdf.py', True),
+        ('libs/invoices', 'libs/invoices', True),
+        ('libs/invoices', 'libs/invoices2/pdf.py', False),
+        ('services/*/setup.py', 'services/shop/setup.py', True),
+        ('services/*/setup.py', 'services/shop/api/setup.py', False),
+        ('**/*.md', 'README.md', True),
+        ('**/*.md', 'docs/guide/index.md', True),
+        ('src/v?.py', 'src/v1.py', True),
+        ('src/v?.py', 'src/v10.py', False),
+        ('/libs/a.b/', 'libs/a.b/c', True),
+        ('/libs/a.b/', 'libs/aXb/c', False),
+    ],
+)
+def test_glob_to_regex(glob, path, expected):
+    assert bool(re.fullmatch(glob_to_regex(glob), path)) is expected
+
+
+def test_matcher_should_match_paths_and_scopes(matcher):
+    assert matcher.match(['services/billing/api.py']) == {0}
+    assert matcher.match(['services/shop/cart/models.py', 'README.md']) == {1, 2}
+    assert matcher.match(['setup.py'], scope='billing') == {0}
+    assert matcher.match(['setup.py'], scope='shop') == set()
+    assert matcher.get_project_keys(['libs/invoices/pdf.py', 'README.md']) == {'BILL'}
+
+
+def test_matcher_should_match_each_path_once(matcher):
+    for _ in range(3):
+        matcher.match(['services/billing/api.py', 'services/billing/api.py'])
+
+    assert matcher.match_path.cache_info().misses == 1
+
+
+@pytest.mark.parametrize(
+    'components',
+    [
+        {'billing': 'services/billing'},
+        {'billing': {'paths': 'services/billing', 'scopes': [1]}},
+        {'billing': {'jira_project_key': 'BILL'}},
+    ],
+)
+def test_invalid_components_should_raise(setup_tmpdir, default_config, components):
+    default_config.update({'components': components})
+
+    with pytest.raises(InvalidConfigurationError, match='components'):
+        CzBitbucketJiraPlugin(config=default_config)
+
+
+def test_git_log_paths_should_list_each_commit_files(make_git_repository):
+    repository = make_git_repository(
+        [
+            ('feat: first', ['a/x.py', 'b/y.py']),
+            'chore: empty\n\nwith a body',
+            ('fix: second', ['b/z.py']),
+        ]
+    )
+
+    history = list(iter_git_log_paths(fields=('title', 'body'), cwd=repository))
+
+    assert history == [
+        (('fix: second', ''), ['b/z.py']),
+        (('chore: empty', 'with a body'), []),
+        (('feat: first', ''), ['a/x.py', 'b/y.py']),
+    ]
+
+
+@pytest.mark.parametrize(
+    'staged_paths, expected',
+    [
+        (['services/billing/api.py', 'libs/invoices/pdf.py', 'README.md'], 'BILL'),
+        (['services/billing/api.py', 'services/shop/cart.py'], ''),
+        (['setup.py'], ''),
+    ],
+)
+def test_questions_should_preselect_the_staged_project_key(
+    default_config, make_git_repository, monkeypatch, staged_paths, expected
+):
+    repository = make_git_repository(['chore: init'])
+    (repository / 'cz.toml').write_text(CONFIG)
+    monkeypatch.chdir(repository)
+
+    for path in staged_paths:
+        (repository / path).parent.mkdir(parents=True, exist_ok=True)
+        (repository / path).write_text('')
+
+    subprocess.run(['git', 'add', *staged_paths], cwd=repository, check=True)
+    default_config.update({'components': COMPONENTS})
+
+    questions = CzBitbucketJiraPlugin(config=default_config).questions()
+
+    assert questions[0]['name'] == 'jira_project_key'
+    assert questions[0]['default'] == expected
+
+
+def test_components_changelog_should_read_the_history_once(
+    make_git_repository, monkeypatch, capsys
+):
+    repository = make_git_repository(
+        [
+            ('feat: add invoices [BILL-1]', ['services/billing/invoices.py']),
+            ('feat: add cart [SHOP-1]', ['services/shop/cart.py']),
+            'fix(billing): round the totals [BILL-2]',
+            ('refactor: share the money type [CORE-1]', ['libs/money.py']),
+            (
+                'fix: checkout with invoices [SHOP-2]',
+                ['services/shop/checkout.py', 'services/billing/api.py'],
+            ),
+        ]
+    )
+    (repository / 'cz.toml').write_text(CONFIG)
+    monkeypatch.chdir(repository)
+
+    git_logs = []
+    popen = subprocess.Popen
+
+    def counting_popen(command, *args, **kwargs):
+        if command[:2] == ['git', 'log']:
+            git_logs.append(command)
+
+        return popen(command, *args, **kwargs)
+
+    monkeypatch.setattr(subprocess, 'Popen', counting_popen)
+
+    assert main(['components-changelog']) == 0
+
+    assert len(git_logs) == 1
+    assert capsys.readouterr().out.split() == [
+        'services/billing/CHANGELOG.md',
+        'services/shop/CHANGELOG.md',
+    ]
+
+    billing = (repository / 'services/billing/CHANGELOG.md').read_text()
+    shop = (repository / 'services/shop/CHANGELOG.md').read_text()
+
+    assert 'add invoices [BILL-1]' in billing
+    assert 'round the totals [BILL-2]' in billing
+    assert 'checkout with invoices [SHOP-2]' in billing
+    assert 'cart' not in billing
+    assert 'add cart [SHOP-1]' in shop
+    assert 'checkout with invoices [SHOP-2]' in shop
+    assert 'BILL' not in shop
+    assert 'CORE-1' not in billing + shop
+
+
+def test_components_changelog_without_components_should_fail(
+    make_git_repository, monkeypatch, capsys
+):
+    repository = make_git_repository(['feat: add cart [SHOP-1]'])
+    (repository / 'cz.toml').write_text(CONFIG.partition('\n\n')[0])
+    monkeypatch.chdir(repository)
+
+    assert main(['components-changelog']) == 2
+    assert 'components' in capsys.readouterr().err
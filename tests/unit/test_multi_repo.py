@@ -0,0 +1,242 @@
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cz_bitbucket_jira_plugin import multi_repo
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.defaults import CHANGELOG_TYPE_MAP
+from cz_bitbucket_jira_plugin.defaults import CHANGELOG_TYPE_ORDER
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+from cz_bitbucket_jira_plugin.multi_repo import load_repositories
+from cz_bitbucket_jira_plugin.multi_repo import merge_entries
+from cz_bitbucket_jira_plugin.multi_repo import MergedEntry
+from cz_bitbucket_jira_plugin.multi_repo import parse_repository_log
+from cz_bitbucket_jira_plugin.multi_repo import read_repositories
+from cz_bitbucket_jira_plugin.multi_repo import render_markdown
+from cz_bitbucket_jira_plugin.multi_repo import Repository
+from cz_bitbucket_jira_plugin.parsers import build_commit_parser
+
+
+BROWSE_URL = 'https://dracula.atlassian.net/browse/'
+COMMIT_PARSER = build_commit_parser(
+    tuple(commit_type['value'] for commit_type in DEFAULT_COMMIT_TYPES)
+)
+
+CONFIG = """\
+[tool.commitizen]
+name = "cz_bitbucket_jira_plugin"
+jira_url = "https://dracula.atlassian.net"
+repositories = ["api", {path = "web", name = "frontend"}]
+"""
+
+# Oldest first
+API_MESSAGES = [
+    'feat(auth): add the login [DEV-1]',
+    'chore: bump the dependencies',
+    'fix: reject empty passwords [DEV-2]',
+]
+WEB_MESSAGES = [
+    'feat: add the login form [dev-1]',
+    'Merge branch main',
+    'feat!: drop the old layout [DEV-3]',
+]
+
+
+def parse(name, commits):
+    return parse_repository_log(
+        Repository(name, None), commits, COMMIT_PARSER, CHANGELOG_TYPE_MAP
+    )
+
+
+def test_load_repositories(tmp_path):
+    settings = {
+        'repositories': [
+            'api',
+            {'path': '/srv/web', 'name': 'frontend', 'rev_range': 'v1..HEAD'},
+        ]
+    }
+
+    assert load_repositories(settings, tmp_path) == [
+        Repository('api', tmp_path / 'api'),
+        Repository('frontend', Path('/srv/web'), 'v1..HEAD'),
+    ]
+
+    with pytest.raises(ValueError, match='must be a path'):
+        load_repositories({'repositories': [{'name': 'api'}]})
+
+
+def test_parse_repository_log_should_use_the_plugin_rules():
+    entries = parse(
+        'api',
+        [
+            ('a' * 40, '300', 'fix: reject empty passwords [dev-2]'),
+            ('b' * 40, '200', 'chore: bump the dependencies'),
+            ('c' * 40, '100', 'Merge branch main'),
+            ('d' * 40, '50', 'refactor!: split the models'),
+        ],
+    )
+
+    assert [(entry.section, entry.title, entry.issue) for entry in entries] == [
+        ('Bug fixes', 'reject empty passwords', 'DEV-2'),
+        ('BREAKING CHANGE', 'split the models', None),
+    ]
+    assert entries[0].timestamp == 300
+
+
+def test_merge_entries_should_deduplicate_issues_across_repositories():
+    day = 1_700_000_000
+    api = parse(
+        'api',
+        [
+            ('a' * 40, str(day + 30), 'fix: reject empty passwords [DEV-2]'),
+            ('b' * 40, str(day + 10), 'feat(auth): add the login [DEV-1]'),
+        ],
+    )
+    web = parse(
+        'web',
+        [
+            ('c' * 40, str(day + 20), 'feat: add the login form [DEV-1]'),
+            ('d' * 40, str(day - 86_400), 'feat: add the layout'),
+        ],
+    )
+    entries = merge_entries([api, web])
+
+    assert entries == [
+        MergedEntry(
+            '2023-11-14',
+            'Bug fixes',
+            None,
+            'reject empty passwords',
+            'DEV-2',
+            (('api', 'a' * 40),),
+        ),  # fmt: skip
+        MergedEntry(
+            '2023-11-14',
+            'New features',
+            None,
+            'add the login form',
+            'DEV-1',
+            (('web', 'c' * 40), ('api', 'b' * 40)),
+        ),  # fmt: skip
+        MergedEntry(
+            '2023-11-13',
+            'New features',
+            None,
+            'add the layout',
+            None,
+            (('web', 'd' * 40),),
+        ),  # fmt: skip
+    ]
+    assert ''.join(render_markdown(entries, BROWSE_URL, CHANGELOG_TYPE_ORDER)) == (
+        '## 2023-11-14\n'
+        '\n'
+        '### New features\n'
+        '\n'
+        f'- add the login form [DEV-1]({BROWSE_URL}DEV-1) (web@ccccccc, api@bbbbbbb)\n'
+        '\n'
+        '### Bug fixes\n'
+        '\n'
+        f'- reject empty passwords [DEV-2]({BROWSE_URL}DEV-2) (api@aaaaaaa)\n'
+        '\n'
+        '## 2023-11-13\n'
+        '\n'
+        '### New features\n'
+        '\n'
+        '- add the layout (web@ddddddd)\n'
+        '\n'
+    )
+
+
+def test_read_repositories_should_cache_by_head(make_git_repository, monkeypatch):
+    repositories = [
+        Repository('api', make_git_repository(API_MESSAGES, name='api')),
+        Repository('web', make_git_repository(WEB_MESSAGES, name='web')),
+    ]
+
+    def read():
+        return read_repositories(
+            repositories, COMMIT_PARSER, CHANGELOG_TYPE_MAP, workers=2
+        )
+
+    first = read()
+
+    assert [[entry.issue for entry in entries] for entries in first] == [
+        ['DEV-2', 'DEV-1'],
+        ['DEV-3', 'DEV-1'],
+    ]
+
+    calls = []
+    iter_git_log = multi_repo.iter_git_log
+
+    def counted_iter_git_log(*args, **kwargs):
+        calls.append(kwargs['cwd'])
+        return iter_git_log(*args, **kwargs)
+
+    monkeypatch.setattr(multi_repo, 'iter_git_log', counted_iter_git_log)
+
+    assert read() == first
+    assert calls == []
+
+    subprocess.run(
+        ['git', 'commit', '-q', '--allow-empty', '-m', 'fix: center the form [DEV-4]'],
+        cwd=repositories[1].path,
+        check=True,
+        env={
+            **os.environ,
+            'GIT_AUTHOR_NAME': 'Dracula',
+            'GIT_AUTHOR_EMAIL': 'dracula@transylvania.ro',
+            'GIT_COMMITTER_NAME': 'Dracula',
+            'GIT_COMMITTER_EMAIL': 'dracula@transylvania.ro',
+        },
+    )
+    second = read()
+
+    assert calls == [repositories[1].path]
+    assert second[0] == first[0]
+    assert second[1][0].issue == 'DEV-4'
+
+
+def test_read_repositories_should_cache_by_the_range_tips(make_git_repository):
+    path = make_git_repository(API_MESSAGES, name='api')
+    subprocess.run(['git', 'branch', 'release', 'HEAD~1'], cwd=path, check=True)
+    repositories = [Repository('api', path, 'release')]
+
+    def read(use_cache=True):
+        entries = read_repositories(
+            repositories, COMMIT_PARSER, CHANGELOG_TYPE_MAP, use_cache=use_cache
+        )
+
+        return [entry.issue for entry in entries[0]]
+
+    assert read() == ['DEV-1']
+
+    # The range ref moves, `HEAD` doesn't
+    subprocess.run(['git', 'branch', '-f', 'release', 'HEAD'], cwd=path, check=True)
+
+    assert read() == read(use_cache=False) == ['DEV-2', 'DEV-1']
+
+
+def test_changelog_repos_command(make_git_repository, tmp_path, monkeypatch, capsys):
+    make_git_repository(API_MESSAGES, name='api')
+    make_git_repository(WEB_MESSAGES, name='web')
+    (tmp_path / 'cz.toml').write_text(CONFIG)
+    monkeypatch.chdir(tmp_path)
+
+    assert main(['changelog-repos', '--format', 'json']) == 0
+
+    captured = capsys.readouterr()
+    entries = json.loads(captured.out)
+
+    assert sorted(entry['issue'] for entry in entries) == ['DEV-1', 'DEV-2', 'DEV-3']
+    assert {
+        name
+        for entry in entries
+        if entry['issue'] == 'DEV-1'
+        for name, _ in entry['refs']
+    } == {'api', 'frontend'}
+    assert '3 entries from 2 repositories.' in captured.err
+
+    assert main(['changelog-repos', str(tmp_path / 'missing')]) == 2
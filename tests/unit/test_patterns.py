@@ -0,0 +1,140 @@
+"""Every pattern of the plugin must match in linear time: a hostile or huge
+commit message (or config value) can't stall a hook, `cz bump` or `cz changelog`.
+
+Each use of a pattern gets 1 MB inputs built to make a backtracking engine retry
+work at every position. A quadratic pattern takes hours on them, so the time
+bound is generous.
+"""
+
+import random
+import re
+import time
+
+import pytest
+
+from cz_bitbucket_jira_plugin.bump import BumpClassifier
+from cz_bitbucket_jira_plugin.checker import check_commit_message
+from cz_bitbucket_jira_plugin.commit_index import extract_issue_keys
+from cz_bitbucket_jira_plugin.defaults import BUMP_MAP
+from cz_bitbucket_jira_plugin.defaults import BUMP_PATTERN
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+from cz_bitbucket_jira_plugin.defaults import JIRA_URL_PATTERN
+from cz_bitbucket_jira_plugin.parsers import build_commit_parser
+from cz_bitbucket_jira_plugin.parsers import ISSUE_FOOTER_PATTERN
+from cz_bitbucket_jira_plugin.parsers import split_issue_id
+from cz_bitbucket_jira_plugin.smart_commits import parse_smart_commands
+
+
+SIZE = 1_000_000
+TIME_BOUND = 2.0
+
+COMMIT_TYPES = tuple(commit_type['value'] for commit_type in DEFAULT_COMMIT_TYPES)
+COMMIT_PARSER = build_commit_parser(COMMIT_TYPES)
+
+LEGACY_JIRA_URL_PATTERN = re.compile(r'(http|https)://.*?\.net')
+
+ADVERSARIAL_UNITS = [
+    'http://',
+    'https://x.ne',
+    'a',
+    'A_1',
+    'feat(',
+    'feat(a)',
+    'feat(\n',
+    ')',
+    '[',
+    'x [a',
+    '[DEV-1, ',
+    'DEV-1 ',
+    'DEV-1,',
+    'issue epic: [',
+    'a:',
+    'a!',
+    ' ',
+    '#a ',
+    '1d ',
+]
+
+
+def repeat(unit: str, suffix: str = '') -> str:
+    return (unit * (SIZE // len(unit) + 1))[:SIZE] + suffix
+
+
+def parse_titles(message):
+    pattern = re.compile(COMMIT_PARSER, re.MULTILINE)
+    return pattern.findall(message)
+
+
+PATTERN_USES = {
+    'jira_url': JIRA_URL_PATTERN.search,
+    'commit_parser': re.compile(COMMIT_PARSER, re.MULTILINE).match,
+    # Commitizen matches the body paragraphs with `re.DOTALL`
+    'commit_parser_dotall': re.compile(COMMIT_PARSER, re.MULTILINE | re.DOTALL).match,
+    'commit_parser_lines': parse_titles,
+    'bump': BumpClassifier(BUMP_PATTERN, BUMP_MAP).classify,
+    'bump_keyword': BumpClassifier(BUMP_PATTERN, BUMP_MAP).keyword_pattern.match,
+    'issue_footer': ISSUE_FOOTER_PATTERN.findall,
+    'split_issue_id': split_issue_id,
+    'check': lambda message: check_commit_message(message, COMMIT_TYPES),
+    'commit_index': extract_issue_keys,
+    'smart_commits': parse_smart_commands,
+}
+
+
+@pytest.mark.parametrize('unit', ADVERSARIAL_UNITS)
+@pytest.mark.parametrize('use', PATTERN_USES)
+def test_patterns_should_match_in_linear_time(use, unit):
+    function = PATTERN_USES[use]
+
+    for message in (repeat(unit), repeat(unit, suffix='-1 #done')):
+        start = time.perf_counter()
+        function(message)
+
+        assert time.perf_counter() - start < TIME_BOUND
+
+
+def random_text(rng, tokens, length):
+    return ''.join(rng.choice(tokens) for _ in range(length))
+
+
+def test_jira_url_pattern_should_match_like_the_legacy_one():
+    rng = random.Random(0)
+    tokens = ['http://', 'https://', '.net', '.', 'n', 'et', 'x', '/', ':', ' ', '\n']
+
+    for _ in range(5_000):
+        url = random_text(rng, tokens, rng.randint(0, 12))
+        match = JIRA_URL_PATTERN.search(url)
+        legacy_match = LEGACY_JIRA_URL_PATTERN.search(url)
+
+        assert bool(match) is bool(legacy_match), url
+
+        if url.count('://') <= 1 and match:
+            assert match.group() == legacy_match.group(), url
+
+    assert (
+        JIRA_URL_PATTERN.search('https://dracula.atlassian.net/jira').group()
+        == 'https://dracula.atlassian.net'
+    )
+
+
+def test_commit_parser_should_match_like_the_legacy_one():
+    rng = random.Random(0)
+    legacy_parser = (
+        rf'^((?P<change_type>{"|".join([*COMMIT_TYPES, "BREAKING CHANGE"])})'
+        r'(?:\((?P<scope>[^()\r\n]*)\)|\()?(?P<breaking>!)?|\w+!):\s(?P<message>.*)?'
+    )
+    tokens = ['feat', 'fix', 'a', '(', ')', '!', ':', ' ', '\n', '[DEV-1]', 'é']
+
+    for flags in (re.MULTILINE, re.MULTILINE | re.DOTALL):
+        pattern = re.compile(COMMIT_PARSER, flags)
+        legacy_pattern = re.compile(legacy_parser, flags)
+
+        for _ in range(5_000):
+            message = random_text(rng, tokens, rng.randint(0, 10))
+            match = pattern.match(message)
+            legacy_match = legacy_pattern.match(message)
+
+            assert bool(match) is bool(legacy_match), message
+
+            if match:
+                assert match.groupdict() == legacy_match.groupdict(), message
@@ -0,0 +1,164 @@
+import subprocess
+
+import pytest
+
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+from cz_bitbucket_jira_plugin.git_log import get_branch_history
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.parsers import build_commit_parser
+from cz_bitbucket_jira_plugin.prefill import guess_answers
+from cz_bitbucket_jira_plugin.prefill import parse_branch_issue
+from cz_bitbucket_jira_plugin.prefill import read_answers
+
+
+COMMIT_PARSER = build_commit_parser(
+    tuple(commit_type['value'] for commit_type in DEFAULT_COMMIT_TYPES)
+)
+
+CONFIG = """\
+[tool.commitizen]
+name = "cz_bitbucket_jira_plugin"
+jira_url = "https://dracula.atlassian.net"
+"""
+
+MESSAGES = [
+    'chore: init',
+    'feat(api): add the answers [DEV-1234]\n\n'
+    'issue epic: [DEV-1000]\n'
+    'issue subtasks: [DEV-1235, DEV-1236]\n'
+    'issue related tasks: [OPS-7, DEV-1300]',
+    'fix(ui): unrelated change [DEV-99]\n\nissue epic: [DEV-90]',
+]
+
+
+@pytest.fixture
+def repository(make_git_repository, monkeypatch):
+    path = make_git_repository(MESSAGES)
+    subprocess.run(
+        ['git', 'checkout', '-q', '-b', 'feature/DEV-1234-answers'],
+        cwd=path,
+        check=True,
+    )
+    (path / 'cz.toml').write_text(CONFIG)
+    monkeypatch.chdir(path)
+
+    return path
+
+
+@pytest.mark.parametrize(
+    'branch, expected',
+    [
+        ('feature/DEV-1234-answers', ('DEV', '1234')),
+        ('DEV-12', ('DEV', '12')),
+        ('bugfix/OPS_2-7/DEV-8', ('OPS_2', '7')),
+        ('release-2024', None),
+        ('feature/xDEV-12', None),
+        ('main', None),
+        (None, None),
+    ],
+)
+def test_parse_branch_issue(branch, expected):
+    assert parse_branch_issue(branch) == expected
+
+
+def test_branch_history_should_read_the_branch_and_its_commits(repository):
+    branch, commits = get_branch_history(2, cwd=repository)
+
+    assert branch == 'feature/DEV-1234-answers'
+    assert [title for title, _ in commits] == [
+        'fix(ui): unrelated change [DEV-99]',
+        'feat(api): add the answers [DEV-1234]',
+    ]
+    assert commits[0][1] == 'issue epic: [DEV-90]'
+
+
+def test_branch_history_outside_a_repository_should_be_empty(tmp_path):
+    assert get_branch_history(cwd=tmp_path) == (None, [])
+
+
+def test_answers_should_come_from_the_commit_of_the_branch_issue(repository):
+    assert read_answers(str(repository), COMMIT_PARSER) == {
+        'jira_project_key': 'DEV',
+        'issue_number': '1234',
+        'issue_epic_number': '1000',
+        'issue_subtasks': '1235, 1236',
+        'issue_related_tasks': '1300',
+        'commit_scope': 'api',
+    }
+
+
+def test_answers_without_a_branch_issue_should_come_from_the_last_commit():
+    commits = [
+        (title, body)
+        for title, _, body in (
+            message.partition('\n\n') for message in reversed(MESSAGES)
+        )
+    ]
+
+    assert guess_answers('main', commits, COMMIT_PARSER) == {
+        'jira_project_key': 'DEV',
+        'issue_number': '99',
+        'issue_epic_number': '90',
+        'commit_scope': 'ui',
+    }
+    assert guess_answers('feature/OPS-1', commits, COMMIT_PARSER) == {
+        'jira_project_key': 'OPS',
+        'issue_number': '1',
+    }
+    assert guess_answers(None, [], COMMIT_PARSER) == {}
+
+
+def test_questions_should_default_to_the_prefilled_answers(repository, default_config):
+    default_config.update({'prefill_answers': True})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    questions = {question['name']: question for question in cz.questions()}
+
+    assert questions['jira_project_key']['default'] == 'DEV'
+    assert questions['issue_subtasks']['default'] == '1235, 1236'
+    assert questions['commit_scope']['default'] == 'api'
+    assert 'default' not in questions['commit_title']
+    assert not any('when' in question for question in questions.values())
+
+
+def test_answered_questions_should_be_skipped(repository, default_config):
+    default_config.update({'prefill_answers': True, 'prefill_skip_answered': True})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    skipped = [
+        question['name']
+        for question in cz.questions()
+        if 'when' in question and not question['when']({})
+    ]
+
+    assert skipped == [
+        'jira_project_key',
+        'issue_epic_number',
+        'issue_number',
+        'issue_subtasks',
+        'issue_related_tasks',
+        'commit_scope',
+    ]
+    assert cz.get_prompt_project_key() == 'DEV'
+
+    message = cz.message(
+        {
+            'commit_type': 'feat',
+            'commit_title': 'ask fewer questions',
+            'is_breaking_change': False,
+        }
+    )
+
+    assert message.startswith('feat(api): ask fewer questions [DEV-1234]')
+    assert 'issue epic: [DEV-1000]' in message
+    assert 'issue subtasks: [DEV-1235, DEV-1236]' in message
+
+
+def test_questions_without_prefill_should_not_read_git(
+    repository, default_config, monkeypatch
+):
+    monkeypatch.setattr(
+        'cz_bitbucket_jira_plugin.prefill.read_answers',
+        lambda *args, **kwargs: pytest.fail('git was read'),
+    )
+    questions = CzBitbucketJiraPlugin(config=default_config).questions()
+
+    assert questions[0]['default'] == ''
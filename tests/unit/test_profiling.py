@@ -0,0 +1,123 @@
+import json
+
+import pytest
+from commitizen import git
+
+from cz_bitbucket_jira_plugin import profiling
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.profiling import get_profiler
+from cz_bitbucket_jira_plugin.profiling import PROFILE_ENV_VAR
+from cz_bitbucket_jira_plugin.profiling import Profiler
+
+
+ANSWERS = {
+    'jira_project_key': 'DEV',
+    'issue_number': '1',
+    'commit_type': 'feat',
+    'commit_title': 'add validator',
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_profiler(monkeypatch):
+    monkeypatch.setattr(profiling, '_profiler', None)
+
+    yield
+
+    if profiling._profiler is not None:
+        profiling._profiler.close()
+
+
+def use_plugin(config):
+    cz = CzBitbucketJiraPlugin(config=config)
+    cz.message(ANSWERS)
+    cz.message(ANSWERS)
+
+    for rev in range(3):
+        commit = git.GitCommit(rev=f'{rev:040x}', title='feat: add validator [DEV-1]')
+        parsed_message = {'change_type': 'feat', 'message': 'add validator [DEV-1]'}
+        cz.changelog_message_builder_hook(parsed_message, commit)
+
+    return cz
+
+
+def test_disabled_profiling_should_not_wrap_anything(setup_tmpdir, default_config):
+    cz = use_plugin(default_config)
+
+    assert get_profiler() is None
+    assert 'message' not in vars(cz)
+    assert 'changelog_message_builder_hook' not in vars(cz)
+
+
+def test_profile_should_count_and_time_each_stage(
+    setup_tmpdir, default_config, monkeypatch, tmp_path
+):
+    path = tmp_path / 'profile.json'
+    monkeypatch.setenv(PROFILE_ENV_VAR, str(path))
+
+    use_plugin(default_config)
+    get_profiler().close()
+
+    profile = json.loads(path.read_text())
+    stages = profile['stages']
+
+    assert stages['plugin.__init__']['calls'] == 1
+    assert stages['plugin.message']['calls'] == 2
+    assert stages['plugin.changelog_message_builder_hook']['calls'] == 3
+    assert stages['plugin.message']['total_ms'] >= stages['plugin.message']['max_ms']
+    assert set(profile['pattern_caches']['parsers.compile_commit_parser']) == {
+        'misses',
+        'hits',
+    }
+    assert set(profile['config_files']) == {'memory', 'snapshot', 'parsed'}
+
+
+def test_trace_json_files_should_be_chrome_traces(
+    setup_tmpdir, default_config, monkeypatch, tmp_path
+):
+    path = tmp_path / 'cz.trace.json'
+    monkeypatch.setenv(PROFILE_ENV_VAR, str(path))
+
+    use_plugin(default_config)
+    get_profiler().close()
+
+    trace = json.loads(path.read_text())
+    hook_events = [
+        event
+        for event in trace['traceEvents']
+        if event['name'] == 'plugin.changelog_message_builder_hook'
+    ]
+
+    assert len(hook_events) == 3
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in hook_events)
+    assert hook_events[0]['ts'] < hook_events[1]['ts'] < hook_events[2]['ts']
+    assert trace['otherData']['stages']['plugin.message']['calls'] == 2
+
+
+def test_profile_config_key_should_enable_profiling(
+    setup_tmpdir, default_config, tmp_path
+):
+    path = tmp_path / 'profile.json'
+    default_config.update({'profile': str(path)})
+
+    cz = use_plugin(default_config)
+    get_profiler().close()
+
+    assert 'message' in vars(cz)
+    assert json.loads(path.read_text())['stages']['plugin.message']['calls'] == 2
+
+
+def test_cli_commands_should_be_profiled(monkeypatch, tmp_path):
+    path = tmp_path / 'profile.json'
+    monkeypatch.setenv(PROFILE_ENV_VAR, str(path))
+
+    assert main(['check', '-m', 'feat: add validator [DEV-1]']) == 0
+    get_profiler().close()
+
+    assert json.loads(path.read_text())['stages']['cli.check']['calls'] == 1
+
+
+def test_unknown_format_should_raise(tmp_path):
+    with pytest.raises(ValueError, match='flamegraph'):
+        Profiler(str(tmp_path / 'profile.json'), 'flamegraph')
@@ -0,0 +1,143 @@
+import time
+import tracemalloc
+
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.defaults import CHANGELOG_TYPE_MAP
+from cz_bitbucket_jira_plugin.defaults import CHANGELOG_TYPE_ORDER
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+from cz_bitbucket_jira_plugin.parsers import build_commit_parser
+from cz_bitbucket_jira_plugin.release_notes import collect_release_notes
+from cz_bitbucket_jira_plugin.release_notes import get_epic
+from cz_bitbucket_jira_plugin.release_notes import render_release_notes
+
+
+BROWSE_URL = 'https://dracula.atlassian.net/browse/'
+COMMIT_PARSER = build_commit_parser(
+    tuple(commit_type['value'] for commit_type in DEFAULT_COMMIT_TYPES)
+)
+
+# Newest first, like `git log`
+COMMITS = [
+    ('a' * 40, 'fix(api): reject empty answers [DEV-5]\n\nissue epic: [DEV-1]'),
+    ('b' * 40, 'feat: add the index [DEV-4]\n\nissue epic: [DEV-2]'),
+    ('c' * 40, 'Merge branch main'),
+    ('d' * 40, 'feat!: drop the old prompt [DEV-3]\n\nBody.\n\nissue epic: [DEV-1]'),
+    ('e' * 40, 'chore: bump the dependencies'),
+    ('f' * 40, 'docs: explain the index [DEV-6]'),
+    (
+        '0' * 40,
+        'feat: add validators [DEV-2]\n\nissue epic: [dev-1]\nissue subtasks: [DEV-7]',
+    ),
+]
+
+CONFIG = """\
+[tool.commitizen]
+name = "cz_bitbucket_jira_plugin"
+jira_url = "https://dracula.atlassian.net"
+"""
+
+
+def collect(commits):
+    return collect_release_notes(commits, COMMIT_PARSER, BROWSE_URL, CHANGELOG_TYPE_MAP)
+
+
+def test_get_epic():
+    assert get_epic('Body.\n\nissue epic: [DEV-1]\nissue subtasks: [DEV-2]') == 'DEV-1'
+    assert get_epic('issue subtasks: [DEV-2]') is None
+    assert get_epic('the issue epic: [DEV-1] line') is None
+
+
+def test_release_notes_should_group_by_epic_then_section():
+    notes = collect(COMMITS)
+    markdown = ''.join(
+        render_release_notes(
+            notes,
+            BROWSE_URL,
+            CHANGELOG_TYPE_ORDER,
+            epic_summaries={'DEV-2': 'Issue index'},
+            title='v2.0.0',
+        )
+    )
+
+    assert notes.commits == 7
+    assert notes.epics == ['DEV-1', 'DEV-2']
+    assert markdown == (
+        '# v2.0.0\n'
+        '\n'
+        f'## [DEV-1]({BROWSE_URL}DEV-1)\n'
+        '\n'
+        '### BREAKING CHANGE\n'
+        '\n'
+        f'- drop the old prompt [DEV-3]({BROWSE_URL}DEV-3) (ddddddd)\n'
+        '\n'
+        '### New features\n'
+        '\n'
+        f'- add validators [DEV-2]({BROWSE_URL}DEV-2) (0000000)\n'
+        '\n'
+        '### Bug fixes\n'
+        '\n'
+        f'- **api**: reject empty answers [DEV-5]({BROWSE_URL}DEV-5) (aaaaaaa)\n'
+        '\n'
+        f'## Issue index ([DEV-2]({BROWSE_URL}DEV-2))\n'
+        '\n'
+        '### New features\n'
+        '\n'
+        f'- add the index [DEV-4]({BROWSE_URL}DEV-4) (bbbbbbb)\n'
+        '\n'
+        '## Other changes\n'
+        '\n'
+        '### Documentation updates\n'
+        '\n'
+        f'- explain the index [DEV-6]({BROWSE_URL}DEV-6) (fffffff)\n'
+        '\n'
+    )
+
+
+def synthetic_commits(count: int, body_size: int):
+    body = 'x' * body_size
+
+    for number in range(count):
+        yield (
+            f'{number:040x}',
+            f'feat: change {number} [DEV-{number}]\n\n{body}\n\n'
+            f'issue epic: [DEV-{number % 20}]',
+        )
+
+
+def test_release_notes_should_keep_only_the_entries():
+    # 100 MB of messages, read one at a time
+    tracemalloc.start()
+
+    try:
+        notes = collect(synthetic_commits(5_000, body_size=20_000))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert notes.entries == 5_000
+    assert len(notes.epics) == 20
+    # The entry lines, ~100 bytes each
+    assert peak < 5_000_000
+
+
+def test_release_notes_should_handle_large_ranges():
+    start = time.perf_counter()
+    notes = collect(synthetic_commits(100_000, body_size=500))
+    lines = sum(1 for _ in render_release_notes(notes, BROWSE_URL, CHANGELOG_TYPE_ORDER))
+
+    assert time.perf_counter() - start < 5
+    assert lines == 100_000 + 20 * 5
+
+
+def test_release_notes_command(make_git_repository, monkeypatch, capsys):
+    repository = make_git_repository([message for _, message in reversed(COMMITS)])
+    (repository / 'cz.toml').write_text(CONFIG)
+    monkeypatch.chdir(repository)
+
+    assert main(['release-notes', '--title', 'Next']) == 0
+
+    captured = capsys.readouterr()
+
+    assert captured.out.startswith('# Next\n\n## [DEV-1](')
+    assert '## [DEV-2](' in captured.out
+    assert '5 entries of 7 commit(s), 2 epic(s).' in captured.err
@@ -0,0 +1,50 @@
+import pytest
+from commitizen import git
+
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+
+
+def make_commits(count):
+    return [
+        git.GitCommit(
+            rev=f'{index:040x}',
+            title=f'feat: add validator number {index} [DEV-{index}]',
+            body='',
+        )
+        for index in range(count)
+    ] + [git.GitCommit(rev='f' * 40, title='not a conventional commit', body='')]
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_pool_should_keep_order_and_match_hook(setup_tmpdir, default_config, executor):
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    commits = make_commits(50)
+
+    entries = cz.render_changelog_entries(
+        commits, workers=2, executor=executor, chunk_size=7, serial_threshold=10
+    )
+
+    assert len(entries) == len(commits)
+    assert entries[-1] is None
+
+    for index, entry in enumerate(entries[:-1]):
+        assert entry['sha1'] == commits[index].rev
+        assert entry['message'].startswith(f'add validator number {index} [DEV-{index}]')
+
+
+def test_small_inputs_should_be_rendered_serially(setup_tmpdir, default_config):
+    cz = CzBitbucketJiraPlugin(config=default_config)
+
+    # An unknown executor is never looked up below the serial threshold.
+    entries = cz.render_changelog_entries(make_commits(3), workers=4, executor='nope')
+
+    assert len(entries) == 4
+
+
+def test_unknown_executor_should_raise_ValueError(setup_tmpdir, default_config):
+    cz = CzBitbucketJiraPlugin(config=default_config)
+
+    with pytest.raises(ValueError):
+        cz.render_changelog_entries(
+            make_commits(10), workers=2, executor='nope', serial_threshold=1
+        )
@@ -0,0 +1,151 @@
+import csv
+import io
+import json
+import os
+import subprocess
+
+import pytest
+
+from cz_bitbucket_jira_plugin import git_log
+from cz_bitbucket_jira_plugin.cli import main
+from cz_bitbucket_jira_plugin.smart_commits import aggregate
+from cz_bitbucket_jira_plugin.smart_commits import format_minutes
+from cz_bitbucket_jira_plugin.smart_commits import iter_range_commands
+from cz_bitbucket_jira_plugin.smart_commits import parse_smart_commands
+from cz_bitbucket_jira_plugin.smart_commits import parse_time
+from cz_bitbucket_jira_plugin.smart_commits import SmartCommand
+from cz_bitbucket_jira_plugin.smart_commits import SmartCommitCache
+from cz_bitbucket_jira_plugin.smart_commits import write_report
+
+
+# Oldest first
+MESSAGES = [
+    'feat: add validators [DEV-1]\n\nDEV-1 #start-review #time 1d 2h first pass',
+    'fix: validate the answers [DEV-1]\n\nDEV-1 DEV-2 #comment Fixed #12 too #time 30m',
+    'docs: explain the validators [DEV-2]',
+    'feat: finish validators [DEV-1]\n\nissue epic: [DEV-9]\n\nDEV-1 #done Ready',
+]
+
+
+@pytest.mark.parametrize(
+    'argument, expected',
+    [
+        ('1d 2h first pass', (600, 'first pass')),
+        ('1w', (2_400, '')),
+        ('1.5h', (90, '')),
+        ('30m', (30, '')),
+        ('later', (0, 'later')),
+        ('2hours', (0, '2hours')),
+    ],
+)
+def test_parse_time(argument, expected):
+    assert parse_time(argument) == expected
+
+
+def test_parse_smart_commands():
+    message = (
+        'feat: x [DEV-1]\n\n'
+        'Fixes the #1 issue\n'
+        'DEV-1, dev-2 #comment Fixed #12 too #time 1h 30m tuned #resolve\n'
+        '  DEV-3 #Close\n'
+        'issue related tasks: [DEV-4]\n'
+        'see DEV-5 #done'
+    )
+
+    assert parse_smart_commands(message) == (
+        SmartCommand(('DEV-1', 'DEV-2'), 'comment', 'Fixed #12 too', 0),
+        SmartCommand(('DEV-1', 'DEV-2'), 'time', 'tuned', 90),
+        SmartCommand(('DEV-1', 'DEV-2'), 'resolve', '', 0),
+        SmartCommand(('DEV-3',), 'close', '', 0),
+    )
+    assert parse_smart_commands('feat: x [DEV-1]') == ()
+
+
+def test_aggregate_should_total_each_issue():
+    commits = [
+        (f'{index:040x}', parse_smart_commands(message))
+        for index, message in enumerate(reversed(MESSAGES))
+    ]
+    activities = aggregate(commits)
+
+    assert activities['DEV-1'].to_dict() == {
+        'issue': 'DEV-1',
+        'commits': 3,
+        'time_minutes': 630,
+        'time': '1d 2h 30m',
+        'transitions': {'done': 1, 'start-review': 1},
+        'last_transition': 'done',
+        'comments': ['Fixed #12 too'],
+    }
+    assert activities['DEV-2'].minutes == 30
+    assert activities['DEV-2'].last_transition is None
+
+
+def test_format_minutes():
+    assert format_minutes(0) == '0m'
+    assert format_minutes(2_400 + 480 + 61) == '1w 1d 1h 1m'
+
+
+def test_report_formats():
+    activities = aggregate([('a' * 40, parse_smart_commands(MESSAGES[1]))])
+
+    output = io.StringIO()
+    write_report(activities, output, 'json')
+    assert [row['issue'] for row in json.loads(output.getvalue())] == ['DEV-1', 'DEV-2']
+
+    output = io.StringIO()
+    write_report(activities, output, 'csv')
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert rows[0]['time_minutes'] == '30'
+    assert rows[0]['comments'] == 'Fixed #12 too'
+
+
+def test_cache_should_only_parse_new_commits(make_git_repository, tmp_path, monkeypatch):
+    repository = make_git_repository(MESSAGES[:2])
+    cache = SmartCommitCache(tmp_path / 'smart_commits.pickle')
+
+    first = list(iter_range_commands(cache=cache, cwd=repository))
+    cache.save()
+
+    subprocess.run(
+        ['git', 'commit', '-q', '--allow-empty', '-m', MESSAGES[3]],
+        cwd=repository,
+        check=True,
+        env={
+            **os.environ,
+            'GIT_AUTHOR_NAME': 'Dracula',
+            'GIT_AUTHOR_EMAIL': 'dracula@transylvania.ro',
+            'GIT_COMMITTER_NAME': 'Dracula',
+            'GIT_COMMITTER_EMAIL': 'dracula@transylvania.ro',
+        },
+    )
+    read_revs = []
+    iter_git_log_revs = git_log.iter_git_log_revs
+
+    def recorded_iter_git_log_revs(revs, *args, **kwargs):
+        read_revs.extend(revs)
+        return iter_git_log_revs(revs, *args, **kwargs)
+
+    monkeypatch.setattr(git_log, 'iter_git_log_revs', recorded_iter_git_log_revs)
+    cache = SmartCommitCache(tmp_path / 'smart_commits.pickle')
+    second = list(iter_range_commands(cache=cache, cwd=repository))
+
+    assert (cache.hits, cache.misses) == (2, 1)
+    # Only the message of the new commit was read
+    assert read_revs == [second[0][0]]
+    assert second[1:] == first
+    assert second == list(iter_range_commands(cwd=repository))
+    assert second[0][1][0].command == 'done'
+
+
+def test_smart_commits_command(make_git_repository, monkeypatch, capsys):
+    monkeypatch.chdir(make_git_repository(MESSAGES))
+
+    assert main(['smart-commits', '--format', 'csv']) == 0
+
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+
+    assert [(row['issue'], row['time'], row['last_transition']) for row in rows] == [
+        ('DEV-1', '1d 2h 30m', 'done'),
+        ('DEV-2', '30m', ''),
+    ]
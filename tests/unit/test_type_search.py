@@ -0,0 +1,127 @@
+import time
+
+import pytest
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+
+from cz_bitbucket_jira_plugin.completers import CommitTypeCompleter
+from cz_bitbucket_jira_plugin.defaults import DEFAULT_COMMIT_TYPES
+from cz_bitbucket_jira_plugin.exceptions import UnknownCommitTypeException
+from cz_bitbucket_jira_plugin.main import CzBitbucketJiraPlugin
+from cz_bitbucket_jira_plugin.type_search import CommitTypeIndex
+from cz_bitbucket_jira_plugin.type_search import load_recent_types
+from cz_bitbucket_jira_plugin.validators import CommitTypeValidator
+
+
+def values(commit_types):
+    return [commit_type['value'] for commit_type in commit_types]
+
+
+def synthetic_types(count: int):
+    return [
+        {'value': f'type{number}', 'name': f'type{number}: change of team {number % 97}'}
+        for number in range(count)
+    ]
+
+
+@pytest.fixture
+def index():
+    return CommitTypeIndex(DEFAULT_COMMIT_TYPES)
+
+
+@pytest.mark.parametrize(
+    'query, expected',
+    [
+        # The value itself, then value prefixes, then name word prefixes
+        ('fix', ['fix', 'typo']),
+        ('f', ['feat', 'fix', 'delete', 'typo']),
+        # Anywhere in the value or the name from 3 characters only
+        ('te', ['test']),
+        ('ete', ['delete']),
+        ('DOC', ['docs']),
+        ('actor', ['perf', 'refactor']),
+        ('new feat', ['feat']),
+        ('  ', values(DEFAULT_COMMIT_TYPES)[:4]),
+        ('nothing like it', []),
+    ],
+)
+def test_search_should_rank_the_matches(index, query, expected):
+    assert values(index.search(query, limit=4)) == expected
+
+
+def test_search_should_rank_recent_types_first_in_their_tier(index):
+    index.set_recent(['typo', 'unknown', 'FIX', 'typo'])
+
+    assert index.recent_values == ['typo', 'fix']
+    assert values(index.search('', limit=3)) == ['typo', 'fix', 'init']
+    # `typo` is a name word prefix only, it stays after the value prefixes
+    assert values(index.search('f', limit=4)) == ['fix', 'feat', 'typo', 'delete']
+
+    index.remember('feat')
+
+    assert index.recent_values == ['feat', 'typo', 'fix']
+
+
+def test_search_should_be_fast_on_large_catalogs():
+    index = CommitTypeIndex(synthetic_types(10_000), recent=['type9999'])
+    queries = ['t', 'ty', 'type', 'type99', 'team 4', 'of team', 'zzz', '9999']
+
+    start = time.perf_counter()
+
+    for _ in range(10):
+        for query in queries:
+            index.search(query)
+
+    seconds = (time.perf_counter() - start) / (10 * len(queries))
+
+    assert values(index.search('type99', limit=3)) == ['type99', 'type9999', 'type990']
+    assert values(index.search('9999', limit=1)) == ['type9999']
+    # Far from the index bound, generous for slow CI machines
+    assert seconds < 0.005
+
+
+def test_completer_should_complete_the_values(index):
+    completer = CommitTypeCompleter(index, limit=2)
+    completions = list(completer.get_completions(Document('fi'), CompleteEvent()))
+
+    assert [completion.text for completion in completions] == ['fix', 'delete']
+    assert completions[0].start_position == -2
+    assert completions[0].display_text == 'fix: fix a bug'
+
+
+def test_validator_should_only_accept_known_types(index):
+    validator = CommitTypeValidator(index)
+
+    assert validator.validate(Document('Feat')) is True
+
+    with pytest.raises(UnknownCommitTypeException):
+        validator.validate(Document('fea'))
+
+
+def test_large_catalogs_should_be_searched_on_the_prompt(setup_tmpdir, default_config):
+    default_config.update({'commit_types': synthetic_types(30)})
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    question = next(q for q in cz.questions() if q['name'] == 'commit_type')
+
+    assert question['type'] == 'input'
+    assert isinstance(question['completer'], CommitTypeCompleter)
+    assert question['filter']('TYPE7') == 'type7'
+    assert load_recent_types() == ['type7']
+
+    # The next prompt ranks it first
+    cz = CzBitbucketJiraPlugin(config=default_config)
+
+    assert values(cz.commit_type_index.search('', limit=2)) == ['type7', 'type0']
+
+
+@pytest.mark.parametrize('setting, expected', [(None, 'select'), (True, 'input')])
+def test_small_catalogs_should_be_selected(
+    setup_tmpdir, default_config, setting, expected
+):
+    if setting is not None:
+        default_config.update({'commit_type_search': setting})
+
+    cz = CzBitbucketJiraPlugin(config=default_config)
+    question = next(q for q in cz.questions() if q['name'] == 'commit_type')
+
+    assert question['type'] == expected
@@ -0,0 +1,173 @@
+"""Keystroke latency of the prompt validators, under simulated fast typing."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from prompt_toolkit.document import Document
+from prompt_toolkit.validation import ValidationError
+
+from cz_bitbucket_jira_plugin.exceptions import AllValuesMustBeIntegerException
+from cz_bitbucket_jira_plugin.exceptions import IssueNotFoundException
+from cz_bitbucket_jira_plugin.validators import AllValuesMustBeIntegerValidator
+from cz_bitbucket_jira_plugin.validators import apply_multiple_validators
+from cz_bitbucket_jira_plugin.validators import BackgroundValidator
+from cz_bitbucket_jira_plugin.validators import IssueExistsValidator
+from cz_bitbucket_jira_plugin.validators import RequiredAnswerValidator
+
+
+# A frame at 60 FPS: typing must never lag more than this, in seconds
+KEYSTROKE_BUDGET = (
+    float(os.environ.get('CZ_BITBUCKET_JIRA_KEYSTROKE_BUDGET_MS', 16)) / 1000
+)
+TYPING_INTERVAL = 0.01
+LOOKUP_TIME = 0.05
+
+
+class SlowIssueLookup:
+    """Stand-in of an issue lookup over the network."""
+
+    source = 'Jira'
+
+    def __init__(self, numbers):
+        self.numbers = set(numbers)
+        self.calls = []
+
+    def get_many(self, project, numbers):
+        self.calls.append(list(numbers))
+        time.sleep(LOOKUP_TIME)
+
+        return {number: True if number in self.numbers else None for number in numbers}
+
+
+def simulate_typing(validator, text: str, interval: float = TYPING_INTERVAL):
+    """Type `text` one character each `interval` seconds, starting an async
+    validation of the input on each keystroke, like a prompt validating while
+    typing does.
+
+    Return the lag of each keystroke (how late the event loop handled it) and
+    the outcome of each validation (`None` or the raised exception).
+    """
+
+    async def type_text():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        lags = []
+        validations = []
+
+        for index in range(1, len(text) + 1):
+            due = start + index * interval
+            await asyncio.sleep(max(0, due - loop.time()))
+            lags.append(loop.time() - due)
+            validations.append(
+                asyncio.ensure_future(validator.validate_async(Document(text[:index])))
+            )
+
+        outcomes = await asyncio.gather(*validations, return_exceptions=True)
+
+        return lags, outcomes
+
+    return asyncio.run(type_text())
+
+
+def p99(values):
+    return sorted(values)[int(len(values) * 0.99)]
+
+
+def test_background_validation_should_keep_typing_within_budget():
+    lookup = SlowIssueLookup([1, 2, 3])
+    validator = apply_multiple_validators(
+        [
+            AllValuesMustBeIntegerValidator,
+            BackgroundValidator(
+                IssueExistsValidator(lookup, lambda: 'DEV'), delay=LOOKUP_TIME
+            ),
+        ]
+    )
+
+    lags, outcomes = simulate_typing(validator, '1, 2, 3, 1, 2, 3, 1, 2, 3, 4')
+
+    assert p99(lags) < KEYSTROKE_BUDGET
+    # Debounced: only the last input was looked up, and only it is reported
+    assert lookup.calls == [[1, 2, 3, 1, 2, 3, 1, 2, 3, 4]]
+    assert isinstance(outcomes[-1], IssueNotFoundException)
+    assert outcomes[:-1] == [None] * (len(outcomes) - 1)
+
+
+def test_synchronous_validation_should_be_caught_by_the_harness():
+    lookup = SlowIssueLookup([1, 2, 3])
+    validator = IssueExistsValidator(lookup, lambda: 'DEV')
+
+    lags, outcomes = simulate_typing(validator, '1, 2, 3, 4')
+
+    # Each keystroke waits for the previous lookup, whatever the budget
+    assert p99(lags) > LOOKUP_TIME / 2
+    assert len(lookup.calls) == len(outcomes)
+
+
+def test_cheap_validators_should_not_wait_for_the_background_ones():
+    lookup = SlowIssueLookup([1])
+    validator = apply_multiple_validators(
+        [
+            AllValuesMustBeIntegerValidator,
+            BackgroundValidator(IssueExistsValidator(lookup, lambda: 'DEV'), delay=1),
+        ]
+    )
+
+    start = time.perf_counter()
+
+    with pytest.raises(AllValuesMustBeIntegerException):
+        asyncio.run(validator.validate_async(Document('1, x')))
+
+    assert time.perf_counter() - start < 0.5
+    assert lookup.calls == []
+
+
+def test_enter_should_validate_synchronously():
+    lookup = SlowIssueLookup([1])
+    validator = apply_multiple_validators(
+        [BackgroundValidator(IssueExistsValidator(lookup, lambda: 'DEV'))]
+    )
+
+    assert validator.validate(Document('1')) is True
+
+    with pytest.raises(IssueNotFoundException):
+        validator.validate('2')
+
+
+# A lookup still running when the prompt exits
+EXIT_STATEMENT = """\
+import asyncio, time
+from prompt_toolkit.document import Document
+from cz_bitbucket_jira_plugin.validators import BackgroundValidator
+
+validator = BackgroundValidator(lambda answer: time.sleep(60) or True, delay=0)
+
+async def prompt():
+    validation = asyncio.ensure_future(validator.validate_async(Document('1')))
+    await asyncio.sleep(0.1)
+    validation.cancel()
+
+asyncio.run(prompt())
+"""
+
+
+def test_running_lookup_should_not_delay_the_exit():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', EXIT_STATEMENT], check=True, timeout=30)
+
+    assert time.perf_counter() - start < 10
+
+
+def test_chain_should_accept_functions():
+    validator = apply_multiple_validators(
+        [RequiredAnswerValidator, lambda answer: answer == 'ok' or 'Must be ok.']
+    )
+
+    assert validator.validate('ok') is True
+
+    with pytest.raises(ValidationError, match='Must be ok.'):
+        validator.validate('ko')
@@ -0,0 +1,54 @@
+import pytest
+
+from cz_bitbucket_jira_plugin.exceptions import IssueNotFoundException
+from cz_bitbucket_jira_plugin.issue_index import Issue
+from cz_bitbucket_jira_plugin.issue_index import IssueIndex
+from cz_bitbucket_jira_plugin.validators import IssueExistsValidator
+
+
+@pytest.fixture
+def issue_index(tmp_path):
+    path = tmp_path / 'issues.sqlite'
+    IssueIndex.build(
+        path,
+        [
+            Issue('DEV', 1032, 'Create apply_multiple_validators', 'Story'),
+            Issue('DEV', 1033, 'Write the tests', 'Sub-task'),
+        ],
+    )
+
+    return IssueIndex(path)
+
+
+@pytest.mark.parametrize(
+    'answer',
+    ['1032', '1032, 1033', '', None, 'Dracula'],
+    ids=["'1032'", "'1032, 1033'", "''", None, "'Dracula'"],
+)
+def test_answer_should_return_True(issue_index, answer):
+    """Non integer values are left to the integer validators."""
+    validator = IssueExistsValidator(issue_index, lambda: 'DEV')
+
+    assert validator.validate(answer=answer) is True
+
+
+def test_missing_issue_should_raise_IssueNotFoundException(issue_index):
+    validator = IssueExistsValidator(issue_index, lambda: 'DEV')
+
+    with pytest.raises(
+        IssueNotFoundException, match='DEV-1034 not found on the Jira issue index'
+    ):
+        validator.validate(answer='1033, 1034')
+
+
+def test_lowercase_project_key_should_return_True(issue_index):
+    validator = IssueExistsValidator(issue_index, lambda: 'dev')
+
+    assert validator.validate(answer='1032, 1033') is True
+
+
+def test_other_project_should_raise_IssueNotFoundException(issue_index):
+    validator = IssueExistsValidator(issue_index, lambda: 'OPS')
+
+    with pytest.raises(IssueNotFoundException):
+        validator.validate(answer='1032')